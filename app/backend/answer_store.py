@@ -0,0 +1,867 @@
+"""
+answer_store.py
+===============
+
+Persistent on-disk answer store for the **LLMOps Multi-AI Agent** backend.
+
+Every completed `/chat` answer is kept as a `(request fingerprint → answer)`
+record that survives restarts. The store is used for:
+
+* **Reuse** (opt-in, `ANSWER_STORE_REUSE`) — the backend looks a request up
+  before calling the agent and returns a stored, complete, recent answer
+  instead of re-running it; web-search answers are not reused by default.
+* **Audit** — every stored record carries the full request and answer.
+* **Replay** — stored traffic can be exported as a load-test mix or replayed
+  against a stubbed backend.
+
+On-disk layout (inside `ANSWER_STORE_DIR`):
+
+* `segment-NNNNNN.log` — append-only segments. Each record is a fixed
+  header (magic, CRC32, timestamp, 32-byte key, payload length) followed by
+  the JSON payload. The active segment rolls over at
+  `ANSWER_STORE_SEGMENT_BYTES`.
+* `index.bin` — a memory-mapped open-addressing hash table (linear probing)
+  mapping each key to the `(segment, offset)` of its latest record. The
+  header remembers how far the segments have been indexed, so after a
+  restart only the unindexed tail is scanned; a missing or damaged index is
+  rebuilt from the segments.
+
+Compaction rewrites only the latest record of each key into fresh segments
+and drops the superseded ones.
+
+Usage
+-----
+Example:
+    python -m app.backend.answer_store stats
+    python -m app.backend.answer_store export --output logs/stored_mix.jsonl
+    python -m app.backend.answer_store replay --launch
+    python -m app.backend.answer_store compact
+
+Notes
+-----
+Only one process may write to a store: the writer holds an exclusive
+`flock` on `store.lock` for its lifetime, and threads within it are
+serialised by a lock. A second writer fails with `StoreLockedError` (the
+backend then runs without the store). While the backend holds the lock,
+the CLI's `stats`, `export`, and `replay` open the store read-only, and
+`compact` refuses to run.
+"""
+
+# ======================================================================
+# Imports
+# ======================================================================
+
+# Command-line parsing for the maintenance CLI
+import argparse
+
+# Binary record/index layout, checksums, and memory mapping
+import errno
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+
+# Concurrent replay of stored requests
+from concurrent.futures import ThreadPoolExecutor
+
+# HTTP client for replay (pooled connections)
+import requests
+from requests.adapters import HTTPAdapter
+
+# Fast JSON encoding/decoding of record payloads
+from app.common.json_codec import decode_json, encode_json
+
+# Project configuration (store location, reuse policy)
+from app.config.settings import settings
+
+# Logging utility (project-wide logging configuration)
+from app.common.logger import get_logger
+
+# Custom exception wrapper for structured error reporting
+from app.common.custom_exception import CustomException
+
+# Inter-process writer lock (POSIX only)
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - depends on the platform
+    fcntl = None
+
+
+# ======================================================================
+# Initialisation
+# ======================================================================
+
+# Create a logger specific to this module
+logger = get_logger(__name__)
+
+# Segment record header: magic, crc32(payload), created_ns, key, payload length
+RECORD_MAGIC = b"ANS1"
+RECORD_HEADER = struct.Struct("<4sIQ32sI")
+
+# Index header: magic, version, capacity, count, indexed segment, indexed offset
+INDEX_MAGIC = b"AIX1"
+INDEX_VERSION = 1
+INDEX_HEADER = struct.Struct("<4sIIIIQ")
+INDEX_HEADER_SIZE = 64
+
+# Index slot: key, segment id (0 = empty), offset of the record header
+INDEX_SLOT = struct.Struct("<32sIQ")
+
+# Grow the index (doubling its capacity) beyond this load factor
+MAX_LOAD_FACTOR = 0.7
+
+# Initial number of index slots
+DEFAULT_INDEX_CAPACITY = 4096
+
+INDEX_FILE = "index.bin"
+
+# Held (flock) by the single writing process; contains its PID
+LOCK_FILE = "store.lock"
+
+
+def _segment_name(segment_id):
+    """Return the file name of a segment."""
+    return f"segment-{segment_id:06d}.log"
+
+
+# ======================================================================
+# Errors
+# ======================================================================
+
+class StoreLockedError(OSError):
+    """Raised when another process already holds the store's writer lock."""
+
+
+# ======================================================================
+# Answer Store
+# ======================================================================
+
+class AnswerStore:
+    """
+    Append-only segment store with a memory-mapped hash index.
+
+    Parameters
+    ----------
+    directory : str
+        Directory holding the segments and the index (created if missing).
+    segment_bytes : int
+        Size at which the active segment is closed and a new one started.
+    read_only : bool
+        Open without the writer lock, for inspecting a store another
+        process is writing to: no recovery is run, the index is mapped
+        read-only, and `put` / `compact` are refused. Reads see a snapshot
+        that may miss the newest records.
+
+    Raises
+    ------
+    StoreLockedError
+        If another process holds the writer lock (writable mode only).
+    """
+
+    def __init__(self, directory, segment_bytes=64 * 1024 * 1024, read_only=False):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.read_only = read_only
+        self._lock = threading.Lock()
+        self._readers = {}
+        self._active = None
+        self._lock_fd = None
+
+        if not read_only:
+            os.makedirs(directory, exist_ok=True)
+            self._lock_fd = self._acquire_writer_lock()
+
+        try:
+            self._segments = self._list_segments()
+            if not self._segments:
+                self._segments = [1]
+
+            self._open_index()
+            if not read_only:
+                self._catch_up()
+                self._open_active()
+        except BaseException:
+            self._release_writer_lock()
+            raise
+
+    # --------------------------------------------------------------
+    # Paths and files
+    # --------------------------------------------------------------
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _list_segments(self):
+        ids = []
+        for name in os.listdir(self.directory):
+            if name.startswith("segment-") and name.endswith(".log"):
+                ids.append(int(name[len("segment-"):-len(".log")]))
+        return sorted(ids)
+
+    def _acquire_writer_lock(self):
+        """Take the exclusive inter-process writer lock, or raise."""
+        if fcntl is None:
+            logger.warning("fcntl unavailable; answer store writer lock not enforced")
+            return None
+        fd = os.open(self._path(LOCK_FILE), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError as e:
+            holder = os.pread(fd, 32, 0).decode("ascii", "replace").strip() or "?"
+            os.close(fd)
+            if e.errno in (errno.EWOULDBLOCK, errno.EAGAIN):
+                raise StoreLockedError(
+                    f"Answer store {self.directory} is in use by another process (pid {holder})"
+                ) from e
+            raise
+        os.ftruncate(fd, 0)
+        os.pwrite(fd, str(os.getpid()).encode("ascii"), 0)
+        return fd
+
+    def _release_writer_lock(self):
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+    def _check_writable(self):
+        if self.read_only:
+            raise OSError(errno.EROFS, "Answer store is open read-only")
+
+    def _open_active(self):
+        self._active_id = self._segments[-1]
+        self._active = open(self._path(_segment_name(self._active_id)), "ab")
+
+    def _reader(self, segment_id):
+        fd = self._readers.get(segment_id)
+        if fd is None:
+            fd = os.open(self._path(_segment_name(segment_id)), os.O_RDONLY)
+            self._readers[segment_id] = fd
+        return fd
+
+    def _close_readers(self):
+        for fd in self._readers.values():
+            os.close(fd)
+        self._readers.clear()
+
+    # --------------------------------------------------------------
+    # Index (memory-mapped open addressing)
+    # --------------------------------------------------------------
+
+    def _open_index(self):
+        """Map the index file, creating or rebuilding it when invalid."""
+        path = self._path(INDEX_FILE)
+        valid = False
+        if os.path.exists(path) and os.path.getsize(path) >= INDEX_HEADER_SIZE:
+            with open(path, "rb") as f:
+                magic, version, capacity, _, _, _ = INDEX_HEADER.unpack(
+                    f.read(INDEX_HEADER.size)
+                )
+            expected = INDEX_HEADER_SIZE + capacity * INDEX_SLOT.size
+            valid = (
+                magic == INDEX_MAGIC
+                and version == INDEX_VERSION
+                and capacity > 0
+                and os.path.getsize(path) == expected
+            )
+
+        if not valid:
+            if self.read_only:
+                raise OSError(errno.ENOENT, "Answer store index is missing or invalid", path)
+            if os.path.exists(path):
+                logger.warning("Answer store index is invalid; rebuilding from segments")
+            self._create_index(path, DEFAULT_INDEX_CAPACITY, self._segments[0], 0)
+
+        self._map_index(path)
+
+    @staticmethod
+    def _create_index(path, capacity, indexed_segment, indexed_offset, entries=()):
+        """Write a fresh index file holding `entries` and atomically install it."""
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.truncate(INDEX_HEADER_SIZE + capacity * INDEX_SLOT.size)
+        with open(tmp_path, "r+b") as f:
+            table = mmap.mmap(f.fileno(), 0)
+            count = 0
+            for key, segment_id, offset in entries:
+                _, inserted = _probe_insert(table, capacity, key, segment_id, offset)
+                count += inserted
+            INDEX_HEADER.pack_into(
+                table, 0, INDEX_MAGIC, INDEX_VERSION, capacity, count,
+                indexed_segment, indexed_offset,
+            )
+            table.flush()
+            table.close()
+        os.replace(tmp_path, path)
+
+    def _map_index(self, path):
+        if self.read_only:
+            self._index_file = open(path, "rb")
+            self._index = mmap.mmap(self._index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._index_file = open(path, "r+b")
+            self._index = mmap.mmap(self._index_file.fileno(), 0)
+        self._read_index_header()
+
+    def _read_index_header(self):
+        (_, _, self._capacity, self._count,
+         self._indexed_segment, self._indexed_offset) = INDEX_HEADER.unpack_from(self._index, 0)
+
+    def _unmap_index(self):
+        self._index.close()
+        self._index_file.close()
+
+    def _write_index_header(self):
+        INDEX_HEADER.pack_into(
+            self._index, 0, INDEX_MAGIC, INDEX_VERSION, self._capacity, self._count,
+            self._indexed_segment, self._indexed_offset,
+        )
+
+    def _index_entries(self):
+        """Yield every `(key, segment_id, offset)` held in the index."""
+        for slot in range(self._capacity):
+            key, segment_id, offset = INDEX_SLOT.unpack_from(
+                self._index, INDEX_HEADER_SIZE + slot * INDEX_SLOT.size
+            )
+            if segment_id:
+                yield key, segment_id, offset
+
+    def _index_put(self, key, segment_id, offset):
+        if (self._count + 1) > self._capacity * MAX_LOAD_FACTOR:
+            self._grow_index()
+        _, inserted = _probe_insert(self._index, self._capacity, key, segment_id, offset)
+        self._count += inserted
+
+    def _index_get(self, key):
+        slot = _probe(self._index, self._capacity, key)
+        _, segment_id, offset = INDEX_SLOT.unpack_from(
+            self._index, INDEX_HEADER_SIZE + slot * INDEX_SLOT.size
+        )
+        return (segment_id, offset) if segment_id else None
+
+    def _grow_index(self):
+        entries = list(self._index_entries())
+        path = self._path(INDEX_FILE)
+        self._unmap_index()
+        self._create_index(
+            path, self._capacity * 2, self._indexed_segment, self._indexed_offset, entries
+        )
+        self._map_index(path)
+
+    # --------------------------------------------------------------
+    # Segment scanning and recovery
+    # --------------------------------------------------------------
+
+    def _scan(self, segment_id, start=0):
+        """
+        Yield `(offset, key, created_ns, payload)` for valid records.
+
+        Scanning stops at the first truncated or corrupt record; the offset
+        it stopped at is available as the generator's return value.
+        """
+        path = self._path(_segment_name(segment_id))
+        if not os.path.exists(path):
+            return start
+        with open(path, "rb") as f:
+            f.seek(start)
+            offset = start
+            while True:
+                header = f.read(RECORD_HEADER.size)
+                if len(header) < RECORD_HEADER.size:
+                    return offset
+                magic, crc, created_ns, key, length = RECORD_HEADER.unpack(header)
+                payload = f.read(length)
+                if magic != RECORD_MAGIC or len(payload) < length or zlib.crc32(payload) != crc:
+                    return offset
+                yield offset, key, created_ns, payload
+                offset += RECORD_HEADER.size + length
+
+    def _catch_up(self):
+        """Index records appended after the index was last updated."""
+        indexed = 0
+        for segment_id in self._segments:
+            if segment_id < self._indexed_segment:
+                continue
+            start = self._indexed_offset if segment_id == self._indexed_segment else 0
+            scanner = self._scan(segment_id, start)
+            while True:
+                try:
+                    offset, key, _, _ = next(scanner)
+                except StopIteration as stop:
+                    end = stop.value
+                    break
+                self._index_put(key, segment_id, offset)
+                indexed += 1
+
+            # Drop a torn tail left by a crash mid-append
+            path = self._path(_segment_name(segment_id))
+            if os.path.exists(path) and os.path.getsize(path) > end:
+                logger.warning(f"Truncating damaged tail of {path} at byte {end}")
+                with open(path, "r+b") as f:
+                    f.truncate(end)
+
+            self._indexed_segment, self._indexed_offset = segment_id, end
+
+        self._write_index_header()
+        if indexed:
+            logger.info(f"Answer store indexed {indexed} records from {self.directory}")
+
+    # --------------------------------------------------------------
+    # Public API
+    # --------------------------------------------------------------
+
+    def put(self, fingerprint, record):
+        """
+        Append a record and point the fingerprint at it.
+
+        Parameters
+        ----------
+        fingerprint : str
+            64-character hex request fingerprint.
+        record : dict
+            JSON-compatible record (request, response, metadata).
+        """
+        self._check_writable()
+        key = bytes.fromhex(fingerprint)
+        payload = encode_json(record)
+        header = RECORD_HEADER.pack(
+            RECORD_MAGIC, zlib.crc32(payload), time.time_ns(), key, len(payload)
+        )
+
+        with self._lock:
+            if self._active.tell() >= self.segment_bytes:
+                self._roll_segment()
+            offset = self._active.tell()
+            self._active.write(header + payload)
+            self._active.flush()
+
+            self._index_put(key, self._active_id, offset)
+            self._indexed_segment = self._active_id
+            self._indexed_offset = offset + len(header) + len(payload)
+            self._write_index_header()
+
+    def get(self, fingerprint):
+        """
+        Return the latest record stored for a fingerprint.
+
+        Parameters
+        ----------
+        fingerprint : str
+            64-character hex request fingerprint.
+
+        Returns
+        -------
+        dict or None
+            The stored record plus `created_ns`, or None if absent.
+        """
+        key = bytes.fromhex(fingerprint)
+        with self._lock:
+            location = self._index_get(key)
+            if location is None:
+                return None
+            # A private descriptor stays valid even if compaction closes the
+            # shared one and removes the segment while the record is read
+            fd = os.dup(self._reader(location[0]))
+
+        # Read and decode outside the lock; records are never rewritten in place
+        try:
+            return self._read(fd, key, *location)
+        finally:
+            os.close(fd)
+
+    def _read(self, fd, key, segment_id, offset):
+        header = os.pread(fd, RECORD_HEADER.size, offset)
+        magic, crc, created_ns, stored_key, length = RECORD_HEADER.unpack(header)
+        payload = os.pread(fd, length, offset + RECORD_HEADER.size)
+        if magic != RECORD_MAGIC or stored_key != key or zlib.crc32(payload) != crc:
+            logger.warning(f"Corrupt answer store record at segment {segment_id} offset {offset}")
+            return None
+        record = decode_json(payload)
+        record["created_ns"] = created_ns
+        return record
+
+    def _roll_segment(self):
+        self._active.close()
+        self._segments.append(self._active_id + 1)
+        self._open_active()
+
+    def records(self, latest_only=True):
+        """
+        Yield stored records in write order.
+
+        Parameters
+        ----------
+        latest_only : bool
+            Skip records superseded by a later write of the same key.
+
+        Yields
+        ------
+        dict
+            Each record plus `created_ns`.
+        """
+        with self._lock:
+            if self._active is not None:
+                self._active.flush()
+            segments = list(self._segments)
+            live = {(s, o) for _, s, o in self._index_entries()} if latest_only else None
+
+        for segment_id in segments:
+            for offset, _, created_ns, payload in self._scan(segment_id):
+                if live is not None and (segment_id, offset) not in live:
+                    continue
+                record = decode_json(payload)
+                record["created_ns"] = created_ns
+                yield record
+
+    def compact(self):
+        """
+        Rewrite only the latest record of each key and drop old segments.
+
+        Returns
+        -------
+        dict
+            Bytes on disk before and after, and the number of live records.
+        """
+        self._check_writable()
+        with self._lock:
+            before = self._disk_bytes()
+            self._active.close()
+            self._close_readers()
+
+            old_segments = list(self._segments)
+            live = sorted(self._index_entries(), key=lambda e: (e[1], e[2]))
+
+            # Copy live records into new segments numbered after the old ones
+            new_id = old_segments[-1] + 1
+            new_segments = [new_id]
+            entries = []
+            out = open(self._path(_segment_name(new_id)), "wb")
+            for key, segment_id, offset in live:
+                fd = self._reader(segment_id)
+                header = os.pread(fd, RECORD_HEADER.size, offset)
+                length = RECORD_HEADER.unpack(header)[4]
+                blob = header + os.pread(fd, length, offset + RECORD_HEADER.size)
+                if out.tell() and out.tell() + len(blob) > self.segment_bytes:
+                    out.close()
+                    new_id += 1
+                    new_segments.append(new_id)
+                    out = open(self._path(_segment_name(new_id)), "wb")
+                entries.append((key, new_id, out.tell()))
+                out.write(blob)
+            end = out.tell()
+            out.flush()
+            os.fsync(out.fileno())
+            out.close()
+            self._close_readers()
+
+            # Install the new index, then remove the superseded segments
+            self._unmap_index()
+            self._create_index(
+                self._path(INDEX_FILE), self._capacity, new_id, end, entries
+            )
+            self._map_index(self._path(INDEX_FILE))
+            for segment_id in old_segments:
+                os.remove(self._path(_segment_name(segment_id)))
+
+            self._segments = new_segments
+            self._open_active()
+            after = self._disk_bytes()
+
+        logger.info(f"Compacted answer store: {before} → {after} bytes, {len(entries)} records")
+        return {"bytes_before": before, "bytes_after": after, "records": len(entries)}
+
+    def _disk_bytes(self):
+        return sum(
+            os.path.getsize(self._path(_segment_name(s)))
+            for s in self._segments
+            if os.path.exists(self._path(_segment_name(s)))
+        )
+
+    def stats(self):
+        """
+        Return size and occupancy figures for the store.
+
+        Returns
+        -------
+        dict
+            Key count, segment count, bytes on disk, index capacity and load.
+        """
+        with self._lock:
+            if self._active is not None:
+                self._active.flush()
+            else:
+                self._read_index_header()
+            return {
+                "directory": self.directory,
+                "read_only": self.read_only,
+                "keys": self._count,
+                "segments": len(self._segments),
+                "segment_bytes": self._disk_bytes(),
+                "index_capacity": self._capacity,
+                "index_load": round(self._count / self._capacity, 3),
+            }
+
+    def close(self):
+        """Flush and close every file and the index mapping, and release the lock."""
+        with self._lock:
+            if self._active is not None:
+                self._active.close()
+                self._index.flush()
+            self._close_readers()
+            self._unmap_index()
+            self._release_writer_lock()
+
+
+def _probe(table, capacity, key):
+    """Return the slot holding `key`, or the empty slot where it belongs."""
+    slot = int.from_bytes(key[:8], "little") % capacity
+    while True:
+        slot_key, segment_id, _ = INDEX_SLOT.unpack_from(
+            table, INDEX_HEADER_SIZE + slot * INDEX_SLOT.size
+        )
+        if segment_id == 0 or slot_key == key:
+            return slot
+        slot = (slot + 1) % capacity
+
+
+def _probe_insert(table, capacity, key, segment_id, offset):
+    """Insert or overwrite `key`; return `(slot, 1 if new else 0)`."""
+    slot = _probe(table, capacity, key)
+    position = INDEX_HEADER_SIZE + slot * INDEX_SLOT.size
+    inserted = 1 if INDEX_SLOT.unpack_from(table, position)[1] == 0 else 0
+    INDEX_SLOT.pack_into(table, position, key, segment_id, offset)
+    return slot, inserted
+
+
+# ======================================================================
+# Backend Integration
+# ======================================================================
+
+_STORE = None
+_STORE_FAILED = False
+_STORE_LOCK = threading.Lock()
+
+
+def get_answer_store():
+    """
+    Return the process-wide answer store, opening it on first use.
+
+    Returns
+    -------
+    AnswerStore or None
+        None when `ANSWER_STORE_ENABLED` is false or the store cannot be
+        opened (the backend then simply runs without it).
+    """
+    global _STORE, _STORE_FAILED
+    if not settings.ANSWER_STORE_ENABLED or _STORE_FAILED:
+        return None
+
+    if _STORE is None:
+        with _STORE_LOCK:
+            if _STORE is None and not _STORE_FAILED:
+                try:
+                    _STORE = AnswerStore(
+                        settings.ANSWER_STORE_DIR,
+                        segment_bytes=settings.ANSWER_STORE_SEGMENT_BYTES,
+                    )
+                except OSError as e:
+                    logger.error(f"Answer store unavailable: {e}")
+                    _STORE_FAILED = True
+                    return None
+    return _STORE
+
+
+def find_reusable_answer(fingerprint, allow_search=False):
+    """
+    Look up a stored answer that may be returned instead of running the agent.
+
+    A record is reusable when reuse is enabled, it is a complete answer (not
+    a budget-limited partial one), it came from the same provider mode
+    (stub vs live), and it is younger than the maximum age:
+    `ANSWER_STORE_SEARCH_MAX_AGE_S` for web-search requests, whose point is
+    fresh results (0, the default, never reuses them), and
+    `ANSWER_STORE_MAX_AGE_S` otherwise.
+
+    Parameters
+    ----------
+    fingerprint : str
+        The request fingerprint.
+    allow_search : bool
+        Whether the request enables web search.
+
+    Returns
+    -------
+    dict or None
+        The stored record, or None.
+    """
+    if not settings.ANSWER_STORE_REUSE:
+        return None
+
+    max_age_s = settings.ANSWER_STORE_SEARCH_MAX_AGE_S if allow_search else settings.ANSWER_STORE_MAX_AGE_S
+    if allow_search and max_age_s <= 0:
+        return None
+
+    store = get_answer_store()
+    if store is None:
+        return None
+
+    record = store.get(fingerprint)
+    if record is None or record.get("partial") or record.get("stub") != settings.USE_STUB_PROVIDERS:
+        return None
+
+    if max_age_s > 0 and (time.time_ns() - record["created_ns"]) / 1e9 > max_age_s:
+        return None
+
+    return record
+
+
+def record_answer(fingerprint, request_payload, response, budget):
+    """
+    Persist a completed agent run.
+
+    Parameters
+    ----------
+    fingerprint : str
+        The request fingerprint.
+    request_payload : dict
+        The fingerprinted request fields.
+    response : str
+        The returned answer.
+    budget : dict
+        The budget report of the run (partial answers are stored for audit
+        but never reused).
+
+    Returns
+    -------
+    bool
+        True if the record was written.
+    """
+    store = get_answer_store()
+    if store is None:
+        return False
+
+    try:
+        store.put(fingerprint, {
+            "fingerprint": fingerprint,
+            "request": request_payload,
+            "response": response,
+            "partial": bool(budget and budget.get("exhausted")),
+            "stub": settings.USE_STUB_PROVIDERS,
+        })
+        return True
+    except OSError as e:
+        # Persisting is best-effort; never fail the request over it
+        logger.error(f"Failed to persist answer {fingerprint[:12]}: {e}")
+        return False
+
+
+# ======================================================================
+# Command-Line Interface
+# ======================================================================
+
+def _export(store, output):
+    """Write stored requests as a load-test mix (see `app.perf.loadtest`)."""
+    count = 0
+    with open(output, "w", encoding="utf-8") as f:
+        for record in store.records():
+            entry = dict(record["request"], weight=1.0, fingerprint=record["fingerprint"])
+            f.write(encode_json(entry).decode("utf-8") + "\n")
+            count += 1
+    logger.info(f"Exported {count} stored requests to {output}")
+
+
+def _replay(store, url, launch, concurrency, timeout_s, limit):
+    """Replay stored requests once each and report latency and status."""
+    # Imported lazily: the perf tooling is not needed by the backend itself
+    from app.perf.loadtest import launch_stack, percentile, readiness_url, stop_stack
+
+    payloads = [record["request"] for record in store.records()]
+    if limit:
+        payloads = payloads[:limit]
+    if not payloads:
+        logger.warning("Answer store is empty; nothing to replay")
+        return {}
+
+    process = launch_stack(readiness_url(url)) if launch else None
+    session = requests.Session()
+    session.mount("http://", HTTPAdapter(pool_maxsize=concurrency))
+
+    def send(payload):
+        started = time.monotonic()
+        try:
+            status = session.post(url, json=payload, timeout=timeout_s).status_code
+        except requests.RequestException as e:
+            status = type(e).__name__
+        return time.monotonic() - started, status
+
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(send, payloads))
+    finally:
+        if process:
+            stop_stack(process)
+
+    latencies = sorted(latency for latency, _ in results)
+    statuses = {}
+    for _, status in results:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+
+    summary = {
+        "replayed": len(results),
+        "statuses": statuses,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+        "max_ms": round(latencies[-1] * 1000, 1),
+    }
+    logger.info(f"Replay summary: {encode_json(summary).decode('utf-8')}")
+    return summary
+
+
+def main(argv=None):
+    """Command-line entry point for answer store maintenance and replay."""
+    parser = argparse.ArgumentParser(description="Inspect, export, compact, or replay the answer store.")
+    parser.add_argument("--dir", default=settings.ANSWER_STORE_DIR, help="Answer store directory.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("stats", help="Show store size and index occupancy.")
+    commands.add_parser("compact", help="Drop superseded records.")
+
+    export = commands.add_parser("export", help="Export stored requests as a load-test mix.")
+    export.add_argument("--output", required=True, help="Destination JSONL file.")
+
+    replay = commands.add_parser("replay", help="Replay stored requests against a backend.")
+    replay.add_argument("--url", default=settings.BACKEND_URL, help="Target /chat URL.")
+    replay.add_argument("--launch", action="store_true", help="Launch app/main.py with stub providers.")
+    replay.add_argument("--concurrency", type=int, default=8, help="Max in-flight requests.")
+    replay.add_argument("--timeout", type=float, default=120.0, help="Per-request timeout (s).")
+    replay.add_argument("--limit", type=int, default=0, help="Replay at most this many requests.")
+
+    args = parser.parse_args(argv)
+    if not os.path.isdir(args.dir):
+        raise CustomException(f"Answer store directory not found: {args.dir}")
+
+    try:
+        store = AnswerStore(args.dir, segment_bytes=settings.ANSWER_STORE_SEGMENT_BYTES)
+    except StoreLockedError as e:
+        # A running backend owns the store: never recover or rewrite it here
+        if args.command == "compact":
+            raise CustomException(f"{e}; stop the backend before compacting")
+        logger.info(f"{e}; opening read-only")
+        store = AnswerStore(args.dir, read_only=True)
+
+    try:
+        if args.command == "stats":
+            print(encode_json(store.stats()).decode("utf-8"))
+        elif args.command == "compact":
+            print(encode_json(store.compact()).decode("utf-8"))
+        elif args.command == "export":
+            _export(store, args.output)
+        elif args.command == "replay":
+            _replay(store, args.url, args.launch, args.concurrency, args.timeout, args.limit)
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,13 +4,20 @@ api.py
 
 FastAPI backend for the **LLMOps Multi-AI Agent** project.
 
-This module exposes a single `/chat` endpoint that allows clients to:
+This module exposes a `/chat` endpoint that allows clients to:
 
 * Submit a model name, system prompt, message history, and search toggle.
 * Validate the selected LLM against the project's allowed configuration.
-* Invoke the LangGraph-powered agent via `get_response_from_ai_agents`.
+* Reuse a stored answer for an identical request from the persistent
+  answer store, or invoke the LangGraph-powered agent via `run_agent` and
+  store its answer.
 * Return the final AI-generated response in a structured format.
 
+It also warms a pool of pre-built agents at start-up and exposes `/healthz`
+(liveness) and `/readyz` (ready once the pool is warm) probes. With
+`EXECUTION_MODE=process`, agent runs execute in a pool of long-lived worker
+processes (see `app.core.process_pool`) instead of the server's threadpool.
+
 The backend includes centralised logging, exception wrapping, and input
 validation through Pydantic.
 """
@@ -19,17 +26,36 @@ validation through Pydantic.
 # Imports
 # ======================================================================
 
+# Background warm-up thread and lifespan context manager
+import threading
+from contextlib import asynccontextmanager, contextmanager
+
+# Threadpool limiter used by FastAPI for sync endpoints
+import anyio.to_thread
+
 # FastAPI server framework + HTTP exception helper
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
+
+# Pydantic model and constraints for validating incoming request bodies
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
-# Pydantic model for validating incoming request bodies
-from pydantic import BaseModel
+# Type hint support for lists and constrained fields
+from typing import Annotated, List, Literal, Optional
 
-# Type hint support for lists
-from typing import List
+# Core agent invocation function and pooled agent factory
+from app.core.ai_agent import create_pooled_agent, run_agent
 
-# Core agent invocation function
-from app.core.ai_agent import get_response_from_ai_agents
+# Warm agent pool (start-up warm-up and readiness state)
+from app.core.agent_pool import is_ready, pool_status, warm_up
+
+# Optional multi-process execution of agent runs
+from app.core.process_pool import (
+    process_pool_ready,
+    process_pool_status,
+    run_agent_in_process,
+    shutdown_process_pool,
+    start_process_pool,
+)
 
 # Project configuration (allowed model names, API keys, etc.)
 from app.config.settings import settings
@@ -40,6 +66,26 @@ from app.common.logger import get_logger
 # Custom exception wrapper for structured error reporting
 from app.common.custom_exception import CustomException
 
+# Process memory helper for per-request accounting
+from app.common.memory import read_rss_kb
+
+# Streaming request body size limit
+from app.backend.limits import BodySizeLimitMiddleware
+
+# Fast JSON rendering and compression negotiation
+from app.backend.responses import FastJSONResponse, json_response
+
+# Persistent answer store (lookup before the agent, record after)
+from app.backend.answer_store import find_reusable_answer, record_answer
+from app.common.fingerprint import FINGERPRINT_FIELDS, request_fingerprint
+
+# Priority classes, fair queuing, and load shedding
+from app.backend.scheduler import SchedulerOverloaded, scheduler
+
+# Correlation IDs and request tracing
+from app.backend.correlation import CorrelationIdMiddleware
+from app.common.tracing import span
+
 
 # ======================================================================
 # Initialisation
@@ -48,14 +94,89 @@ from app.common.custom_exception import CustomException
 # Create a logger specific to this module
 logger = get_logger(__name__)
 
+# Run agents in worker processes instead of the server's threadpool
+_PROCESS_MODE = settings.EXECUTION_MODE == "process"
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """
+    Size the threadpool and start warming the agent pool at start-up.
+
+    `/chat` is a sync endpoint, and every request running or queued in the
+    scheduler holds a threadpool thread, so the threadpool is sized to at
+    least slots + queue + `SCHEDULER_SPARE_THREADS`; requests over the
+    limit then get a thread and are shed, instead of waiting in the
+    threadpool's FIFO queue.
+
+    Warm-up (of the agent pool, or of the worker processes) runs in a daemon
+    thread so `/healthz` answers immediately while `/readyz` reports
+    not-ready until every agent has been built and exercised. Worker
+    processes are stopped on shutdown.
+    """
+    if settings.SCHEDULER_ENABLED:
+        limiter = anyio.to_thread.current_default_thread_limiter()
+        limiter.total_tokens = max(
+            limiter.total_tokens,
+            settings.SCHEDULER_CONCURRENCY + settings.SCHEDULER_MAX_QUEUE
+            + settings.SCHEDULER_SPARE_THREADS,
+        )
+        logger.info(f"Threadpool size: {limiter.total_tokens}")
+
+    if _PROCESS_MODE:
+        threading.Thread(target=start_process_pool, daemon=True).start()
+    else:
+        threading.Thread(target=warm_up, args=(create_pooled_agent,), daemon=True).start()
+    yield
+    if _PROCESS_MODE:
+        shutdown_process_pool()
+
+
 # Create the FastAPI application instance
-app = FastAPI(title="MULTI AI AGENT")
+app = FastAPI(
+    title="MULTI AI AGENT",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan,
+)
+
+# Reject oversized bodies while they stream in, before JSON parsing
+app.add_middleware(BodySizeLimitMiddleware, max_bytes=settings.MAX_REQUEST_BYTES)
+
+# Bind a correlation ID to every request (outermost, so all logs carry it)
+app.add_middleware(CorrelationIdMiddleware)
 
 
 # ======================================================================
 # Request Schema
 # ======================================================================
 
+class BudgetSpec(BaseModel):
+    """
+    Optional per-request overrides of the agent execution budget.
+
+    Any field left unset falls back to the `BUDGET_*` defaults in project
+    settings. When a budget is exhausted the agent stops and the best
+    partial answer is returned.
+
+    Attributes
+    ----------
+    max_seconds : float, optional
+        Wall-clock limit for the agent run.
+    max_iterations : int, optional
+        Maximum number of LLM calls (ReAct steps).
+    max_tool_calls : int, optional
+        Maximum number of tool calls (e.g. web searches).
+    max_tokens : int, optional
+        Maximum total (input + output) tokens across LLM calls.
+    """
+    model_config = ConfigDict(extra="forbid")
+
+    max_seconds: Optional[float] = Field(default=None, gt=0, le=600)
+    max_iterations: Optional[int] = Field(default=None, ge=1, le=50)
+    max_tool_calls: Optional[int] = Field(default=None, ge=0, le=50)
+    max_tokens: Optional[int] = Field(default=None, ge=1, le=1_000_000)
+
+
 class RequestState(BaseModel):
     """
     Defines the expected request body for the `/chat` endpoint.
@@ -70,19 +191,89 @@ class RequestState(BaseModel):
         A list of user messages representing conversation history.
     allow_search : bool
         Whether to enable Tavily-based web search as a tool for the agent.
+    budget : BudgetSpec, optional
+        Per-request limits on time, iterations, tool calls, and tokens.
+    priority : str
+        Requested scheduling class: `interactive` (the Streamlit UI), `batch`
+        (default), or `background`; capped by the tenant's maximum class.
+    tenant : str
+        Tenant name used for weighted fair queuing within a class.
+
+    Notes
+    -----
+    Field sizes are bounded by the `MAX_*` limits in project settings, and
+    unknown fields are rejected, so a single request cannot force unbounded
+    allocations during validation or tokenisation.
     """
-    model_name: str
-    system_prompt: str
-    messages: List[str]
+    model_config = ConfigDict(extra="forbid")
+
+    model_name: str = Field(max_length=128)
+    system_prompt: str = Field(max_length=settings.MAX_SYSTEM_PROMPT_CHARS)
+    messages: List[Annotated[str, Field(max_length=settings.MAX_MESSAGE_CHARS)]] = Field(
+        max_length=settings.MAX_MESSAGES
+    )
     allow_search: bool
+    budget: Optional[BudgetSpec] = None
+    priority: Literal["interactive", "batch", "background"] = "batch"
+    tenant: str = Field(default="default", min_length=1, max_length=64)
+
+    @model_validator(mode="after")
+    def _check_total_size(self):
+        """Bound the combined size of the prompt and conversation."""
+        total_chars = len(self.system_prompt) + sum(len(m) for m in self.messages)
+        if total_chars > settings.MAX_TOTAL_CHARS:
+            raise ValueError(
+                f"Combined prompt and messages exceed {settings.MAX_TOTAL_CHARS} characters"
+            )
+        return self
+
+
+# ======================================================================
+# Response Schema
+# ======================================================================
+
+class ChatResponse(BaseModel):
+    """
+    Documents the response body of the `/chat` endpoint.
+
+    The endpoint returns a pre-encoded response, so this model is used for
+    the OpenAPI schema only and is not re-validated on every request.
+
+    Attributes
+    ----------
+    response : str
+        The final AI-generated answer.
+    memory : dict, optional
+        Per-request memory accounting (body bytes, payload size, RSS).
+    budget : dict, optional
+        Budget limits, usage, and whether the run stopped early (None when
+        the answer came from the answer store).
+    store : dict, optional
+        Answer store outcome: request fingerprint, whether the answer was
+        reused (`hit`), and when it was stored or whether it was recorded.
+    scheduler : dict, optional
+        Priority class, tenant, and time spent queued for an execution slot.
+    conversation : dict, optional
+        How many input messages were reused from the conversation cache or
+        newly converted, and the estimated prompt tokens.
+    tool_output : dict, optional
+        Search results kept or deduplicated and tokens saved by trimming.
+    """
+    response: str
+    memory: Optional[dict] = None
+    budget: Optional[dict] = None
+    store: Optional[dict] = None
+    scheduler: Optional[dict] = None
+    conversation: Optional[dict] = None
+    tool_output: Optional[dict] = None
 
 
 # ======================================================================
 # Chat Endpoint
 # ======================================================================
 
-@app.post("/chat")
-def chat_endpoint(request: RequestState):
+@app.post("/chat", response_model=ChatResponse)
+def chat_endpoint(request: RequestState, http_request: Request):
     """
     Endpoint for querying the AI agent.
 
@@ -91,17 +282,24 @@ def chat_endpoint(request: RequestState):
     request : RequestState
         The structured request body containing model name, system prompt,
         conversation messages, and search toggle.
+    http_request : Request
+        The raw HTTP request (used for body-size accounting and
+        `Accept-Encoding` negotiation).
 
     Returns
     -------
-    dict
-        A JSON dictionary containing the `"response"` string produced by
-        the AI agent.
+    Response
+        A pre-encoded JSON response (see `ChatResponse`) containing the
+        `"response"` string produced by the AI agent and a `"memory"` block
+        with per-request accounting, compressed when large enough.
 
     Raises
     ------
     HTTPException
         * 400 if the requested model name is invalid.
+        * 413 if the request body exceeds `MAX_REQUEST_BYTES`.
+        * 422 if a field exceeds its configured size limit.
+        * 503 if the request is shed by admission control.
         * 500 if an internal error occurs during agent execution.
     """
 
@@ -120,26 +318,216 @@ def chat_endpoint(request: RequestState):
     # --------------------------------------------------------------
     # Process the chat request
     # --------------------------------------------------------------
+
+    # Root span for the request; agent spans nest beneath it
+    with span(
+        "chat_endpoint",
+        model=request.model_name,
+        allow_search=request.allow_search,
+        messages=len(request.messages),
+    ):
+        try:
+            # Snapshot worker RSS before running the agent
+            rss_before_kb = read_rss_kb()
+            accept_encoding = http_request.headers.get("accept-encoding")
+
+            # Serve an identical earlier request from the answer store
+            request_payload = request.model_dump(include=set(FINGERPRINT_FIELDS))
+            fingerprint = request_fingerprint(request_payload)
+            with span("answer_store.lookup") as lookup_span:
+                stored = find_reusable_answer(fingerprint, request.allow_search)
+                lookup_span.set_attribute("store.hit", stored is not None)
+
+            if stored is not None:
+                logger.info(f"Reusing stored answer {fingerprint[:12]}")
+                return json_response(
+                    {
+                        "response": stored["response"],
+                        "memory": _memory_report(request, http_request, rss_before_kb),
+                        "budget": None,
+                        "store": {
+                            "hit": True,
+                            "fingerprint": fingerprint,
+                            "stored_at_ns": stored["created_ns"],
+                        },
+                    },
+                    accept_encoding=accept_encoding,
+                )
+
+            # Wait for an execution slot (by priority class and tenant), then
+            # invoke the LangGraph-powered agent under the request's budget
+            run = run_agent_in_process if _PROCESS_MODE else run_agent
+            priority = scheduler.allowed_priority(request.priority, request.tenant)
+            with _execution_slot(priority, request.tenant) as wait_s:
+                result = run(
+                    request.model_name,
+                    request.messages,
+                    request.allow_search,
+                    request.system_prompt,
+                    budget=request.budget.model_dump() if request.budget else None,
+                )
+
+            logger.info(f"Successfully obtained response from model: {request.model_name}")
+
+            # Persist the answer for audit, reuse, and replay
+            recorded = record_answer(
+                fingerprint, request_payload, result["response"], result["budget"]
+            )
+
+            # Return structured API response with memory and budget accounting
+            return json_response(
+                {
+                    "response": result["response"],
+                    "memory": _memory_report(request, http_request, rss_before_kb),
+                    "budget": result["budget"],
+                    "store": {"hit": False, "fingerprint": fingerprint, "recorded": recorded},
+                    "scheduler": {
+                        "priority": priority,
+                        "tenant": request.tenant,
+                        "wait_ms": round(wait_s * 1000, 1),
+                    },
+                    "conversation": result["conversation"],
+                    "tool_output": result["tool_output"],
+                },
+                accept_encoding=accept_encoding,
+            )
+
+        # --------------------------------------------------------------
+        # Load shedding and global error handling
+        # --------------------------------------------------------------
+        except SchedulerOverloaded as e:
+            logger.warning(str(e))
+            raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+
+        except Exception as e:
+            logger.error("An error occurred during AI response generation")
+            raise HTTPException(
+                status_code=500,
+                detail=str(CustomException("Failed to get AI response", error_detail=e))
+            )
+
+
+# ======================================================================
+# Scheduling
+# ======================================================================
+
+@contextmanager
+def _execution_slot(priority, tenant):
+    """
+    Hold a scheduler slot for a request (a no-op when scheduling is off).
+
+    Parameters
+    ----------
+    priority : str
+        The request's priority class, already capped for its tenant.
+    tenant : str
+        The request's tenant.
+
+    Yields
+    ------
+    float
+        Seconds spent waiting for the slot.
+    """
+    if not settings.SCHEDULER_ENABLED:
+        yield 0.0
+        return
+
+    with span("scheduler.wait", priority=priority, tenant=tenant) as wait_span:
+        wait_s = scheduler.acquire(priority, tenant)
+        wait_span.set_attribute("scheduler.wait_ms", round(wait_s * 1000, 1))
     try:
-        # Invoke the LangGraph-powered agent and capture the final response
-        response = get_response_from_ai_agents(
-            request.model_name,
-            request.messages,
-            request.allow_search,
-            request.system_prompt
-        )
+        yield wait_s
+    finally:
+        scheduler.release(priority)
 
-        logger.info(f"Successfully obtained response from model: {request.model_name}")
 
-        # Return structured API response
-        return {"response": response}
+@app.get("/scheduler")
+async def scheduler_stats():
+    """
+    Export per-class queue depth, running count, sheds, and wait times.
 
-    # --------------------------------------------------------------
-    # Global error handling
-    # --------------------------------------------------------------
-    except Exception as e:
-        logger.error("An error occurred during AI response generation")
-        raise HTTPException(
-            status_code=500,
-            detail=str(CustomException("Failed to get AI response", error_detail=e))
+    Returns
+    -------
+    dict
+        The scheduler's limits and per-class statistics.
+    """
+    return scheduler.stats()
+
+
+# ======================================================================
+# Health Probes
+# ======================================================================
+
+@app.get("/healthz")
+async def healthz():
+    """
+    Liveness probe: the process is up and serving HTTP.
+
+    Returns
+    -------
+    dict
+        Always `{"status": "ok"}`.
+    """
+    return {"status": "ok"}
+
+
+@app.get("/readyz")
+async def readyz():
+    """
+    Readiness probe: the agent pool (or every worker process) is warm.
+
+    Returns
+    -------
+    FastJSONResponse
+        HTTP 200 with the pool status once warm; HTTP 503 while warming or
+        after a failed warm-up.
+    """
+    if _PROCESS_MODE:
+        return FastJSONResponse(
+            process_pool_status(), status_code=200 if process_pool_ready() else 503
         )
+    status = pool_status()
+    return FastJSONResponse(status, status_code=200 if is_ready() else 503)
+
+
+# ======================================================================
+# Memory Accounting
+# ======================================================================
+
+def _memory_report(request, http_request, rss_before_kb):
+    """
+    Build the per-request memory accounting block.
+
+    Parameters
+    ----------
+    request : RequestState
+        The validated request body.
+    http_request : Request
+        The raw HTTP request carrying `state.body_bytes`.
+    rss_before_kb : int or None
+        Worker RSS sampled before the agent ran.
+
+    Returns
+    -------
+    dict
+        Body size, payload size, and worker RSS before/after the request.
+
+    Notes
+    -----
+    RSS is a per-worker figure, so under concurrency `rss_delta_kb` also
+    includes allocations made by other in-flight requests.
+    """
+    rss_after_kb = read_rss_kb()
+    payload_chars = len(request.system_prompt) + sum(len(m) for m in request.messages)
+
+    return {
+        "request_bytes": getattr(http_request.state, "body_bytes", None),
+        "payload_chars": payload_chars,
+        "rss_before_kb": rss_before_kb,
+        "rss_after_kb": rss_after_kb,
+        "rss_delta_kb": (
+            rss_after_kb - rss_before_kb
+            if rss_before_kb is not None and rss_after_kb is not None
+            else None
+        ),
+    }
@@ -0,0 +1,73 @@
+"""
+correlation.py
+==============
+
+Correlation ID propagation for the **LLMOps Multi-AI Agent** backend.
+
+`CorrelationIdMiddleware` is a pure ASGI middleware that:
+
+* Reads the `X-Correlation-ID` request header (set by the Streamlit UI or
+  any other client), or generates a new ID when it is missing.
+* Binds the ID to the request context, so every log line and trace span
+  produced while handling the request carries it.
+* Echoes the ID back in the `X-Correlation-ID` response header.
+"""
+
+# ======================================================================
+# Imports
+# ======================================================================
+
+# Correlation helpers from the shared tracer
+from app.common.tracing import CORRELATION_HEADER, correlation_scope
+
+
+# ======================================================================
+# Initialisation
+# ======================================================================
+
+# ASGI header names are lower-case bytes
+_HEADER_KEY = CORRELATION_HEADER.lower().encode("latin-1")
+
+# Upper bound on accepted client-supplied IDs
+_MAX_ID_LENGTH = 128
+
+
+# ======================================================================
+# Correlation ID Middleware
+# ======================================================================
+
+class CorrelationIdMiddleware:
+    """
+    ASGI middleware binding a correlation ID to every HTTP request.
+
+    Parameters
+    ----------
+    app : ASGI application
+        The wrapped application.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Accept the client's ID when present and reasonably sized
+        incoming = None
+        for name, value in scope.get("headers", []):
+            if name == _HEADER_KEY:
+                incoming = value.decode("latin-1").strip()[:_MAX_ID_LENGTH] or None
+                break
+
+        with correlation_scope(incoming) as correlation_id:
+
+            async def send_with_header(message):
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    headers.append((_HEADER_KEY, correlation_id.encode("latin-1")))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_with_header)
@@ -0,0 +1,146 @@
+"""
+limits.py
+=========
+
+Request size limiting for the **LLMOps Multi-AI Agent** backend.
+
+This module provides `BodySizeLimitMiddleware`, a pure ASGI middleware that
+enforces a maximum request body size *while the body is being received*:
+
+* Requests that declare an oversized `Content-Length` are rejected with
+  HTTP 413 before a single body byte is read.
+* Chunked or undeclared bodies are counted as they stream in, and the
+  request is aborted with HTTP 413 as soon as the limit is crossed.
+
+Because the check runs before FastAPI buffers and parses the JSON body, an
+oversized request never allocates a full-size buffer or reaches Pydantic
+validation. The number of body bytes received is recorded on
+`request.state.body_bytes` for per-request memory accounting.
+"""
+
+# ======================================================================
+# Imports
+# ======================================================================
+
+# JSON encoding for the 413 error body
+import json
+
+# HTTP exception type understood by FastAPI's body parsing and handlers
+from fastapi import HTTPException
+
+# Logging utility (project-wide logging configuration)
+from app.common.logger import get_logger
+
+
+# ======================================================================
+# Initialisation
+# ======================================================================
+
+# Create a logger specific to this module
+logger = get_logger(__name__)
+
+
+# ======================================================================
+# Internal Signal
+# ======================================================================
+
+class _PayloadTooLarge(HTTPException):
+    """
+    Raised from the wrapped `receive` when the body exceeds the limit.
+
+    Subclassing `HTTPException` lets FastAPI's body parsing re-raise it as-is
+    (instead of converting it to a generic 400) and render it as a 413.
+    """
+
+    def __init__(self, max_bytes):
+        super().__init__(status_code=413, detail=f"Request body exceeds {max_bytes} bytes")
+
+
+# ======================================================================
+# Body Size Limit Middleware
+# ======================================================================
+
+class BodySizeLimitMiddleware:
+    """
+    ASGI middleware rejecting request bodies larger than `max_bytes`.
+
+    Parameters
+    ----------
+    app : ASGI application
+        The wrapped application.
+    max_bytes : int
+        The maximum number of body bytes accepted per request.
+    """
+
+    def __init__(self, app, max_bytes):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send):
+        # Only HTTP requests carry bodies we need to police
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # --------------------------------------------------------------
+        # Fast path: reject on the declared Content-Length
+        # --------------------------------------------------------------
+        for name, value in scope.get("headers", []):
+            if name == b"content-length":
+                try:
+                    declared = int(value)
+                except ValueError:
+                    declared = 0
+                if declared > self.max_bytes:
+                    logger.warning(f"Rejected request: Content-Length {declared} exceeds limit")
+                    await self._reject(send)
+                    return
+                break
+
+        # --------------------------------------------------------------
+        # Streaming path: count bytes as they arrive
+        # --------------------------------------------------------------
+        received = 0
+        response_started = False
+        state = scope.setdefault("state", {})
+        state["body_bytes"] = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                state["body_bytes"] = received
+                if received > self.max_bytes:
+                    logger.warning(f"Rejected request: streamed body exceeded {self.max_bytes} bytes")
+                    raise _PayloadTooLarge(self.max_bytes)
+            return message
+
+        async def tracking_send(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except _PayloadTooLarge:
+            # Only reached when no exception handler rendered the 413 itself
+            if not response_started:
+                await self._reject(send)
+
+    async def _reject(self, send):
+        """Send a JSON 413 response in the same shape as `HTTPException`."""
+        body = json.dumps(
+            {"detail": f"Request body exceeds {self.max_bytes} bytes"}
+        ).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("ascii")),
+                (b"connection", b"close"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,182 @@
+"""
+responses.py
+============
+
+Fast JSON response helpers for the **LLMOps Multi-AI Agent** backend.
+
+FastAPI's default path for a returned dict is `jsonable_encoder` followed by
+`json.dumps` inside `JSONResponse`, plus re-validation when a
+`response_model` is declared. For `/chat` the payload is already a plain,
+JSON-safe dict, so this module skips that work:
+
+* `FastJSONResponse` renders with `orjson` (falling back to `json`).
+* `json_response` builds the final `Response` directly, so FastAPI does not
+  re-validate or re-encode it, and negotiates `zstd`/`gzip` compression for
+  bodies larger than `settings.COMPRESSION_MIN_BYTES`.
+
+`zstd` is only offered when the optional `zstandard` package is installed;
+`gzip` uses the standard library and is always available.
+"""
+
+# ======================================================================
+# Imports
+# ======================================================================
+
+# Standard library gzip compression and per-thread compressors
+import gzip
+import threading
+
+# FastAPI/Starlette response base classes
+from fastapi.responses import JSONResponse, Response
+
+# Shared JSON codec (orjson when available)
+from app.common.json_codec import encode_json
+
+# Project configuration (feature toggles and thresholds)
+from app.config.settings import settings
+
+# Optional zstd compression
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+
+# ======================================================================
+# Initialisation
+# ======================================================================
+
+# Content codings supported by this server, in order of preference
+SUPPORTED_ENCODINGS = ("zstd", "gzip") if zstandard is not None else ("gzip",)
+
+# zstd compressors are not thread-safe, so each threadpool thread keeps its own
+_ZSTD_LOCAL = threading.local()
+
+
+# ======================================================================
+# Response Class
+# ======================================================================
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered with `orjson` when available.
+
+    Used as the application's default response class so that every
+    endpoint benefits from the faster encoder. Subclassing `JSONResponse`
+    keeps FastAPI's OpenAPI generation treating it as a JSON response.
+    """
+
+    def render(self, content) -> bytes:
+        return encode_json(content, fast=settings.FAST_JSON_ENABLED)
+
+
+# ======================================================================
+# Compression Negotiation
+# ======================================================================
+
+def negotiate_encoding(accept_encoding):
+    """
+    Pick the preferred supported content coding from an `Accept-Encoding`.
+
+    Parameters
+    ----------
+    accept_encoding : str or None
+        The raw `Accept-Encoding` request header.
+
+    Returns
+    -------
+    str or None
+        `"zstd"`, `"gzip"`, or None when no supported coding is acceptable.
+    """
+    if not accept_encoding:
+        return None
+
+    # Parse "gzip;q=0.8, zstd" into {"gzip": 0.8, "zstd": 1.0}
+    weights = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[coding.strip().lower()] = quality
+
+    wildcard = weights.get("*", 0.0)
+    candidates = [
+        (weights.get(coding, wildcard), -rank, coding)
+        for rank, coding in enumerate(SUPPORTED_ENCODINGS)
+    ]
+    quality, _, coding = max(candidates)
+
+    return coding if quality > 0 else None
+
+
+def compress_body(body, encoding):
+    """
+    Compress `body` with the given content coding.
+
+    Parameters
+    ----------
+    body : bytes
+        The uncompressed response body.
+    encoding : str
+        `"zstd"` or `"gzip"`.
+
+    Returns
+    -------
+    bytes
+        The compressed body.
+    """
+    if encoding == "zstd":
+        compressor = getattr(_ZSTD_LOCAL, "compressor", None)
+        if compressor is None:
+            compressor = zstandard.ZstdCompressor(level=settings.ZSTD_LEVEL)
+            _ZSTD_LOCAL.compressor = compressor
+        return compressor.compress(body)
+
+    return gzip.compress(body, compresslevel=settings.GZIP_LEVEL)
+
+
+# ======================================================================
+# Response Builder
+# ======================================================================
+
+def json_response(payload, accept_encoding=None, status_code=200, headers=None):
+    """
+    Build a ready-to-send JSON response, compressed when worthwhile.
+
+    Parameters
+    ----------
+    payload : dict
+        A JSON-compatible payload (already in its final response shape).
+    accept_encoding : str or None
+        The client's `Accept-Encoding` header.
+    status_code : int, default=200
+        The HTTP status code.
+    headers : dict or None
+        Extra response headers.
+
+    Returns
+    -------
+    Response
+        A response FastAPI sends as-is, without re-validation.
+    """
+    body = encode_json(payload, fast=settings.FAST_JSON_ENABLED)
+    response_headers = dict(headers or {})
+
+    if settings.COMPRESSION_ENABLED and len(body) >= settings.COMPRESSION_MIN_BYTES:
+        encoding = negotiate_encoding(accept_encoding)
+        if encoding is not None:
+            body = compress_body(body, encoding)
+            response_headers["Content-Encoding"] = encoding
+        response_headers["Vary"] = "Accept-Encoding"
+
+    return Response(
+        content=body,
+        status_code=status_code,
+        media_type="application/json",
+        headers=response_headers,
+    )
@@ -0,0 +1,402 @@
+"""
+scheduler.py
+============
+
+Priority classes, weighted fair queuing, and admission control for the
+**LLMOps Multi-AI Agent** backend.
+
+Agent runs are admitted through a `FairScheduler` with a fixed number of
+execution slots (`SCHEDULER_CONCURRENCY`). When every slot is busy,
+requests wait in per-class queues:
+
+* **Priority classes** — `interactive` (the Streamlit UI), `batch` (the
+  default for API clients), and `background`. A free slot always goes to
+  the highest non-empty class. Clients pick their class, so each tenant's
+  claim is capped by `SCHEDULER_TENANT_MAX_CLASSES` (unlisted tenants by
+  `SCHEDULER_DEFAULT_MAX_CLASS`, i.e. `batch`).
+* **Weighted fair queuing** — within a class, each tenant is a flow with a
+  weight (`SCHEDULER_TENANT_WEIGHTS`). Requests are tagged with a virtual
+  finish time `max(class virtual time, tenant's last queued tag) + 1 / weight`
+  and served in tag order, so a tenant flooding the queue only delays
+  itself. Tags exist only on queued tickets: a tenant with nothing queued
+  restarts at the class virtual time, so no per-tenant state outlives its
+  requests, and a rejected or evicted request leaves no trace.
+* **Admission control** — when `SCHEDULER_MAX_QUEUE` requests are already
+  waiting, a new request evicts the most recently queued request of a lower
+  class; if there is none, the new request is rejected. Requests waiting
+  longer than `SCHEDULER_MAX_WAIT_S` are shed as well. Shed requests receive
+  HTTP 503, so low-priority work is dropped first under overload.
+
+Queue depth, running count, admissions, sheds, and wait-time percentiles
+are kept per class and exposed by the `/scheduler` endpoint.
+
+Usage
+-----
+Example:
+    priority = scheduler.allowed_priority("interactive", "tenant-a")
+    with scheduler.slot(priority, "tenant-a") as wait_s:
+        result = run_agent(...)
+"""
+
+# ======================================================================
+# Imports
+# ======================================================================
+
+# Thread coordination, heaps, and timing
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Project configuration (slots, queue limits, tenant weights)
+from app.config.settings import settings
+
+# Logging utility (project-wide logging configuration)
+from app.common.logger import get_logger
+
+
+# ======================================================================
+# Initialisation
+# ======================================================================
+
+# Create a logger specific to this module
+logger = get_logger(__name__)
+
+# Priority classes, highest first
+PRIORITY_CLASSES = ("interactive", "batch", "background")
+
+# Number of recent wait times kept per class for percentiles
+WAIT_SAMPLES = 1000
+
+
+def parse_tenant_weights(spec):
+    """
+    Parse a `tenant=weight,tenant=weight` string.
+
+    Parameters
+    ----------
+    spec : str
+        The weight specification (empty for none).
+
+    Returns
+    -------
+    dict
+        Tenant name → positive float weight.
+    """
+    weights = {}
+    for item in filter(None, (part.strip() for part in (spec or "").split(","))):
+        tenant, _, weight = item.partition("=")
+        try:
+            value = float(weight)
+        except ValueError:
+            logger.warning(f"Ignoring invalid tenant weight: {item!r}")
+            continue
+        if value > 0:
+            weights[tenant.strip()] = value
+    return weights
+
+
+def parse_tenant_classes(spec):
+    """
+    Parse a `tenant=class,tenant=class` string of priority caps.
+
+    Parameters
+    ----------
+    spec : str
+        The cap specification (empty for none).
+
+    Returns
+    -------
+    dict
+        Tenant name → highest priority class the tenant may claim.
+    """
+    classes = {}
+    for item in filter(None, (part.strip() for part in (spec or "").split(","))):
+        tenant, _, cls = item.partition("=")
+        if cls.strip() not in PRIORITY_CLASSES:
+            logger.warning(f"Ignoring invalid tenant class: {item!r}")
+            continue
+        classes[tenant.strip()] = cls.strip()
+    return classes
+
+
+# ======================================================================
+# Errors
+# ======================================================================
+
+class SchedulerOverloaded(Exception):
+    """Raised when a request is shed by admission control."""
+
+    def __init__(self, priority, reason):
+        super().__init__(f"Server overloaded: {priority} request shed ({reason})")
+        self.priority = priority
+        self.reason = reason
+
+
+# ======================================================================
+# Fair Scheduler
+# ======================================================================
+
+class _Ticket:
+    """One queued request."""
+
+    __slots__ = ("priority", "tenant", "tag", "seq", "enqueued_at", "granted", "shed", "event")
+
+    def __init__(self, priority, tenant, tag, seq):
+        self.priority = priority
+        self.tenant = tenant
+        self.tag = tag
+        self.seq = seq
+        self.enqueued_at = time.monotonic()
+        self.granted = False
+        self.shed = None
+        self.event = threading.Event()
+
+    def __lt__(self, other):
+        return (self.tag, self.seq) < (other.tag, other.seq)
+
+
+class FairScheduler:
+    """
+    Slot-based scheduler with priority classes and per-tenant WFQ.
+
+    Parameters
+    ----------
+    concurrency : int
+        Number of agent runs allowed at once.
+    max_queue : int
+        Maximum number of waiting requests across all classes.
+    max_wait_s : float
+        Maximum time a request may wait for a slot before being shed.
+    weights : dict or None
+        Tenant → weight (default weight 1).
+    max_classes : dict or None
+        Tenant → highest priority class it may claim.
+    default_max_class : str
+        Cap for tenants not in `max_classes`.
+    """
+
+    def __init__(self, concurrency, max_queue, max_wait_s, weights=None,
+                 max_classes=None, default_max_class="batch"):
+        self.concurrency = concurrency
+        self.max_queue = max_queue
+        self.max_wait_s = max_wait_s
+        self.weights = dict(weights or {})
+        self.max_classes = dict(max_classes or {})
+        if default_max_class not in PRIORITY_CLASSES:
+            logger.warning(f"Invalid default max class {default_max_class!r}; using 'batch'")
+            default_max_class = "batch"
+        self.default_max_class = default_max_class
+
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+        self._running = 0
+        self._queues = {cls: [] for cls in PRIORITY_CLASSES}
+        self._virtual_time = {cls: 0.0 for cls in PRIORITY_CLASSES}
+        self._stats = {
+            cls: {"running": 0, "admitted": 0, "shed": 0, "waits": deque(maxlen=WAIT_SAMPLES)}
+            for cls in PRIORITY_CLASSES
+        }
+
+    # --------------------------------------------------------------
+    # Public API
+    # --------------------------------------------------------------
+
+    def allowed_priority(self, priority, tenant):
+        """
+        Cap a client's requested class at the highest one its tenant may use.
+
+        Parameters
+        ----------
+        priority : str
+            The class the client asked for (one of `PRIORITY_CLASSES`).
+        tenant : str
+            The client's tenant.
+
+        Returns
+        -------
+        str
+            `priority`, or the tenant's cap if that is lower.
+        """
+        cap = self.max_classes.get(tenant, self.default_max_class)
+        return max(priority, cap, key=PRIORITY_CLASSES.index)
+
+    @contextmanager
+    def slot(self, priority, tenant):
+        """
+        Hold an execution slot for the duration of a block.
+
+        Parameters
+        ----------
+        priority : str
+            One of `PRIORITY_CLASSES`.
+        tenant : str
+            The tenant (fair-queuing flow) the request belongs to.
+
+        Yields
+        ------
+        float
+            Seconds spent waiting for the slot.
+
+        Raises
+        ------
+        SchedulerOverloaded
+            If the request is rejected, evicted, or times out in the queue.
+        """
+        wait_s = self.acquire(priority, tenant)
+        try:
+            yield wait_s
+        finally:
+            self.release(priority)
+
+    def stats(self):
+        """
+        Return per-class queue depth, running count, and wait statistics.
+
+        Returns
+        -------
+        dict
+            Scheduler limits plus one entry per priority class.
+        """
+        with self._lock:
+            classes = {}
+            for cls in PRIORITY_CLASSES:
+                stats = self._stats[cls]
+                waits = sorted(stats["waits"])
+                tenants = {}
+                for ticket in self._queues[cls]:
+                    tenants[ticket.tenant] = tenants.get(ticket.tenant, 0) + 1
+                classes[cls] = {
+                    "queued": len(self._queues[cls]),
+                    "queued_by_tenant": tenants,
+                    "running": stats["running"],
+                    "admitted": stats["admitted"],
+                    "shed": stats["shed"],
+                    "wait_p50_ms": _percentile_ms(waits, 50),
+                    "wait_p95_ms": _percentile_ms(waits, 95),
+                    "wait_max_ms": round(waits[-1] * 1000, 1) if waits else 0.0,
+                }
+            return {
+                "concurrency": self.concurrency,
+                "running": self._running,
+                "max_queue": self.max_queue,
+                "max_wait_s": self.max_wait_s,
+                "classes": classes,
+            }
+
+    # --------------------------------------------------------------
+    # Admission and dispatch
+    # --------------------------------------------------------------
+
+    def acquire(self, priority, tenant):
+        """
+        Block until the request is granted a slot (see `slot`).
+
+        Returns
+        -------
+        float
+            Seconds spent waiting for the slot.
+
+        Raises
+        ------
+        SchedulerOverloaded
+            If the request is rejected, evicted, or times out in the queue.
+        """
+        with self._lock:
+            # Fast path: a free slot and nobody waiting
+            if self._running < self.concurrency and not any(self._queues.values()):
+                self._grant(priority, 0.0)
+                return 0.0
+
+            if sum(len(q) for q in self._queues.values()) >= self.max_queue:
+                self._make_room(priority)
+
+            # The tenant's last tag is that of its newest queued ticket (the
+            # queue is bounded by `max_queue`, so the scan is cheap)
+            queue = self._queues[priority]
+            last_tag = max((t.tag for t in queue if t.tenant == tenant), default=0.0)
+            start_tag = max(self._virtual_time[priority], last_tag)
+            weight = self.weights.get(tenant, 1.0)
+            ticket = _Ticket(priority, tenant, start_tag + 1.0 / weight, next(self._seq))
+            heapq.heappush(queue, ticket)
+
+        ticket.event.wait(timeout=self.max_wait_s)
+
+        with self._lock:
+            if ticket.granted:
+                return time.monotonic() - ticket.enqueued_at
+            if ticket.shed is None:
+                # Timed out while still queued
+                self._queues[priority].remove(ticket)
+                heapq.heapify(self._queues[priority])
+                ticket.shed = "max_wait"
+                self._stats[priority]["shed"] += 1
+        raise SchedulerOverloaded(priority, ticket.shed)
+
+    def _make_room(self, priority):
+        """Evict the newest request of the lowest class below `priority`, or reject."""
+        rank = PRIORITY_CLASSES.index(priority)
+        for cls in reversed(PRIORITY_CLASSES[rank + 1:]):
+            queue = self._queues[cls]
+            if queue:
+                victim = max(queue, key=lambda t: t.seq)
+                queue.remove(victim)
+                heapq.heapify(queue)
+                victim.shed = f"evicted_by_{priority}"
+                self._stats[cls]["shed"] += 1
+                victim.event.set()
+                return
+
+        self._stats[priority]["shed"] += 1
+        raise SchedulerOverloaded(priority, "queue_full")
+
+    def _grant(self, priority, wait_s):
+        self._running += 1
+        stats = self._stats[priority]
+        stats["running"] += 1
+        stats["admitted"] += 1
+        stats["waits"].append(wait_s)
+
+    def release(self, priority):
+        """Return a slot taken by `acquire` and hand it to the next request."""
+        with self._lock:
+            self._running -= 1
+            self._stats[priority]["running"] -= 1
+            self._dispatch()
+
+    def _dispatch(self):
+        """Hand free slots to the highest class, lowest virtual tag first."""
+        while self._running < self.concurrency:
+            cls = next((c for c in PRIORITY_CLASSES if self._queues[c]), None)
+            if cls is None:
+                return
+            ticket = heapq.heappop(self._queues[cls])
+            self._virtual_time[cls] = ticket.tag
+            ticket.granted = True
+            self._grant(cls, time.monotonic() - ticket.enqueued_at)
+            ticket.event.set()
+
+
+def _percentile_ms(sorted_values, pct):
+    """Nearest-rank percentile of seconds, in milliseconds."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100.0 * (len(sorted_values) - 1))))
+    return round(sorted_values[index] * 1000, 1)
+
+
+# ======================================================================
+# Global Scheduler
+# ======================================================================
+
+# Shared by every request handled by this process
+scheduler = FairScheduler(
+    concurrency=settings.SCHEDULER_CONCURRENCY,
+    max_queue=settings.SCHEDULER_MAX_QUEUE,
+    max_wait_s=settings.SCHEDULER_MAX_WAIT_S,
+    weights=parse_tenant_weights(settings.SCHEDULER_TENANT_WEIGHTS),
+    max_classes=parse_tenant_classes(settings.SCHEDULER_TENANT_MAX_CLASSES),
+    default_max_class=settings.SCHEDULER_DEFAULT_MAX_CLASS,
+)
@@ -0,0 +1,61 @@
+"""
+fingerprint.py
+--------------
+Stable request fingerprints for the Multi AI Agent project.
+
+A fingerprint identifies a `/chat` request by the fields that determine
+the agent's answer (model, system prompt, messages, and search toggle).
+It is used to key caches of previous answers, so two requests with the
+same inputs map to the same entry regardless of key order or transport.
+
+Usage
+-----
+Example:
+    from app.common.fingerprint import request_fingerprint
+
+    key = request_fingerprint({
+        "model_name": "llama-3.1-8b-instant",
+        "system_prompt": "You are helpful.",
+        "messages": ["Hello"],
+        "allow_search": False,
+    })
+"""
+
+# -------------------------------------------------------------------
+# Standard Library Imports
+# -------------------------------------------------------------------
+import hashlib
+import json
+from typing import Any, Mapping
+
+# -------------------------------------------------------------------
+# Constants
+# -------------------------------------------------------------------
+
+# Request fields that influence the agent's answer
+FINGERPRINT_FIELDS = ("model_name", "system_prompt", "messages", "allow_search")
+
+
+# -------------------------------------------------------------------
+# Fingerprint Function
+# -------------------------------------------------------------------
+def request_fingerprint(payload: Mapping[str, Any]) -> str:
+    """
+    Return the hex SHA-256 fingerprint of a `/chat` request payload.
+
+    Parameters
+    ----------
+    payload : Mapping[str, Any]
+        A request body (or any mapping) containing the fingerprint fields.
+
+    Returns
+    -------
+    str
+        A 64-character hexadecimal digest.
+    """
+    canonical = json.dumps(
+        [payload.get(field) for field in FINGERPRINT_FIELDS],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
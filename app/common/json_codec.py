@@ -0,0 +1,89 @@
+"""
+json_codec.py
+-------------
+Fast JSON encoding and decoding helpers for the Multi AI Agent project.
+
+This module wraps `orjson` when it is installed and falls back to the
+standard library `json` module otherwise, so every caller (backend
+responses, frontend decoding, benchmarks) shares one code path and the
+optional dependency is handled in a single place.
+
+Usage
+-----
+Example:
+    from app.common.json_codec import encode_json, decode_json
+
+    body = encode_json({"response": "Hello"})   # -> bytes
+    data = decode_json(body)                    # -> dict
+
+Notes
+-----
+- Install the optional extra with `pip install -e ".[fast]"` (or just
+  `pip install orjson`) to enable the fast path.
+- Output is compact UTF-8 JSON in both modes, so the two are interchangeable
+  on the wire.
+"""
+
+# -------------------------------------------------------------------
+# Standard Library Imports
+# -------------------------------------------------------------------
+import json
+from typing import Any
+
+# -------------------------------------------------------------------
+# Optional Dependency: orjson
+# -------------------------------------------------------------------
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+# Whether the fast path is available in this environment
+HAS_ORJSON = orjson is not None
+
+
+# -------------------------------------------------------------------
+# Encoding / Decoding
+# -------------------------------------------------------------------
+def encode_json(payload: Any, fast: bool = True) -> bytes:
+    """
+    Serialise `payload` to compact UTF-8 JSON bytes.
+
+    Parameters
+    ----------
+    payload : Any
+        A JSON-compatible object (dicts, lists, str, numbers, None).
+    fast : bool, default=True
+        Use `orjson` when available; set False to force the stdlib path.
+
+    Returns
+    -------
+    bytes
+        The encoded JSON document.
+    """
+    if fast and HAS_ORJSON:
+        return orjson.dumps(payload)
+
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def decode_json(data: bytes | str, fast: bool = True) -> Any:
+    """
+    Parse a JSON document from bytes or text.
+
+    Parameters
+    ----------
+    data : bytes or str
+        The encoded JSON document.
+    fast : bool, default=True
+        Use `orjson` when available; set False to force the stdlib path.
+
+    Returns
+    -------
+    Any
+        The decoded Python object.
+    """
+    if fast and HAS_ORJSON:
+        return orjson.loads(data)
+
+    return json.loads(data)
@@ -24,7 +24,8 @@ Example:
 Notes
 -----
 - Logs are written to `logs/log_YYYY-MM-DD.log` (UTF-8 encoded)
-- Each message includes a timestamp and severity level.
+- Each message includes a timestamp, severity level, and the request's
+  correlation ID (`-` outside a request; see `app.common.tracing`).
 - Default level: INFO
 - Console and file outputs both support Unicode characters.
 """
@@ -37,6 +38,11 @@ import os
 import sys
 from datetime import datetime
 
+# -------------------------------------------------------------------
+# Project Imports
+# -------------------------------------------------------------------
+from app.common.tracing import CorrelationIdFilter
+
 # -------------------------------------------------------------------
 # Directory Setup
 # -------------------------------------------------------------------
@@ -90,11 +96,18 @@ def get_logger(name: str) -> logging.Logger:
         # -------------------------------------------------------------------
         # Formatter
         # -------------------------------------------------------------------
-        formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+        formatter = logging.Formatter(
+            "%(asctime)s - %(levelname)s - [%(correlation_id)s] - %(message)s"
+        )
 
         file_handler.setFormatter(formatter)
         console_handler.setFormatter(formatter)
 
+        # Stamp every record with the request's correlation ID
+        correlation_filter = CorrelationIdFilter()
+        file_handler.addFilter(correlation_filter)
+        console_handler.addFilter(correlation_filter)
+
         # -------------------------------------------------------------------
         # Attach Handlers
         # -------------------------------------------------------------------
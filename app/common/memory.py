@@ -0,0 +1,130 @@
+"""
+memory.py
+---------
+Lightweight process memory helpers for the Multi AI Agent project.
+
+This module reads resident set size (RSS) figures straight from the Linux
+`/proc` filesystem so that load tests and the backend can report memory
+usage without pulling in an extra dependency such as `psutil`.
+
+Usage
+-----
+Example:
+    from app.common.memory import read_rss_kb
+
+    rss_kb = read_rss_kb()          # current process
+    worker_kb = read_rss_kb(12345)  # another process by PID
+
+Notes
+-----
+- On platforms without `/proc` (macOS, Windows) the helpers return `None`
+  rather than raising, so callers can degrade gracefully.
+"""
+
+# -------------------------------------------------------------------
+# Standard Library Imports
+# -------------------------------------------------------------------
+import os
+from typing import List, Optional
+
+# -------------------------------------------------------------------
+# Constants
+# -------------------------------------------------------------------
+PROC_DIR = "/proc"
+
+
+# -------------------------------------------------------------------
+# RSS Readers
+# -------------------------------------------------------------------
+def read_rss_kb(pid: Optional[int] = None) -> Optional[int]:
+    """
+    Return the resident set size of a process in kilobytes.
+
+    Parameters
+    ----------
+    pid : int or None, default=None
+        The process ID to inspect. Defaults to the current process.
+
+    Returns
+    -------
+    int or None
+        The `VmRSS` value in kB, or None if it cannot be determined.
+    """
+    status_path = os.path.join(PROC_DIR, str(pid or os.getpid()), "status")
+
+    try:
+        with open(status_path, encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+
+    return None
+
+
+def list_descendant_pids(root_pid: int) -> List[int]:
+    """
+    Return every descendant PID of `root_pid` (children, grandchildren, ...).
+
+    Parameters
+    ----------
+    root_pid : int
+        The PID whose process tree should be walked.
+
+    Returns
+    -------
+    list of int
+        Descendant PIDs, or an empty list when `/proc` is unavailable.
+    """
+    children = {}
+
+    try:
+        entries = os.listdir(PROC_DIR)
+    except OSError:
+        return []
+
+    # Build a parent -> children map from /proc/<pid>/stat
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(os.path.join(PROC_DIR, entry, "stat"), encoding="utf-8") as f:
+                # The command name may contain spaces, so split after ")"
+                fields = f.read().rsplit(")", 1)[1].split()
+            children.setdefault(int(fields[1]), []).append(int(entry))
+        except (OSError, ValueError, IndexError):
+            continue
+
+    # Breadth-first walk of the tree rooted at root_pid
+    descendants = []
+    pending = list(children.get(root_pid, []))
+    while pending:
+        pid = pending.pop(0)
+        descendants.append(pid)
+        pending.extend(children.get(pid, []))
+
+    return descendants
+
+
+def read_process_name(pid: int) -> Optional[str]:
+    """
+    Return a short command line for `pid`, useful for labelling reports.
+
+    Parameters
+    ----------
+    pid : int
+        The process ID to inspect.
+
+    Returns
+    -------
+    str or None
+        The space-joined command line, or None if unavailable.
+    """
+    try:
+        with open(os.path.join(PROC_DIR, str(pid), "cmdline"), "rb") as f:
+            parts = f.read().split(b"\0")
+    except OSError:
+        return None
+
+    return " ".join(p.decode("utf-8", "replace") for p in parts if p) or None
@@ -0,0 +1,347 @@
+"""
+tracing.py
+----------
+Request-level tracing and correlation IDs for the Multi AI Agent project.
+
+This module provides a small, dependency-free tracer that records spans
+(named, timed units of work with attributes) and exports them as
+OTLP/JSON-shaped records to a local JSONL file. Every span carries the
+request's correlation ID as its trace ID, and the same ID is injected into
+every log line, so a slow `/chat` call can be followed from the UI, through
+the backend, into each LangGraph node, LLM call, and tool call.
+
+Usage
+-----
+Example:
+    from app.common.tracing import correlation_scope, span
+
+    with correlation_scope("3f2c..."):
+        with span("agent.invoke", model="llama-3.1-8b-instant") as s:
+            ...
+            s.set_attribute("tokens.total", 938)
+
+Notes
+-----
+- Spans are written to `logs/traces_YYYY-MM-DD.jsonl` (the date is taken
+  when each span is written, so long-running workers roll over daily), one
+  span per line, using OTLP/JSON span field names (`traceId`, `spanId`,
+  `parentSpanId`, `startTimeUnixNano`, `attributes`, ...). Each line is a
+  bare span with a flat `resource` field, not a full OTLP export request:
+  it is meant for local inspection (`app.perf.trace_report`), and must be
+  wrapped in `resourceSpans` / `scopeSpans` before sending to a collector.
+- The trace file is kept open between spans and reopened only when the
+  date changes.
+- Correlation IDs and the current span live in `contextvars`, so they
+  follow requests across FastAPI's threadpool and LangChain's executors.
+  To continue a trace in another process, pass `current_span_context()`
+  along and open the worker's spans inside `remote_parent_scope(...)`.
+- Tracing is controlled by `settings.TRACING_ENABLED`.
+"""
+
+# -------------------------------------------------------------------
+# Standard Library Imports
+# -------------------------------------------------------------------
+import contextvars
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, NamedTuple, Optional, Union
+
+# -------------------------------------------------------------------
+# Project Imports
+# -------------------------------------------------------------------
+from app.config.settings import settings
+
+# -------------------------------------------------------------------
+# Constants
+# -------------------------------------------------------------------
+TRACES_DIR = "logs"
+
+# HTTP header used to propagate correlation IDs between services
+CORRELATION_HEADER = "X-Correlation-ID"
+
+# Service name reported on every span
+SERVICE_NAME = "multi-ai-agent"
+
+# -------------------------------------------------------------------
+# Context Variables
+# -------------------------------------------------------------------
+_correlation_id: contextvars.ContextVar[str] = contextvars.ContextVar("correlation_id", default="-")
+_current_span: contextvars.ContextVar[Optional[Union["Span", "SpanContext"]]] = contextvars.ContextVar(
+    "current_span", default=None
+)
+
+# Serialises writes to the trace file from concurrent threads
+_WRITE_LOCK = threading.Lock()
+
+# The open trace file and the path it was opened for
+_TRACE_HANDLE = None
+_TRACE_HANDLE_PATH = None
+
+
+# -------------------------------------------------------------------
+# Correlation IDs
+# -------------------------------------------------------------------
+def new_correlation_id() -> str:
+    """Return a fresh 32-character hexadecimal correlation ID."""
+    return uuid.uuid4().hex
+
+
+def get_correlation_id() -> str:
+    """Return the correlation ID of the current context (`"-"` if none)."""
+    return _correlation_id.get()
+
+
+@contextmanager
+def correlation_scope(correlation_id: Optional[str] = None):
+    """
+    Bind a correlation ID to the current context for the duration of a block.
+
+    Parameters
+    ----------
+    correlation_id : str or None
+        The ID to bind; a new one is generated when None or empty.
+
+    Yields
+    ------
+    str
+        The bound correlation ID.
+    """
+    correlation_id = correlation_id or new_correlation_id()
+    token = _correlation_id.set(correlation_id)
+    try:
+        yield correlation_id
+    finally:
+        _correlation_id.reset(token)
+
+
+def _trace_id_for(correlation_id: str) -> str:
+    """Map a correlation ID onto a valid 32-hex-character OTLP trace ID."""
+    candidate = correlation_id.lower()
+    if len(candidate) == 32 and all(c in "0123456789abcdef" for c in candidate):
+        return candidate
+    return hashlib.md5(correlation_id.encode("utf-8")).hexdigest()
+
+
+# -------------------------------------------------------------------
+# Logging Integration
+# -------------------------------------------------------------------
+class CorrelationIdFilter(logging.Filter):
+    """Logging filter that adds `record.correlation_id` to every record."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.correlation_id = _correlation_id.get()
+        return True
+
+
+# -------------------------------------------------------------------
+# Span
+# -------------------------------------------------------------------
+class SpanContext(NamedTuple):
+    """The identity of a span, picklable so another process can parent spans under it."""
+
+    trace_id: str
+    span_id: str
+
+
+class Span:
+    """
+    A single timed unit of work within a trace.
+
+    Parameters
+    ----------
+    name : str
+        Human-readable span name (e.g. `"llm.call"`).
+    parent : Span, SpanContext, or None
+        The parent span (or a span from another process); None starts a
+        root span.
+    attributes : dict or None
+        Initial span attributes.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        parent: Optional[Union["Span", SpanContext]] = None,
+        attributes: Optional[Dict[str, Any]] = None,
+    ):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else _trace_id_for(get_correlation_id())
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_span_id = parent.span_id if parent else ""
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Set (or overwrite) one span attribute."""
+        self.attributes[key] = value
+
+    def end(self, error: Optional[BaseException | str] = None) -> None:
+        """Finish the span (once) and export it."""
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns()
+        if error is not None:
+            self.error = str(error) or type(error).__name__
+        export_span(self)
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        """The span duration in milliseconds, once ended."""
+        if self.end_ns is None:
+            return None
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """Return the span as an OTLP/JSON-shaped dictionary."""
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_span_id,
+            "name": self.name,
+            "kind": "SPAN_KIND_INTERNAL",
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [
+                {"key": key, "value": _otlp_value(value)}
+                for key, value in self.attributes.items()
+            ],
+            "status": (
+                {"code": "STATUS_CODE_ERROR", "message": self.error}
+                if self.error else {"code": "STATUS_CODE_OK"}
+            ),
+            "resource": {"service.name": SERVICE_NAME, "process.pid": os.getpid()},
+        }
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    """Encode an attribute value in OTLP/JSON `AnyValue` form."""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+# -------------------------------------------------------------------
+# Span Helpers
+# -------------------------------------------------------------------
+def current_span() -> Optional[Union[Span, SpanContext]]:
+    """Return the active span of the current context, if any."""
+    return _current_span.get()
+
+
+def current_span_context() -> Optional[SpanContext]:
+    """Return the identity of the active span, for propagation to another process."""
+    active = _current_span.get()
+    return SpanContext(active.trace_id, active.span_id) if active is not None else None
+
+
+@contextmanager
+def remote_parent_scope(context: Optional[SpanContext]):
+    """
+    Parent the spans started in a block under a span from another process.
+
+    Parameters
+    ----------
+    context : SpanContext or None
+        The remote parent (from `current_span_context()`); None leaves the
+        current span unchanged.
+    """
+    if context is None:
+        yield
+        return
+    token = _current_span.set(SpanContext(*context))
+    try:
+        yield
+    finally:
+        _current_span.reset(token)
+
+
+def start_span(name: str, parent: Optional[Union[Span, SpanContext]] = None, **attributes: Any) -> Span:
+    """
+    Start a span without making it current (for callback-style APIs).
+
+    Parameters
+    ----------
+    name : str
+        The span name.
+    parent : Span, SpanContext, or None
+        Explicit parent; defaults to the current span.
+    **attributes
+        Initial span attributes.
+    """
+    return Span(name, parent=parent or current_span(), attributes=attributes)
+
+
+@contextmanager
+def span(name: str, **attributes: Any):
+    """
+    Context manager that starts a child of the current span and makes it current.
+
+    Exceptions are recorded on the span and re-raised.
+
+    Yields
+    ------
+    Span
+        The active span (use `set_attribute` to enrich it).
+    """
+    active = start_span(name, **attributes)
+    token = _current_span.set(active)
+    try:
+        yield active
+    except BaseException as e:
+        active.end(error=e)
+        raise
+    finally:
+        _current_span.reset(token)
+        active.end()
+
+
+# -------------------------------------------------------------------
+# Exporter
+# -------------------------------------------------------------------
+def trace_file_path(day: Optional[datetime] = None) -> str:
+    """Return the JSONL trace file for `day` (default: today)."""
+    day = day or datetime.now()
+    return os.path.join(TRACES_DIR, f"traces_{day.strftime('%Y-%m-%d')}.jsonl")
+
+
+def _trace_handle():
+    """Return the open trace file for today, reopening it after midnight."""
+    global _TRACE_HANDLE, _TRACE_HANDLE_PATH
+    path = trace_file_path()
+    if path != _TRACE_HANDLE_PATH:
+        if _TRACE_HANDLE is not None:
+            _TRACE_HANDLE.close()
+            _TRACE_HANDLE = None
+        os.makedirs(TRACES_DIR, exist_ok=True)
+        # Line-buffered, so every span reaches the file as soon as it ends
+        _TRACE_HANDLE = open(path, "a", encoding="utf-8", buffering=1)
+        _TRACE_HANDLE_PATH = path
+    return _TRACE_HANDLE
+
+
+def export_span(finished: Span) -> None:
+    """Append a finished span to the local JSONL trace file."""
+    global _TRACE_HANDLE_PATH
+    if not settings.TRACING_ENABLED:
+        return
+
+    line = json.dumps(finished.to_otlp(), ensure_ascii=False) + "\n"
+    with _WRITE_LOCK:
+        try:
+            _trace_handle().write(line)
+        except OSError:
+            # Tracing must never break request handling; retry the open next time
+            _TRACE_HANDLE_PATH = None
@@ -48,6 +48,93 @@ class Settings:
         A list of permitted LLM model identifiers that may be used by
         the agent. Restricting valid models promotes safety, reproducibility,
         and easier debugging.
+
+    USE_STUB_PROVIDERS : bool
+        When True, the agent uses local stub LLM and search providers
+        instead of Groq and Tavily (for load tests and offline runs).
+
+    STUB_LLM_LATENCY_MS, STUB_SEARCH_LATENCY_MS : float
+        Simulated per-call latency of the stub providers.
+
+    STUB_LLM_CPU_MS : float
+        Simulated CPU-bound work per stub LLM call (for execution-mode
+        benchmarks).
+
+    MAX_REQUEST_BYTES : int
+        Maximum raw `/chat` request body size; larger bodies get HTTP 413.
+
+    MAX_MESSAGES, MAX_MESSAGE_CHARS, MAX_SYSTEM_PROMPT_CHARS, MAX_TOTAL_CHARS : int
+        Field-level limits enforced by the `RequestState` schema.
+
+    FAST_JSON_ENABLED : bool
+        Use `orjson` for request/response JSON when it is installed.
+
+    COMPRESSION_ENABLED, COMPRESSION_MIN_BYTES, GZIP_LEVEL, ZSTD_LEVEL
+        Response compression negotiation for large `/chat` answers.
+
+    WARMUP_MODE : str
+        How the backend warms its agent pool at start-up: `stub`, `live`,
+        `build`, or `off`.
+
+    WARMUP_ATTEMPTS, WARMUP_RETRY_DELAY_S
+        How many times a failed warm-up is attempted, and the delay before
+        the first retry (doubled after every further failure).
+
+    BACKEND_URL, BACKEND_CONNECT_TIMEOUT_S, BACKEND_READ_TIMEOUT_S, BACKEND_POOL_SIZE
+        How the Streamlit UI reaches the backend.
+
+    UI_CACHE_SIZE : int
+        Maximum number of answers cached per UI session.
+
+    UI_TENANT : str
+        Tenant name the UI sends with its (`interactive`) requests.
+
+    TRACING_ENABLED : bool
+        Whether request spans are exported to the local JSONL trace file.
+
+    BUDGET_MAX_SECONDS, BUDGET_MAX_ITERATIONS, BUDGET_MAX_TOOL_CALLS, BUDGET_MAX_TOKENS
+        Default per-request agent budget; requests may override any of them.
+
+    ANSWER_STORE_ENABLED, ANSWER_STORE_DIR, ANSWER_STORE_SEGMENT_BYTES
+        Persistent on-disk store of `/chat` answers keyed by request
+        fingerprint (see `app/backend/answer_store.py`).
+
+    ANSWER_STORE_REUSE, ANSWER_STORE_MAX_AGE_S, ANSWER_STORE_SEARCH_MAX_AGE_S
+        Whether stored complete answers younger than the maximum age (0 = no
+        limit) are returned instead of running the agent (off by default).
+        Web-search answers use their own maximum age, where 0 means they
+        are never reused.
+
+    EXECUTION_MODE : str
+        Where agent runs execute: `thread` (FastAPI's threadpool, in the
+        server process) or `process` (a pool of long-lived worker processes).
+
+    PROCESS_POOL_WORKERS : int
+        Number of worker processes in `process` execution mode.
+
+    SCHEDULER_ENABLED, SCHEDULER_CONCURRENCY, SCHEDULER_MAX_QUEUE, SCHEDULER_MAX_WAIT_S
+        Priority/fair-queuing admission in front of agent execution: slots,
+        maximum waiting requests, and maximum wait before shedding (HTTP 503).
+
+    SCHEDULER_SPARE_THREADS : int
+        Threadpool threads kept beyond slots plus queue, so requests over the
+        limit are shed promptly rather than waiting for a thread.
+
+    SCHEDULER_TENANT_WEIGHTS : str
+        Fair-queuing weights as `tenant=weight,...` (unlisted tenants get 1).
+
+    SCHEDULER_TENANT_MAX_CLASSES, SCHEDULER_DEFAULT_MAX_CLASS : str
+        Highest priority class each tenant may claim, as `tenant=class,...`,
+        and the cap for unlisted tenants. Higher claims are downgraded.
+
+    CONVERSATION_CACHE_SIZE, CONVERSATION_CACHE_MAX_TOKENS : int
+        Number of converted conversations kept for incremental reuse of
+        message objects and token counts (0 disables the cache), and the
+        limit on their summed estimated tokens.
+
+    TOOL_TRIMMING_ENABLED, TOOL_OUTPUT_MAX_TOKENS, TOOL_TRIM_CACHE_SIZE
+        Extraction, deduplication, and truncation of search results before
+        they enter the agent's prompt, with a per-URL cache of trimmed text.
     """
 
     # --------------------------------------------------------------
@@ -70,6 +157,169 @@ class Settings:
         "llama-3.3-70b-versatile"
     ]
 
+    # --------------------------------------------------------------
+    # Stub providers (load testing / offline runs)
+    # --------------------------------------------------------------
+
+    # Replace Groq and Tavily with in-process stubs (see app/core/stubs.py)
+    USE_STUB_PROVIDERS = os.getenv("USE_STUB_PROVIDERS", "false").lower() == "true"
+
+    # Simulated latency of the stub LLM and stub search tool, in milliseconds
+    STUB_LLM_LATENCY_MS = float(os.getenv("STUB_LLM_LATENCY_MS", "300"))
+    STUB_SEARCH_LATENCY_MS = float(os.getenv("STUB_SEARCH_LATENCY_MS", "150"))
+
+    # Simulated CPU-bound work per stub LLM call, in milliseconds
+    STUB_LLM_CPU_MS = float(os.getenv("STUB_LLM_CPU_MS", "0"))
+
+    # --------------------------------------------------------------
+    # Request size limits
+    # --------------------------------------------------------------
+
+    # Maximum raw request body size, enforced while the body streams in
+    MAX_REQUEST_BYTES = int(os.getenv("MAX_REQUEST_BYTES", str(256 * 1024)))
+
+    # Maximum number of messages and characters per field
+    MAX_MESSAGES = int(os.getenv("MAX_MESSAGES", "50"))
+    MAX_MESSAGE_CHARS = int(os.getenv("MAX_MESSAGE_CHARS", "16000"))
+    MAX_SYSTEM_PROMPT_CHARS = int(os.getenv("MAX_SYSTEM_PROMPT_CHARS", "8000"))
+
+    # Maximum combined characters across the system prompt and all messages
+    MAX_TOTAL_CHARS = int(os.getenv("MAX_TOTAL_CHARS", "100000"))
+
+    # --------------------------------------------------------------
+    # Response serialisation
+    # --------------------------------------------------------------
+
+    # Use orjson for JSON encoding/decoding when it is installed
+    FAST_JSON_ENABLED = os.getenv("FAST_JSON_ENABLED", "true").lower() == "true"
+
+    # Negotiate zstd/gzip compression for responses at least this large
+    COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+    COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+    GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "5"))
+    ZSTD_LEVEL = int(os.getenv("ZSTD_LEVEL", "3"))
+
+    # --------------------------------------------------------------
+    # Agent warm-up
+    # --------------------------------------------------------------
+
+    # Start-up warm-up mode: "stub" (synthetic run on stub providers),
+    # "live" (synthetic run on the real providers), "build" (compile
+    # agents only), or "off" (no warm-up; ready immediately)
+    WARMUP_MODE = os.getenv("WARMUP_MODE", "stub").lower()
+
+    # Warm-up attempts before the pool is reported as failed, and the delay
+    # before the first retry in seconds (doubled after every failure)
+    WARMUP_ATTEMPTS = int(os.getenv("WARMUP_ATTEMPTS", "3"))
+    WARMUP_RETRY_DELAY_S = float(os.getenv("WARMUP_RETRY_DELAY_S", "5"))
+
+    # --------------------------------------------------------------
+    # Frontend → backend communication
+    # --------------------------------------------------------------
+
+    # Backend `/chat` endpoint used by the Streamlit UI
+    BACKEND_URL = os.getenv("BACKEND_URL", "http://127.0.0.1:9999/chat")
+
+    # Connect and read timeouts for backend calls, in seconds
+    BACKEND_CONNECT_TIMEOUT_S = float(os.getenv("BACKEND_CONNECT_TIMEOUT_S", "3"))
+    BACKEND_READ_TIMEOUT_S = float(os.getenv("BACKEND_READ_TIMEOUT_S", "120"))
+
+    # Size of the UI's pooled HTTP connection pool
+    BACKEND_POOL_SIZE = int(os.getenv("BACKEND_POOL_SIZE", "32"))
+
+    # Number of answers cached per browser session
+    UI_CACHE_SIZE = int(os.getenv("UI_CACHE_SIZE", "20"))
+
+    # Tenant of the UI's requests (granted `interactive` by the scheduler)
+    UI_TENANT = os.getenv("UI_TENANT", "streamlit-ui")
+
+    # --------------------------------------------------------------
+    # Tracing
+    # --------------------------------------------------------------
+
+    # Export request trace spans to logs/traces_YYYY-MM-DD.jsonl
+    TRACING_ENABLED = os.getenv("TRACING_ENABLED", "true").lower() == "true"
+
+    # --------------------------------------------------------------
+    # Agent execution budget (defaults; overridable per request)
+    # --------------------------------------------------------------
+
+    # Wall-clock seconds, ReAct iterations (LLM calls), tool calls, and
+    # total tokens allowed per request before the run stops early
+    BUDGET_MAX_SECONDS = float(os.getenv("BUDGET_MAX_SECONDS", "60"))
+    BUDGET_MAX_ITERATIONS = int(os.getenv("BUDGET_MAX_ITERATIONS", "8"))
+    BUDGET_MAX_TOOL_CALLS = int(os.getenv("BUDGET_MAX_TOOL_CALLS", "4"))
+    BUDGET_MAX_TOKENS = int(os.getenv("BUDGET_MAX_TOKENS", "32000"))
+
+    # --------------------------------------------------------------
+    # Persistent answer store
+    # --------------------------------------------------------------
+
+    # Keep every answer on disk, keyed by request fingerprint
+    ANSWER_STORE_ENABLED = os.getenv("ANSWER_STORE_ENABLED", "true").lower() == "true"
+    ANSWER_STORE_DIR = os.getenv("ANSWER_STORE_DIR", os.path.join("data", "answer_store"))
+    ANSWER_STORE_SEGMENT_BYTES = int(os.getenv("ANSWER_STORE_SEGMENT_BYTES", str(64 * 1024 * 1024)))
+
+    # Serve stored complete answers younger than this many seconds (0 = forever)
+    ANSWER_STORE_REUSE = os.getenv("ANSWER_STORE_REUSE", "false").lower() == "true"
+    ANSWER_STORE_MAX_AGE_S = float(os.getenv("ANSWER_STORE_MAX_AGE_S", "86400"))
+
+    # Web-search answers go stale quickly: their own maximum age (0 = never reuse)
+    ANSWER_STORE_SEARCH_MAX_AGE_S = float(os.getenv("ANSWER_STORE_SEARCH_MAX_AGE_S", "0"))
+
+    # --------------------------------------------------------------
+    # Agent execution mode
+    # --------------------------------------------------------------
+
+    # "thread" runs agents in the server process; "process" runs them in
+    # long-lived worker processes that hold their own warm agents
+    EXECUTION_MODE = os.getenv("EXECUTION_MODE", "thread").lower()
+    PROCESS_POOL_WORKERS = int(os.getenv("PROCESS_POOL_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+    # --------------------------------------------------------------
+    # Request scheduling (priority classes + weighted fair queuing)
+    # --------------------------------------------------------------
+
+    # Concurrent agent runs, and waiting requests before load is shed. Every
+    # running or waiting request holds a threadpool thread, so the backend
+    # sizes the threadpool to their sum plus `SCHEDULER_SPARE_THREADS`:
+    # requests beyond the limit then reach admission control and are shed,
+    # instead of queuing (FIFO) for a thread. The default concurrency matches
+    # the 40 threads FastAPI's threadpool runs sync endpoints on
+    SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "true").lower() == "true"
+    SCHEDULER_CONCURRENCY = int(os.getenv("SCHEDULER_CONCURRENCY", "40"))
+    SCHEDULER_MAX_QUEUE = int(os.getenv("SCHEDULER_MAX_QUEUE", "16"))
+    SCHEDULER_SPARE_THREADS = int(os.getenv("SCHEDULER_SPARE_THREADS", "16"))
+    SCHEDULER_MAX_WAIT_S = float(os.getenv("SCHEDULER_MAX_WAIT_S", "30"))
+
+    # Per-tenant fair-queuing weights, e.g. "acme=3,batch-etl=0.5"
+    SCHEDULER_TENANT_WEIGHTS = os.getenv("SCHEDULER_TENANT_WEIGHTS", "")
+
+    # Highest class a tenant may claim; clients choose `priority` themselves,
+    # so only tenants listed here get above the default cap
+    SCHEDULER_TENANT_MAX_CLASSES = os.getenv("SCHEDULER_TENANT_MAX_CLASSES", "streamlit-ui=interactive")
+    SCHEDULER_DEFAULT_MAX_CLASS = os.getenv("SCHEDULER_DEFAULT_MAX_CLASS", "batch")
+
+    # --------------------------------------------------------------
+    # Conversation conversion cache
+    # --------------------------------------------------------------
+
+    # Converted conversations remembered per process (LRU), bounded by entry
+    # count and by their summed estimated tokens (~4 characters per token)
+    CONVERSATION_CACHE_SIZE = int(os.getenv("CONVERSATION_CACHE_SIZE", "1024"))
+    CONVERSATION_CACHE_MAX_TOKENS = int(os.getenv("CONVERSATION_CACHE_MAX_TOKENS", "2000000"))
+
+    # --------------------------------------------------------------
+    # Tool output trimming
+    # --------------------------------------------------------------
+
+    # Trim search results to this many tokens per tool call
+    TOOL_TRIMMING_ENABLED = os.getenv("TOOL_TRIMMING_ENABLED", "true").lower() == "true"
+    TOOL_OUTPUT_MAX_TOKENS = int(os.getenv("TOOL_OUTPUT_MAX_TOKENS", "600"))
+
+    # Trimmed page contents remembered per URL (LRU)
+    TOOL_TRIM_CACHE_SIZE = int(os.getenv("TOOL_TRIM_CACHE_SIZE", "512"))
+
 
 # ======================================================================
 # Instantiate global settings object
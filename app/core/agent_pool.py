@@ -0,0 +1,235 @@
+"""
+agent_pool.py
+=============
+
+Warm pool of compiled LangGraph agents for the Multi-AI Agent system.
+
+Building an agent is not free: the first call pays for module imports, the
+Groq/Tavily client setup, and compiling the LangGraph state graph. Doing
+this on every request (and especially on the first requests after a
+deploy) adds avoidable latency.
+
+This module keeps one compiled agent per `(model, allow_search)` pair and
+hands it out to every request. The system prompt is supplied per request as
+a leading `SystemMessage` in the agent state, so a single compiled agent
+serves every persona.
+
+Workflow:
+* `get_agent` returns a cached agent, building it on first use.
+* `warm_up` pre-builds agents for every allowed model, with and without
+  search, and runs a synthetic invocation through the graph so the first
+  real request finds everything initialised.
+* `pool_status` reports readiness for the backend's health probes.
+"""
+
+# ======================================================================
+# Imports
+# ======================================================================
+
+# Thread-safety and timing
+import threading
+import time
+
+# Agent factory (builds a LangGraph agent graph under the hood)
+from langchain.agents import create_agent
+
+# Message types used for the synthetic warm-up invocation
+from langchain_core.messages import HumanMessage, SystemMessage
+
+# Offline provider stubs used for stub warm-ups
+from app.core.stubs import StubChatModel, StubSearchTool
+
+# Project settings (allowed models, warm-up configuration)
+from app.config.settings import settings
+
+# Project-wide logging utility
+from app.common.logger import get_logger
+
+# Trace spans for agent construction
+from app.common.tracing import span
+
+
+# ======================================================================
+# Initialisation
+# ======================================================================
+
+# Module-level logger
+logger = get_logger(__name__)
+
+# Compiled agents keyed by (llm_id, allow_search)
+_AGENTS = {}
+
+# Guards `_AGENTS` so concurrent first requests build an agent only once
+_LOCK = threading.Lock()
+
+# Readiness state reported by the health probes
+_STATUS = {"state": "cold", "warmed": [], "error": None, "attempts": 0, "duration_s": None}
+
+# Prompt used for synthetic warm-up invocations
+WARMUP_PROMPT = "Warm-up request: reply with a short greeting."
+
+
+# ======================================================================
+# Agent Construction
+# ======================================================================
+
+def build_agent(llm, tools):
+    """
+    Compile a ReAct-style agent for the given model and tools.
+
+    Parameters
+    ----------
+    llm : BaseChatModel
+        The chat model driving the agent.
+    tools : list
+        The tools available to the agent.
+
+    Returns
+    -------
+    CompiledStateGraph
+        The compiled LangGraph agent. The system prompt is not baked in;
+        callers prepend a `SystemMessage` to the input messages instead.
+    """
+    return create_agent(model=llm, tools=tools)
+
+
+def get_agent(llm_id, allow_search, factory):
+    """
+    Return the pooled agent for `(llm_id, allow_search)`, building it once.
+
+    Parameters
+    ----------
+    llm_id : str
+        The model identifier.
+    allow_search : bool
+        Whether the agent has the web search tool attached.
+    factory : callable
+        `factory(llm_id, allow_search)` returning a new compiled agent.
+
+    Returns
+    -------
+    CompiledStateGraph
+        The shared compiled agent.
+    """
+    key = (llm_id, bool(allow_search))
+
+    agent = _AGENTS.get(key)
+    if agent is not None:
+        return agent
+
+    with _LOCK:
+        # Re-check: another thread may have built it while we waited
+        agent = _AGENTS.get(key)
+        if agent is None:
+            logger.info(f"Building agent for model={llm_id} search={allow_search}")
+            with span("agent.build", model=llm_id, allow_search=bool(allow_search)):
+                agent = factory(llm_id, allow_search)
+            _AGENTS[key] = agent
+
+    return agent
+
+
+# ======================================================================
+# Warm-up
+# ======================================================================
+
+def _warmup_invoke(llm_id, allow_search, agent):
+    """
+    Run one synthetic invocation according to `settings.WARMUP_MODE`.
+
+    * `"stub"` compiles a same-shaped agent around the stub providers and
+      invokes it, warming LangChain/LangGraph code paths without API calls.
+    * `"live"` invokes the pooled agent itself (real provider calls).
+    * `"build"` only builds the agents, without invoking anything.
+
+    (`"off"` skips warm-up entirely and is handled by `warm_up`.)
+    """
+    mode = settings.WARMUP_MODE
+    if mode == "build":
+        return
+
+    state = {"messages": [SystemMessage(WARMUP_PROMPT), HumanMessage("Hello")]}
+
+    if mode == "live":
+        agent.invoke(state)
+        return
+
+    stub_tools = [StubSearchTool(max_results=1)] if allow_search else []
+    stub_agent = build_agent(StubChatModel(model=llm_id, answer_chars=32), stub_tools)
+    stub_agent.invoke(state)
+
+
+def warm_up(factory, model_names=None):
+    """
+    Pre-build and exercise agents for every model, with and without search.
+
+    Parameters
+    ----------
+    factory : callable
+        `factory(llm_id, allow_search)` returning a new compiled agent
+        (normally `app.core.ai_agent.create_pooled_agent`).
+    model_names : list of str or None
+        Models to warm; defaults to `settings.ALLOWED_MODEL_NAMES`.
+
+    Notes
+    -----
+    Intended to run once in a background thread at start-up. A failed
+    attempt (e.g. a provider client that cannot be initialised) is logged
+    with its traceback and retried up to `WARMUP_ATTEMPTS` times with
+    exponential backoff. Failures are recorded in the readiness status
+    rather than raised, so the liveness probe keeps answering while the
+    readiness probe reports the error.
+    """
+    if settings.WARMUP_MODE == "off":
+        _STATUS.update(state="ready", duration_s=0.0)
+        logger.info("Agent pool warm-up disabled; reporting ready immediately")
+        return
+
+    model_names = model_names or settings.ALLOWED_MODEL_NAMES
+    attempts = max(1, settings.WARMUP_ATTEMPTS)
+    delay_s = settings.WARMUP_RETRY_DELAY_S
+    start = time.perf_counter()
+    _STATUS.update(state="warming", warmed=[], error=None, attempts=0, duration_s=None)
+
+    for attempt in range(1, attempts + 1):
+        _STATUS.update(attempts=attempt, warmed=[])
+        try:
+            for llm_id in model_names:
+                for allow_search in (False, True):
+                    agent = get_agent(llm_id, allow_search, factory)
+                    _warmup_invoke(llm_id, allow_search, agent)
+                    _STATUS["warmed"].append(f"{llm_id}|search={allow_search}")
+
+            _STATUS.update(state="ready", error=None, duration_s=round(time.perf_counter() - start, 3))
+            logger.info(f"Agent pool warm in {_STATUS['duration_s']}s ({len(_STATUS['warmed'])} agents)")
+            return
+
+        except Exception as e:
+            _STATUS["error"] = f"{type(e).__name__}: {e}"
+            logger.exception(f"Agent pool warm-up attempt {attempt}/{attempts} failed")
+            if attempt < attempts:
+                logger.info(f"Retrying agent pool warm-up in {delay_s:g}s")
+                time.sleep(delay_s)
+                delay_s *= 2
+
+    _STATUS.update(state="failed")
+    logger.error(f"Agent pool warm-up failed after {attempts} attempts: {_STATUS['error']}")
+
+
+def pool_status():
+    """
+    Return a copy of the warm-up status.
+
+    Returns
+    -------
+    dict
+        `state` (`cold`, `warming`, `ready`, or `failed`), the warmed agent
+        keys, the last error (if any), the number of attempts made, and the
+        warm-up duration in seconds.
+    """
+    return {**_STATUS, "warmed": list(_STATUS["warmed"])}
+
+
+def is_ready():
+    """Return True once the pool has been warmed successfully."""
+    return _STATUS["state"] == "ready"
@@ -0,0 +1,157 @@
+"""
+agent_tracing.py
+================
+
+LangChain callback handler that turns agent execution into trace spans.
+
+`TracingCallbackHandler` is passed to `agent.invoke` via the run config. It
+opens a span for every LangGraph node execution (`model`, `tools`), every
+chat-model call (with token usage), and every tool call (e.g. Tavily),
+nested under the span that was current when the handler was created.
+
+Only tool runs started directly by a graph node are traced and counted:
+a wrapper tool such as `TrimmedSearchTool` runs the tool it wraps as a
+child run, and that inner run must not appear as a second tool call.
+
+Callbacks are matched to spans by LangChain `run_id`, so the handler works
+regardless of which thread LangGraph uses to execute a node.
+"""
+
+# ======================================================================
+# Imports
+# ======================================================================
+
+# Thread-safety for the run → span map
+import threading
+
+# Base class for LangChain callback handlers
+from langchain_core.callbacks import BaseCallbackHandler
+
+# Span helpers from the shared tracer
+from app.common.tracing import current_span, start_span
+
+
+# ======================================================================
+# Tracing Callback Handler
+# ======================================================================
+
+class TracingCallbackHandler(BaseCallbackHandler):
+    """
+    Record LangGraph nodes, LLM calls, and tool calls as spans.
+
+    Attributes
+    ----------
+    totals : dict
+        Running totals for the request: `llm_calls`, `tool_calls`,
+        `input_tokens`, `output_tokens`.
+    """
+
+    def __init__(self):
+        self._root = current_span()
+        self._spans = {}
+        self._lock = threading.Lock()
+        self.totals = {"llm_calls": 0, "tool_calls": 0, "input_tokens": 0, "output_tokens": 0}
+
+    # --------------------------------------------------------------
+    # Span bookkeeping
+    # --------------------------------------------------------------
+
+    def _open(self, run_id, parent_run_id, name, **attributes):
+        with self._lock:
+            parent = self._spans.get(parent_run_id, self._root)
+            self._spans[run_id] = start_span(name, parent=parent, **attributes)
+
+    def _close(self, run_id, error=None, **attributes):
+        with self._lock:
+            finished = self._spans.pop(run_id, None)
+        if finished is None:
+            return False
+        for key, value in attributes.items():
+            finished.set_attribute(key, value)
+        finished.end(error=error)
+        return True
+
+    def _is_node_run(self, run_id):
+        with self._lock:
+            parent = self._spans.get(run_id)
+        return parent is not None and parent.name.startswith("langgraph.node.")
+
+    # --------------------------------------------------------------
+    # LangGraph nodes
+    # --------------------------------------------------------------
+
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, metadata=None, **kwargs):
+        metadata = metadata or {}
+        node = metadata.get("langgraph_node")
+
+        # Only trace the node runs themselves, not every nested runnable
+        if node is None or kwargs.get("name") != node:
+            return
+
+        self._open(
+            run_id, parent_run_id, f"langgraph.node.{node}",
+            **{"langgraph.node": node, "langgraph.step": metadata.get("langgraph_step", -1)},
+        )
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        self._close(run_id)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        self._close(run_id, error=error)
+
+    # --------------------------------------------------------------
+    # LLM calls
+    # --------------------------------------------------------------
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, parent_run_id=None, metadata=None, **kwargs):
+        metadata = metadata or {}
+        self._open(
+            run_id, parent_run_id, "llm.call",
+            **{
+                "llm.model": metadata.get("ls_model_name", "unknown"),
+                "llm.input_messages": sum(len(batch) for batch in messages),
+            },
+        )
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        usage = {}
+        try:
+            usage = getattr(response.generations[0][0].message, "usage_metadata", None) or {}
+        except (IndexError, AttributeError):
+            pass
+
+        input_tokens = usage.get("input_tokens", 0)
+        output_tokens = usage.get("output_tokens", 0)
+        with self._lock:
+            self.totals["llm_calls"] += 1
+            self.totals["input_tokens"] += input_tokens
+            self.totals["output_tokens"] += output_tokens
+
+        self._close(
+            run_id,
+            **{"llm.tokens.input": input_tokens, "llm.tokens.output": output_tokens},
+        )
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._close(run_id, error=error)
+
+    # --------------------------------------------------------------
+    # Tool calls
+    # --------------------------------------------------------------
+
+    def on_tool_start(self, serialized, input_str, *, run_id, parent_run_id=None, **kwargs):
+        # Skip tools run by another tool (e.g. the search wrapped for trimming)
+        if not self._is_node_run(parent_run_id):
+            return
+
+        tool_name = (serialized or {}).get("name") or kwargs.get("name") or "tool"
+        self._open(run_id, parent_run_id, f"tool.{tool_name}", **{"tool.name": tool_name})
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        content = getattr(output, "content", output)
+        if self._close(run_id, **{"tool.output_chars": len(str(content))}):
+            with self._lock:
+                self.totals["tool_calls"] += 1
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        self._close(run_id, error=error)
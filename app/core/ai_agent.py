@@ -11,8 +11,10 @@ LangChain's stable **create_agent** API. The agent can optionally use
 Workflow:
 * Load a Groq-backed chat model.
 * Optionally attach a Tavily search tool.
-* Build a LangGraph-powered agent via `langchain.agents.create_agent`.
-* Invoke the agent with a messages state and return the final AI message.
+* Build a LangGraph-powered agent via `langchain.agents.create_agent`
+  (once per model/tool combination, then reused from the warm pool).
+* Stream the agent step by step under a per-request budget and return the
+  final (or best partial) AI message.
 
 This acts as the main execution layer for agent reasoning in the project.
 """
@@ -27,23 +29,115 @@ from langchain_groq import ChatGroq
 # Tavily search tool (recommended, stable package)
 from langchain_tavily import TavilySearch
 
-# Agent factory (builds a LangGraph agent graph under the hood)
-from langchain.agents import create_agent
-
-# Message type for filtering AI responses
+# Message types for the system prompt and filtering AI responses
 from langchain_core.messages import AIMessage
 
 # Project settings (API keys, allowed models, etc.)
 from app.config.settings import settings
 
+# Offline provider stubs used for load testing
+from app.core.stubs import StubChatModel, StubSearchTool
+
+# Warm pool of compiled agents (built via `create_agent`)
+from app.core.agent_pool import build_agent, get_agent
+
+# Incremental conversion of resent conversations
+from app.core.conversation import prepare_conversation
+
+# Search result trimming (token budget, dedup, per-URL cache)
+from app.core.tool_trimming import TrimmedSearchTool, trimming_scope
+
+# Per-request execution budget and early-termination helpers
+from app.core.budget import BudgetTracker, best_partial_answer, stream_within_budget
+
+# Request tracing: spans for agent acquisition/invocation + LangChain callbacks
+from app.common.tracing import span
+from app.core.agent_tracing import TracingCallbackHandler
+
 
 # ======================================================================
-# Core Agent Function
+# Provider Factories
 # ======================================================================
 
-def get_response_from_ai_agents(llm_id, query, allow_search, system_prompt):
+def _build_llm(llm_id):
     """
-    Generate a response using the LangGraph-backed ReAct-style AI agent.
+    Create the chat model for `llm_id`, honouring the stub-provider setting.
+
+    Parameters
+    ----------
+    llm_id : str
+        The model identifier to load.
+
+    Returns
+    -------
+    BaseChatModel
+        A `ChatGroq` instance, or a `StubChatModel` when stubs are enabled.
+    """
+    if settings.USE_STUB_PROVIDERS:
+        return StubChatModel(
+            model=llm_id,
+            latency_ms=settings.STUB_LLM_LATENCY_MS,
+            cpu_ms=settings.STUB_LLM_CPU_MS,
+        )
+
+    return ChatGroq(model=llm_id)
+
+
+def _build_tools(allow_search):
+    """
+    Create the tool list for the agent, honouring the stub-provider setting.
+
+    Parameters
+    ----------
+    allow_search : bool
+        Whether the web search tool should be attached.
+
+    Returns
+    -------
+    list
+        An empty list, or a single Tavily (or stub) search tool, wrapped
+        to trim its results when `TOOL_TRIMMING_ENABLED` is set.
+    """
+    if not allow_search:
+        return []
+
+    if settings.USE_STUB_PROVIDERS:
+        search = StubSearchTool(max_results=2, latency_ms=settings.STUB_SEARCH_LATENCY_MS)
+    else:
+        search = TavilySearch(max_results=2, topic="general")
+
+    if settings.TOOL_TRIMMING_ENABLED:
+        search = TrimmedSearchTool.wrap(search, settings.TOOL_OUTPUT_MAX_TOKENS)
+
+    return [search]
+
+
+def create_pooled_agent(llm_id, allow_search):
+    """
+    Build a new agent for the warm pool (see `app.core.agent_pool`).
+
+    Parameters
+    ----------
+    llm_id : str
+        The model identifier to load.
+    allow_search : bool
+        Whether to attach the web search tool.
+
+    Returns
+    -------
+    CompiledStateGraph
+        A compiled agent without a baked-in system prompt.
+    """
+    return build_agent(_build_llm(llm_id), _build_tools(allow_search))
+
+
+# ======================================================================
+# Core Agent Functions
+# ======================================================================
+
+def run_agent(llm_id, query, allow_search, system_prompt, budget=None):
+    """
+    Run the ReAct-style agent under an execution budget.
 
     Parameters
     ----------
@@ -51,74 +145,134 @@ def get_response_from_ai_agents(llm_id, query, allow_search, system_prompt):
         The model identifier to load via the Groq API (ideally one of the
         allowed model names defined in project settings).
     query : list
-        A list of message objects or message-like dictionaries representing the
+        A list of message objects or message-like values representing the
         current conversation state to be passed into the agent graph.
     allow_search : bool
         Whether to enable Tavily web search as a tool for the agent.
     system_prompt : str
         A system-level instruction string that controls the agent's behaviour.
+    budget : dict or None
+        Per-request overrides for `max_seconds`, `max_iterations`,
+        `max_tool_calls`, and `max_tokens` (see `app.core.budget`).
 
     Returns
     -------
-    str
-        The final text response produced by the last AI message in the sequence.
+    dict
+        `"response"`: the final (or best partial) answer text,
+        `"budget"`: the budget limits, usage, and early-stop reason, and
+        `"conversation"`: how much of the input was reused from the
+        conversation cache, and `"tool_output"`: search results kept and
+        tokens saved by tool-output trimming.
 
     Notes
     -----
     * If `allow_search` is True, a TavilySearch tool is attached (with a small
       max_results value for efficiency).
+    * If `settings.USE_STUB_PROVIDERS` is True, Groq and Tavily are replaced
+      by the offline stubs in `app.core.stubs`.
     * The agent itself is created via `langchain.agents.create_agent`, which
-      compiles down to a LangGraph StateGraph under the hood.
+      compiles down to a LangGraph StateGraph under the hood, and is reused
+      across requests from the warm pool in `app.core.agent_pool`.
+    * The graph is streamed step by step; when a budget is exhausted the
+      stream is abandoned and the best partial answer is returned. The
+      time budget is enforced during a step too (see
+      `app.core.budget.stream_within_budget`).
     """
 
     # --------------------------------------------------------------
-    # Initialise LLM
+    # Fetch the pooled reasoning agent (LangGraph-powered)
     # --------------------------------------------------------------
 
-    # Create a Groq-backed LLM instance using the selected model ID
-    llm = ChatGroq(model=llm_id)
+    # Reuse the compiled agent for this model/tool combination; it is built
+    # (Groq-backed LLM + optional Tavily tool) only on first use or warm-up
+    with span("agent.acquire", model=llm_id, allow_search=bool(allow_search)):
+        agent = get_agent(llm_id, allow_search, create_pooled_agent)
 
     # --------------------------------------------------------------
-    # Configure optional tools
+    # Prepare agent input state
     # --------------------------------------------------------------
 
-    # If search is allowed, include the Tavily search tool; otherwise, no tools
-    tools = [TavilySearch(max_results=2, topic="general")] if allow_search else []
+    # The agent expects messages wrapped inside a dict under the "messages"
+    # key; the per-request system prompt leads the conversation, and only
+    # messages not seen in an earlier turn are converted
+    messages, conversation = prepare_conversation(system_prompt, query)
+    state = {"messages": messages}
+    input_count = len(messages)
 
     # --------------------------------------------------------------
-    # Build the reasoning agent (LangGraph-powered)
+    # Stream the agent step by step under the budget
     # --------------------------------------------------------------
 
-    # Create a ReAct-style agent with tools and a system prompt
-    agent = create_agent(
-        model=llm,
-        tools=tools,
-        system_prompt=system_prompt,
-    )
+    tracker = BudgetTracker(budget)
+    new_messages = []
 
-    # --------------------------------------------------------------
-    # Prepare agent input state
-    # --------------------------------------------------------------
+    # The tracing callback records every graph node, LLM call, and tool
+    # call as a span beneath `agent.invoke`
+    with span("agent.invoke", model=llm_id) as invoke_span, trimming_scope() as trimming:
+        tracer = TracingCallbackHandler()
 
-    # The agent expects messages wrapped inside a dict under the "messages" key
-    state = {"messages": query}
+        # "values" mode yields the full state after every graph step; the
+        # wait for each step is cut short when `max_seconds` runs out
+        stream = stream_within_budget(
+            lambda: agent.stream(state, config={"callbacks": [tracer]}, stream_mode="values"),
+            tracker,
+        )
+        for chunk in stream:
+            new_messages = chunk.get("messages", [])[input_count:]
+            if not tracker.update(new_messages):
+                break
+
+        for key, value in tracer.totals.items():
+            invoke_span.set_attribute(f"agent.{key}", value)
+        invoke_span.set_attribute("budget.exhausted_reason", tracker.exhausted_reason or "")
+        invoke_span.set_attribute("tool_output.tokens_saved", trimming["tokens_saved"])
 
     # --------------------------------------------------------------
-    # Invoke the agent and collect results
+    # Collect the answer
     # --------------------------------------------------------------
 
-    # Run the LangGraph-backed agent with the provided state
-    response = agent.invoke(state)
+    if tracker.exhausted_reason is not None:
+        # Stopped early: return the best answer produced so far
+        response = best_partial_answer(new_messages, tracker.exhausted_reason)
+    else:
+        # Completed: return the content of the last AI message
+        ai_messages = [
+            message.content
+            for message in new_messages
+            if isinstance(message, AIMessage)
+        ]
+        response = ai_messages[-1]
+
+    return {
+        "response": response,
+        "budget": tracker.report(),
+        "conversation": conversation,
+        "tool_output": trimming,
+    }
+
 
-    # Extract the list of returned message objects (AI + human + tool, etc.)
-    messages = response.get("messages", [])
+def get_response_from_ai_agents(llm_id, query, allow_search, system_prompt, budget=None):
+    """
+    Generate a response using the LangGraph-backed ReAct-style AI agent.
 
-    # Filter out only AI-generated messages and grab their content
-    ai_messages = [
-        message.content
-        for message in messages
-        if isinstance(message, AIMessage)
-    ]
+    Thin wrapper around `run_agent` for callers that only need the text.
+
+    Parameters
+    ----------
+    llm_id : str
+        The model identifier to load via the Groq API.
+    query : list
+        The conversation messages passed into the agent graph.
+    allow_search : bool
+        Whether to enable Tavily web search as a tool for the agent.
+    system_prompt : str
+        A system-level instruction string that controls the agent's behaviour.
+    budget : dict or None
+        Optional per-request budget overrides.
 
-    # Return the content of the last AI message
-    return ai_messages[-1]
+    Returns
+    -------
+    str
+        The final (or best partial) text response.
+    """
+    return run_agent(llm_id, query, allow_search, system_prompt, budget)["response"]
@@ -0,0 +1,293 @@
+"""
+budget.py
+=========
+
+Per-request execution budgets for the Multi-AI Agent's ReAct loop.
+
+A ReAct agent alternates LLM calls and tool calls until the model stops
+asking for tools, so the latency of a single request is unbounded. This
+module tracks four budgets while the agent runs:
+
+* wall-clock seconds,
+* iterations (LLM calls, i.e. ReAct steps),
+* tool calls,
+* tokens (input + output, as reported by the provider).
+
+`BudgetTracker` is updated after every LangGraph step. Once any budget is
+exhausted the caller stops streaming the graph and returns the best answer
+available so far (see `best_partial_answer`).
+
+Notes
+-----
+Iteration, tool-call, and token budgets are checked between graph steps.
+`max_seconds` is also enforced during a step: `stream_within_budget`
+consumes the graph on a worker thread and stops waiting when the deadline
+passes. An LLM or tool call already in flight cannot be cancelled; it
+finishes in the background, the graph is then closed, and its result is
+discarded.
+"""
+
+# ======================================================================
+# Imports
+# ======================================================================
+
+# Wall-clock timing, and the worker thread that consumes the graph stream
+import contextvars
+import queue
+import threading
+import time
+
+# Message types inspected to measure progress
+from langchain_core.messages import AIMessage, ToolMessage
+
+# Project settings (default budget values)
+from app.config.settings import settings
+
+# Token estimation fallback when usage metadata is missing
+from app.core.tokens import estimate_tokens
+
+
+# ======================================================================
+# Initialisation
+# ======================================================================
+
+# Budget dimensions, in reporting order
+BUDGET_KEYS = ("max_seconds", "max_iterations", "max_tool_calls", "max_tokens")
+
+# Maximum characters of tool output quoted in a fallback partial answer
+PARTIAL_TOOL_OUTPUT_CHARS = 1500
+
+# Marks the end of a graph stream consumed on a worker thread
+_END = object()
+
+
+def default_budget():
+    """
+    Return the default budget from project settings.
+
+    Returns
+    -------
+    dict
+        One entry per key in `BUDGET_KEYS` (None means unlimited).
+    """
+    return {
+        "max_seconds": settings.BUDGET_MAX_SECONDS,
+        "max_iterations": settings.BUDGET_MAX_ITERATIONS,
+        "max_tool_calls": settings.BUDGET_MAX_TOOL_CALLS,
+        "max_tokens": settings.BUDGET_MAX_TOKENS,
+    }
+
+
+# ======================================================================
+# Budget Tracker
+# ======================================================================
+
+class BudgetTracker:
+    """
+    Track resource usage of one agent run against its limits.
+
+    Parameters
+    ----------
+    limits : dict or None
+        Overrides for any of `BUDGET_KEYS`; missing or None values fall back
+        to `default_budget()`.
+    """
+
+    def __init__(self, limits=None):
+        self.limits = default_budget()
+        for key, value in (limits or {}).items():
+            if key in BUDGET_KEYS and value is not None:
+                self.limits[key] = value
+
+        self.started = time.perf_counter()
+        self.iterations = 0
+        self.tool_calls = 0
+        self.tokens = 0
+        self.exhausted_reason = None
+
+    @property
+    def elapsed_s(self):
+        """Seconds elapsed since the tracker was created."""
+        return time.perf_counter() - self.started
+
+    @property
+    def seconds_left(self):
+        """Seconds until `max_seconds` is reached (None when unlimited)."""
+        limit = self.limits.get("max_seconds")
+        return None if limit is None else max(0.0, limit - self.elapsed_s)
+
+    def update(self, new_messages):
+        """
+        Recompute usage from the messages the agent has produced so far.
+
+        Parameters
+        ----------
+        new_messages : list of BaseMessage
+            Every message added to the state after the request's input.
+
+        Returns
+        -------
+        bool
+            True while the run is within budget (or already finished),
+            False once a budget is exhausted with work still pending.
+        """
+        ai_messages = [m for m in new_messages if isinstance(m, AIMessage)]
+        self.iterations = len(ai_messages)
+        self.tool_calls = sum(isinstance(m, ToolMessage) for m in new_messages)
+        self.tokens = sum(_message_tokens(m) for m in ai_messages)
+
+        # A final AI message (no tool calls requested) ends the run anyway
+        last = new_messages[-1] if new_messages else None
+        if isinstance(last, AIMessage) and not last.tool_calls:
+            return True
+
+        # Only charge the budget the next step would actually consume:
+        # pending tool calls run the tools node, anything else the model
+        if isinstance(last, AIMessage):
+            checks = (("max_tool_calls", self.tool_calls + len(last.tool_calls) - 1),)
+        else:
+            checks = (
+                ("max_iterations", self.iterations),
+                ("max_tokens", self.tokens),
+            )
+        checks = (("max_seconds", self.elapsed_s),) + checks
+
+        for key, used in checks:
+            limit = self.limits.get(key)
+            if limit is not None and used >= limit:
+                self.exhausted_reason = key
+                return False
+
+        return True
+
+    def report(self):
+        """
+        Return the budget usage block included in `/chat` responses.
+
+        Returns
+        -------
+        dict
+            Limits, usage, and whether (and why) the run stopped early.
+        """
+        return {
+            "limits": dict(self.limits),
+            "used": {
+                "seconds": round(self.elapsed_s, 3),
+                "iterations": self.iterations,
+                "tool_calls": self.tool_calls,
+                "tokens": self.tokens,
+            },
+            "exhausted": self.exhausted_reason is not None,
+            "exhausted_reason": self.exhausted_reason,
+        }
+
+
+def stream_within_budget(open_stream, tracker):
+    """
+    Yield graph stream chunks until the stream ends or the time budget runs out.
+
+    The stream is consumed on a worker thread (in a copy of the caller's
+    context, so tracing and per-request scopes carry over), and the caller
+    waits for each chunk at most until the deadline. When it passes, the
+    tracker is marked exhausted (`max_seconds`) and iteration stops, even
+    though a step is still in flight.
+
+    Parameters
+    ----------
+    open_stream : callable
+        Returns the graph stream iterator (e.g. `lambda: agent.stream(...)`).
+    tracker : BudgetTracker
+        The run's budget tracker.
+
+    Yields
+    ------
+    Any
+        Each chunk produced by the stream.
+    """
+    chunks = queue.Queue()
+    stop = threading.Event()
+
+    def consume():
+        try:
+            stream = open_stream()
+            try:
+                for chunk in stream:
+                    if stop.is_set():
+                        break
+                    chunks.put((chunk, None))
+            finally:
+                if hasattr(stream, "close"):
+                    stream.close()
+        except BaseException as e:
+            chunks.put((_END, e))
+        else:
+            chunks.put((_END, None))
+
+    context = contextvars.copy_context()
+    threading.Thread(target=context.run, args=(consume,), name="agent-stream", daemon=True).start()
+
+    try:
+        while True:
+            try:
+                chunk, error = chunks.get(timeout=tracker.seconds_left)
+            except queue.Empty:
+                tracker.exhausted_reason = "max_seconds"
+                return
+            if chunk is _END:
+                if error is not None:
+                    raise error
+                return
+            yield chunk
+    finally:
+        # Stop the worker after its in-flight step when the caller gives up
+        stop.set()
+
+
+def _message_tokens(message):
+    """Return provider-reported tokens for an AI message, or an estimate."""
+    usage = getattr(message, "usage_metadata", None)
+    if usage:
+        return usage.get("total_tokens", 0)
+    return estimate_tokens(message.content)
+
+
+# ======================================================================
+# Partial Answers
+# ======================================================================
+
+def best_partial_answer(new_messages, reason):
+    """
+    Choose the best answer available when a run stops early.
+
+    Preference order:
+    1. The latest AI message with text content and no pending tool calls.
+    2. The latest AI message with any text content.
+    3. A notice quoting the most recent tool output, if any.
+
+    Parameters
+    ----------
+    new_messages : list of BaseMessage
+        Messages produced by the agent so far.
+    reason : str
+        The exhausted budget key (e.g. `"max_tool_calls"`).
+
+    Returns
+    -------
+    str
+        The partial answer text.
+    """
+    ai_messages = [m for m in new_messages if isinstance(m, AIMessage) and m.text]
+
+    final = [m for m in ai_messages if not m.tool_calls]
+    if final:
+        return final[-1].text
+    if ai_messages:
+        return ai_messages[-1].text
+
+    notice = f"The agent stopped before producing a final answer (budget exhausted: {reason})."
+    tool_messages = [m for m in new_messages if isinstance(m, ToolMessage)]
+    if tool_messages:
+        findings = str(tool_messages[-1].content)[:PARTIAL_TOOL_OUTPUT_CHARS]
+        return f"{notice}\n\nMost recent findings:\n{findings}"
+
+    return notice
@@ -0,0 +1,304 @@
+"""
+process_pool.py
+===============
+
+Multi-process agent execution for the **LLMOps Multi-AI Agent** project.
+
+In the default `thread` execution mode every agent run shares the server
+process's GIL with request handling, so CPU-bound stages inside the run
+(token estimation, message conversion, JSON encoding, history compaction)
+slow down every other in-flight request. Setting `EXECUTION_MODE=process`
+moves agent runs into a pool of long-lived worker processes instead:
+
+* Workers are started with the `spawn` method and each one warms its own
+  agent pool (`app.core.agent_pool.warm_up`) once, in the pool initializer,
+  so requests never pay the agent build cost.
+* Request arguments are small and are pickled to the worker as usual.
+* Results come back over `multiprocessing.shared_memory`: the worker writes
+  the JSON-encoded result into a new shared-memory block and returns only
+  its name and size; the server copies the bytes out and unlinks the block.
+* If the pool fails to start (or does not start within `START_TIMEOUT_S`),
+  it is shut down and marked `failed`, and runs fall back to the server's
+  own threads (`run_agent`) instead of being sent to a half-started pool.
+  Runs arriving while the pool is still warming fall back the same way.
+
+Usage
+-----
+Example:
+    from app.core.process_pool import run_agent_in_process, start_process_pool
+
+    start_process_pool()
+    result = run_agent_in_process("llama-3.1-8b-instant", ["Hi"], False, "Be brief.")
+"""
+
+# ======================================================================
+# Imports
+# ======================================================================
+
+# Process pool, shared memory, and timing
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+
+# Agent runner and warm pool (executed inside the workers)
+from app.core.ai_agent import create_pooled_agent, run_agent
+from app.core.agent_pool import pool_status, warm_up
+
+# Compact JSON transport of results through shared memory
+from app.common.json_codec import decode_json, encode_json
+
+# Correlation IDs and spans, propagated into the workers
+from app.common.tracing import (
+    correlation_scope,
+    current_span_context,
+    get_correlation_id,
+    remote_parent_scope,
+    span,
+)
+
+# Project configuration (worker count)
+from app.config.settings import settings
+
+# Logging utility (project-wide logging configuration)
+from app.common.logger import get_logger
+
+
+# ======================================================================
+# Initialisation
+# ======================================================================
+
+# Create a logger specific to this module
+logger = get_logger(__name__)
+
+# Maximum time to wait for every worker to start and warm up
+START_TIMEOUT_S = 300.0
+
+# The process pool, a pool still warming up, and its start-up status
+_POOL = None
+_STARTING = None
+_LOCK = threading.Lock()
+_STATUS = {"state": "cold", "workers": [], "error": None, "duration_s": None}
+
+
+# ======================================================================
+# Worker Side
+# ======================================================================
+
+def _init_worker():
+    """Pool initializer: warm this worker's agent pool once."""
+    warm_up(create_pooled_agent)
+
+
+def _worker_status(hold_s=0.0):
+    """
+    Return this worker's PID and agent pool status.
+
+    `hold_s` keeps the worker busy briefly so that concurrent status calls
+    are spread over different workers.
+    """
+    time.sleep(hold_s)
+    return {"pid": os.getpid(), **pool_status()}
+
+
+def _run_in_worker(llm_id, query, allow_search, system_prompt, budget, correlation_id, parent):
+    """
+    Run the agent and hand the result back through shared memory.
+
+    The `agent.worker` span continues the server's trace: `correlation_id`
+    and `parent` (the server's `agent.process_pool` span context) make it a
+    child of the span that submitted the run.
+
+    Returns
+    -------
+    tuple
+        `(shared_memory_name, size_in_bytes)` of the JSON-encoded result.
+    """
+    with correlation_scope(correlation_id), remote_parent_scope(parent):
+        with span("agent.worker", pid=os.getpid()):
+            result = run_agent(llm_id, query, allow_search, system_prompt, budget)
+
+    payload = encode_json(result)
+    block = shared_memory.SharedMemory(create=True, size=max(1, len(payload)))
+    try:
+        block.buf[: len(payload)] = payload
+    except BaseException:
+        block.close()
+        block.unlink()
+        raise
+    name = block.name
+    block.close()
+    return name, len(payload)
+
+
+# ======================================================================
+# Server Side
+# ======================================================================
+
+def start_process_pool(workers=None):
+    """
+    Start the worker processes and wait until each has warmed its agents.
+
+    Parameters
+    ----------
+    workers : int or None
+        Number of worker processes; defaults to `PROCESS_POOL_WORKERS`.
+
+    Notes
+    -----
+    Safe to call more than once; later calls return immediately, also while
+    another thread is still starting the pool. `_LOCK` is only held to
+    claim and to publish the pool, never while waiting for the workers, and
+    every wait is bounded by `START_TIMEOUT_S`. Failures (including a hung
+    initializer) are recorded in the status rather than raised (see
+    `process_pool_status`), and the half-started pool is discarded so it is
+    never used.
+    """
+    global _POOL, _STARTING
+    workers = workers or settings.PROCESS_POOL_WORKERS
+
+    with _LOCK:
+        if _POOL is not None or _STARTING is not None:
+            return
+        start = time.perf_counter()
+        _STATUS.update(state="warming", workers=[], error=None, duration_s=None)
+        pool = _STARTING = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        )
+
+    try:
+        # Submitting one task per worker while none is idle spawns them
+        # all; keep polling until every worker has answered once
+        reports = {}
+        deadline = start + START_TIMEOUT_S
+        while len(reports) < workers:
+            futures = [pool.submit(_worker_status, 0.05) for _ in range(workers)]
+            for future in futures:
+                try:
+                    report = future.result(timeout=max(0.0, deadline - time.perf_counter()))
+                except TimeoutError:
+                    raise TimeoutError(
+                        f"Only {len(reports)}/{workers} workers started within {START_TIMEOUT_S}s"
+                    ) from None
+                reports[report["pid"]] = report
+
+        failed = [r for r in reports.values() if r["state"] != "ready"]
+        if failed:
+            raise RuntimeError(f"Worker {failed[0]['pid']} warm-up failed: {failed[0]['error']}")
+
+    except Exception as e:
+        with _LOCK:
+            if _STARTING is pool:
+                _STARTING = None
+                _STATUS.update(state="failed", error=str(e))
+        logger.error(f"Process pool start-up failed; running agents in threads: {e}")
+        _discard_pool(pool)
+        return
+
+    with _LOCK:
+        # Shut down while starting: drop the pool instead of publishing it
+        published = _STARTING is pool
+        if published:
+            _POOL, _STARTING = pool, None
+            _STATUS.update(
+                state="ready",
+                workers=sorted(reports),
+                duration_s=round(time.perf_counter() - start, 3),
+            )
+    if not published:
+        _discard_pool(pool)
+        return
+    logger.info(f"Process pool ready in {_STATUS['duration_s']}s ({workers} workers)")
+
+
+def _discard_pool(pool):
+    """Shut a pool down without waiting, terminating workers that hang."""
+    processes = list((getattr(pool, "_processes", None) or {}).values())
+    pool.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+
+
+def run_agent_in_process(llm_id, query, allow_search, system_prompt, budget=None):
+    """
+    Run `app.core.ai_agent.run_agent` in a worker process.
+
+    Parameters and return value are the same as `run_agent`. If the pool
+    is still warming up or failed to start, the run falls back to
+    `run_agent` in the calling thread.
+
+    Raises
+    ------
+    BrokenProcessPool
+        If a worker died; the pool is discarded and restarted on next use.
+    RuntimeError
+        If the pool was shut down while the run was being submitted.
+    """
+    with _LOCK:
+        pool = _POOL
+        cold = _STATUS["state"] == "cold"
+    if pool is None and cold:
+        start_process_pool()
+        with _LOCK:
+            pool = _POOL
+    if pool is None:
+        return run_agent(llm_id, query, allow_search, system_prompt, budget)
+
+    with span("agent.process_pool"):
+        block = None
+        try:
+            future = pool.submit(
+                _run_in_worker, llm_id, query, allow_search, system_prompt, budget,
+                get_correlation_id(), current_span_context(),
+            )
+            name, size = future.result()
+            block = shared_memory.SharedMemory(name=name)
+            data = bytes(block.buf[:size])
+        except BrokenProcessPool:
+            logger.error("Process pool is broken; it will be restarted on the next request")
+            shutdown_process_pool()
+            raise
+        finally:
+            # Release the result block even if copying it out failed
+            if block is not None:
+                block.close()
+                block.unlink()
+
+    return decode_json(data)
+
+
+def shutdown_process_pool():
+    """Stop the worker processes (waiting for in-flight runs)."""
+    global _POOL, _STARTING
+    with _LOCK:
+        pool, _POOL = _POOL, None
+        starting, _STARTING = _STARTING, None
+        _STATUS.update(state="cold", workers=[])
+    if starting is not None:
+        _discard_pool(starting)
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def process_pool_status():
+    """
+    Return a copy of the process pool status.
+
+    Returns
+    -------
+    dict
+        `state` (`cold`, `warming`, `ready`, or `failed`), worker PIDs, the
+        last error (if any), and the start-up duration in seconds.
+    """
+    return {**_STATUS, "workers": list(_STATUS["workers"])}
+
+
+def process_pool_ready():
+    """Return True once every worker has warmed its agents."""
+    return _STATUS["state"] == "ready"
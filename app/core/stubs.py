@@ -0,0 +1,203 @@
+"""
+stubs.py
+========
+
+Local stand-ins for the upstream providers used by the Multi-AI Agent.
+
+When `settings.USE_STUB_PROVIDERS` is enabled, the agent is built with the
+classes in this module instead of Groq and Tavily. The stubs behave like
+their real counterparts from LangGraph's point of view — the chat model
+supports tool binding and emits tool calls, the search tool returns
+Tavily-shaped results — but they never leave the process.
+
+This allows load tests, soak tests, and warm-up runs to exercise the full
+FastAPI → agent graph → tool path with deterministic, configurable latency
+and zero API cost.
+"""
+
+# ======================================================================
+# Imports
+# ======================================================================
+
+# Simulated provider latency
+import time
+
+# Unique tool-call IDs and stable per-query result URLs
+import uuid
+
+# Type hints for LangChain overrides
+from typing import Any, List, Optional
+
+# Base classes for custom chat models and tools
+from langchain_core.language_models import BaseChatModel
+from langchain_core.tools import BaseTool
+
+# Message and result types used by LangChain chat models
+from langchain_core.messages import AIMessage, BaseMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+# Helper that converts tools into the OpenAI tool schema
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+# Pydantic schema for the stub tool's arguments
+from pydantic import BaseModel, Field
+
+# Token estimation for synthetic usage metadata
+from app.core.tokens import estimate_tokens
+
+
+# ======================================================================
+# Stub Chat Model
+# ======================================================================
+
+class StubChatModel(BaseChatModel):
+    """
+    Deterministic chat model that mimics a Groq-backed LLM.
+
+    On the first turn of a conversation, if tools are bound, the model asks
+    for a single search tool call. Once a tool result is present (or when no
+    tools are bound) it returns a final answer derived from the last human
+    message.
+
+    Attributes
+    ----------
+    model : str
+        The model identifier being impersonated (reported in metadata only).
+    latency_ms : float
+        Simulated provider latency applied to every call.
+    answer_chars : int
+        Approximate length of the generated final answer.
+    cpu_ms : float
+        Simulated local CPU work per call (holding the GIL), standing in for
+        CPU-bound stages such as token counting or history compaction.
+    """
+
+    model: str = "stub"
+    latency_ms: float = 0.0
+    answer_chars: int = 400
+    cpu_ms: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub-chat-model"
+
+    def bind_tools(self, tools, *, tool_choice=None, **kwargs):
+        """Bind tools using the OpenAI tool schema, like `ChatGroq` does."""
+        formatted = [convert_to_openai_tool(tool) for tool in tools]
+        return self.bind(tools=formatted, **kwargs)
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        """Return a tool call or a final answer after the simulated latency."""
+
+        # Simulate network + inference latency
+        if self.latency_ms > 0:
+            time.sleep(self.latency_ms / 1000.0)
+
+        # Simulate CPU-bound local work (measured in this thread's CPU time)
+        if self.cpu_ms > 0:
+            deadline = time.thread_time() + self.cpu_ms / 1000.0
+            while time.thread_time() < deadline:
+                sum(i * i for i in range(1000))
+
+        prompt_text = "".join(str(m.content) for m in messages)
+        last_human = next(
+            (str(m.content) for m in reversed(messages) if m.type == "human"),
+            "",
+        )
+        tools = kwargs.get("tools") or []
+        has_tool_result = any(isinstance(m, ToolMessage) for m in messages)
+
+        # First step with tools available: request a search
+        if tools and not has_tool_result:
+            tool_name = tools[0]["function"]["name"]
+            message = AIMessage(
+                content="",
+                tool_calls=[{
+                    "name": tool_name,
+                    "args": {"query": last_human[:200]},
+                    "id": f"call_{uuid.uuid4().hex[:12]}",
+                }],
+            )
+        # Otherwise: produce a final answer of roughly `answer_chars` length
+        else:
+            seed = f"Stub answer from {self.model} to: {last_human} "
+            repeats = max(1, self.answer_chars // max(1, len(seed)))
+            message = AIMessage(content=(seed * repeats)[: self.answer_chars])
+
+        # Attach synthetic usage metadata so token accounting works offline
+        input_tokens = estimate_tokens(prompt_text)
+        output_tokens = estimate_tokens(message.content) or 1
+        message.usage_metadata = {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        }
+        message.response_metadata = {"model_name": self.model}
+
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+# ======================================================================
+# Stub Search Tool
+# ======================================================================
+
+class StubSearchInput(BaseModel):
+    """Arguments accepted by the stub search tool."""
+
+    query: str = Field(description="Search query to look up")
+
+
+class StubSearchTool(BaseTool):
+    """
+    Offline replacement for `TavilySearch` returning Tavily-shaped results.
+
+    Attributes
+    ----------
+    max_results : int
+        Number of synthetic results to return.
+    latency_ms : float
+        Simulated search latency applied to every call.
+    content_chars : int
+        Approximate length of each result's `content` field.
+    """
+
+    name: str = "tavily_search"
+    description: str = "A search engine for current events and general web results."
+    args_schema: type[BaseModel] = StubSearchInput
+    max_results: int = 2
+    latency_ms: float = 0.0
+    content_chars: int = 1500
+
+    def _run(self, query: str, **kwargs: Any) -> dict:
+        """Return synthetic search results for `query`."""
+
+        # Simulate network latency
+        if self.latency_ms > 0:
+            time.sleep(self.latency_ms / 1000.0)
+
+        filler = f"Synthetic page content about {query}. "
+        content = (filler * (self.content_chars // len(filler) + 1))[: self.content_chars]
+
+        return {
+            "query": query,
+            "follow_up_questions": None,
+            "answer": None,
+            "images": [],
+            "results": [
+                {
+                    "url": f"https://example.com/{i}/{uuid.uuid5(uuid.NAMESPACE_URL, query).hex[:8]}",
+                    "title": f"Result {i + 1} for {query[:60]}",
+                    "content": content,
+                    "score": round(1.0 - i * 0.1, 2),
+                    "raw_content": None,
+                }
+                for i in range(self.max_results)
+            ],
+            "response_time": self.latency_ms / 1000.0,
+        }
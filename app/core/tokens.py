@@ -0,0 +1,80 @@
+"""
+tokens.py
+=========
+
+Cheap token estimation helpers for the Multi-AI Agent system.
+
+Groq does not ship a local tokenizer for its hosted models, so the project
+uses a character-based approximation wherever a token figure is needed
+before (or without) calling the provider: stub providers, budgets,
+prompt-size accounting, and trimming tool output to a token budget.
+
+The heuristic of roughly four characters per token is close enough for
+English text to drive limits and reporting; provider-reported usage
+metadata should be preferred whenever it is available.
+"""
+
+# ======================================================================
+# Constants
+# ======================================================================
+
+# Average number of characters per token for English prose
+CHARS_PER_TOKEN = 4
+
+
+# ======================================================================
+# Estimation Helpers
+# ======================================================================
+
+def estimate_tokens(text):
+    """
+    Estimate the number of tokens in a piece of text.
+
+    Parameters
+    ----------
+    text : str
+        The text to measure. Non-string values are converted with `str()`.
+
+    Returns
+    -------
+    int
+        The approximate token count (at least 1 for non-empty text).
+    """
+    if not text:
+        return 0
+
+    if not isinstance(text, str):
+        text = str(text)
+
+    return max(1, (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN)
+
+
+def truncate_to_tokens(text, max_tokens):
+    """
+    Shorten text to roughly `max_tokens`, preferring a word boundary.
+
+    Parameters
+    ----------
+    text : str
+        The text to shorten.
+    max_tokens : int
+        The approximate token budget.
+
+    Returns
+    -------
+    str
+        `text` unchanged if it fits, otherwise a prefix ending in `"…"`.
+    """
+    max_chars = max(0, max_tokens) * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+
+    cut = text[:max_chars]
+
+    # Back off to the last sentence end or space in the final fifth
+    floor = int(max_chars * 0.8)
+    boundary = max(cut.rfind(". ", floor) + 1, cut.rfind(" ", floor))
+    if boundary > 0:
+        cut = cut[:boundary]
+
+    return cut.rstrip() + "…"
@@ -0,0 +1,249 @@
+"""
+tool_trimming.py
+================
+
+Structured trimming of web-search tool output for the ReAct loop.
+
+A raw Tavily response carries full page content plus metadata (scores,
+images, follow-up questions, timings, raw content), and the resulting tool
+message is re-sent to the LLM on every later step of the loop. The
+`TrimmedSearchTool` wrapper post-processes each search result before the
+agent sees it:
+
+* **Extract** — keep only `title`, `url`, and `content` per result (plus
+  Tavily's own `answer`, when present); drop every other field.
+* **Deduplicate** — drop results whose normalised URL or content was
+  already kept.
+* **Truncate** — normalise whitespace and cut each result's content to an
+  equal share of `TOOL_OUTPUT_MAX_TOKENS`, at a sentence or word boundary.
+
+Trimmed content is cached per URL (LRU of `TOOL_TRIM_CACHE_SIZE`), keyed by
+the page content's hash, so a page returned again is not re-processed.
+
+The tokens saved are accumulated per request: `run_agent` opens a
+`trimming_scope()` and reports the totals alongside the answer.
+"""
+
+# ======================================================================
+# Imports
+# ======================================================================
+
+# Hashing, JSON sizing, context-local stats, and the LRU cache
+import contextvars
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+# Base class for LangChain tools and the tool-run callback manager
+from langchain_core.callbacks import CallbackManagerForToolRun
+from langchain_core.tools import BaseTool
+
+# Project configuration (token budget, cache size)
+from app.config.settings import settings
+
+# Token estimation and truncation helpers
+from app.core.tokens import estimate_tokens, truncate_to_tokens
+
+
+# ======================================================================
+# Initialisation
+# ======================================================================
+
+# Per-request trimming totals (a mutable dict, shared with tool threads)
+_STATS = contextvars.ContextVar("tool_trimming_stats", default=None)
+
+# URL → (content hash, token share, trimmed content)
+_CACHE = OrderedDict()
+_LOCK = threading.Lock()
+
+# Collapses runs of whitespace in page content
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _empty_stats():
+    return {
+        "calls": 0,
+        "results_in": 0,
+        "results_kept": 0,
+        "duplicates": 0,
+        "cache_hits": 0,
+        "tokens_before": 0,
+        "tokens_after": 0,
+        "tokens_saved": 0,
+    }
+
+
+@contextmanager
+def trimming_scope():
+    """
+    Collect trimming statistics for one agent run.
+
+    Yields
+    ------
+    dict
+        Totals updated by every trimmed tool call made inside the block.
+    """
+    stats = _empty_stats()
+    token = _STATS.set(stats)
+    try:
+        yield stats
+    finally:
+        _STATS.reset(token)
+
+
+# ======================================================================
+# Trimming
+# ======================================================================
+
+def _normalise_url(url):
+    """Lower-case scheme and host, drop the fragment and trailing slash."""
+    parts = urlsplit(url.strip())
+    return urlunsplit((
+        parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/"), parts.query, ""
+    ))
+
+
+def _trim_content(url, content, share):
+    """
+    Return cleaned, truncated content for one page, using the URL cache.
+
+    Returns
+    -------
+    tuple
+        `(trimmed_text, cache_hit)`.
+    """
+    digest = hashlib.sha1(content.encode("utf-8")).hexdigest()
+    with _LOCK:
+        cached = _CACHE.get(url)
+        if cached is not None and cached[0] == digest and cached[1] == share:
+            _CACHE.move_to_end(url)
+            return cached[2], True
+
+    trimmed = truncate_to_tokens(_WHITESPACE.sub(" ", content).strip(), share)
+
+    with _LOCK:
+        _CACHE[url] = (digest, share, trimmed)
+        _CACHE.move_to_end(url)
+        while len(_CACHE) > settings.TOOL_TRIM_CACHE_SIZE:
+            _CACHE.popitem(last=False)
+
+    return trimmed, False
+
+
+def trim_search_results(raw, max_tokens):
+    """
+    Extract, deduplicate, and truncate a Tavily-shaped search response.
+
+    Parameters
+    ----------
+    raw : Any
+        The search tool's output. Anything other than a dict with a
+        `results` list (e.g. an error string) is returned unchanged.
+    max_tokens : int
+        Approximate token budget for all result contents together.
+
+    Returns
+    -------
+    tuple
+        `(trimmed_output, stats)` where `stats` has the same keys as the
+        per-request totals.
+    """
+    stats = _empty_stats()
+    if not isinstance(raw, dict) or not isinstance(raw.get("results"), list):
+        return raw, stats
+
+    results = raw["results"]
+    stats["results_in"] = len(results)
+
+    # Extract and deduplicate by URL and by content
+    kept = []
+    seen_urls, seen_content = set(), set()
+    for result in results:
+        url = _normalise_url(str(result.get("url") or ""))
+        content = str(result.get("content") or "")
+        content_key = hashlib.sha1(content.encode("utf-8")).digest()
+        if (url and url in seen_urls) or (content and content_key in seen_content):
+            stats["duplicates"] += 1
+            continue
+        seen_urls.add(url)
+        seen_content.add(content_key)
+        kept.append((url, str(result.get("title") or ""), content))
+
+    # Truncate every kept result to an equal share of the budget
+    share = max(1, max_tokens // max(1, len(kept)))
+    trimmed_results = []
+    for url, title, content in kept:
+        text, hit = _trim_content(url, content, share)
+        stats["cache_hits"] += hit
+        trimmed_results.append({"title": title, "url": url, "content": text})
+
+    trimmed = {"query": raw.get("query"), "results": trimmed_results}
+    if raw.get("answer"):
+        trimmed["answer"] = truncate_to_tokens(str(raw["answer"]), share)
+
+    stats["results_kept"] = len(trimmed_results)
+    stats["tokens_before"] = _json_tokens(raw)
+    stats["tokens_after"] = _json_tokens(trimmed)
+    stats["tokens_saved"] = max(0, stats["tokens_before"] - stats["tokens_after"])
+    return trimmed, stats
+
+
+def _json_tokens(value):
+    """Estimate the tokens of a value as the agent's tool message sees it."""
+    return estimate_tokens(json.dumps(value, ensure_ascii=False, default=str))
+
+
+# ======================================================================
+# Tool Wrapper
+# ======================================================================
+
+class TrimmedSearchTool(BaseTool):
+    """
+    Wrap a search tool so the agent only sees trimmed results.
+
+    The wrapper keeps the wrapped tool's name, description, and argument
+    schema, so the LLM calls it exactly like the original.
+
+    Attributes
+    ----------
+    inner : BaseTool
+        The wrapped search tool (Tavily or the offline stub).
+    max_tokens : int
+        Token budget for the results of one call.
+    """
+
+    inner: BaseTool
+    max_tokens: int = 600
+
+    @classmethod
+    def wrap(cls, inner, max_tokens):
+        """Return `inner` wrapped with the given token budget."""
+        return cls(
+            name=inner.name,
+            description=inner.description,
+            args_schema=inner.args_schema,
+            inner=inner,
+            max_tokens=max_tokens,
+        )
+
+    def _run(self, run_manager: Optional[CallbackManagerForToolRun] = None, **kwargs: Any) -> Any:
+        """Call the wrapped tool, as a child run of this one, and trim its output."""
+        callbacks = run_manager.get_child() if run_manager else None
+        raw = self.inner.invoke(kwargs, config={"callbacks": callbacks})
+        trimmed, stats = trim_search_results(raw, self.max_tokens)
+
+        # Parallel tool calls may update the same request's totals
+        totals = _STATS.get()
+        if totals is not None:
+            with _LOCK:
+                totals["calls"] += 1
+                for key, value in stats.items():
+                    if key != "calls":
+                        totals[key] += value
+
+        return trimmed
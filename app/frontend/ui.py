@@ -26,18 +26,35 @@ model behaviour through a clean, simple layout.
 # Streamlit UI framework
 import streamlit as st
 
+# Timing of backend calls and bounded per-session answer cache
+import time
+from collections import OrderedDict
+
 # HTTP client for communicating with the FastAPI backend
 import requests
+from requests.adapters import HTTPAdapter
 
 # Project configuration (allowed models, environment settings)
 from app.config.settings import settings
 
+# Predefined system prompts for the agent personas (shared with other clients)
+from app.config.personas import ROLE_PRESETS, DEFAULT_PERSONA
+
 # Project-wide logging utility
 from app.common.logger import get_logger
 
 # Custom exception class for structured error reporting
 from app.common.custom_exception import CustomException
 
+# Shared JSON codec (orjson when available)
+from app.common.json_codec import decode_json
+
+# Stable request fingerprint used as the answer cache key
+from app.common.fingerprint import request_fingerprint
+
+# Correlation IDs propagated to the backend (and into log lines)
+from app.common.tracing import CORRELATION_HEADER, correlation_scope
+
 
 # ======================================================================
 # Initialisation
@@ -51,38 +68,131 @@ st.set_page_config(page_title="Multi AI Agent", layout="wide")
 
 
 # ======================================================================
-# Role Presets
-# ======================================================================
-
-# Predefined system prompts for various agent personas
-ROLE_PRESETS = {
-    "General Assistant": (
-        "You are a helpful, neutral AI assistant. "
-        "Answer clearly, concisely, and avoid speculation."
-    ),
-    "Medical Information (non-diagnostic)": (
-        "You are an AI that provides general, non-diagnostic medical information. "
-        "You are NOT a doctor and you do NOT give medical advice. "
-        "Always encourage users to consult a qualified healthcare professional "
-        "for diagnosis, treatment, or urgent concerns."
-    ),
-    "Legal Information (non-advisory)": (
-        "You are an AI that provides general legal information, not legal advice. "
-        "You are NOT a lawyer. Encourage users to consult a qualified legal "
-        "professional for advice specific to their situation."
-    ),
-    "Journalist / Analyst": (
-        "You are an analytical journalist. You explain issues clearly, lay out "
-        "multiple perspectives, avoid taking sides, and distinguish facts from opinion."
-    ),
-    "Technical Expert": (
-        "You are a highly skilled technical expert. Provide precise, step-by-step "
-        "explanations, include caveats where appropriate, and avoid hand-waving."
-    ),
-}
+# Backend Configuration
+# ======================================================================
 
 # Backend API endpoint
-API_URL = "http://127.0.0.1:9999/chat"
+API_URL = settings.BACKEND_URL
+
+# Connect/read timeouts so a slow backend cannot pin a script thread forever
+REQUEST_TIMEOUT = (settings.BACKEND_CONNECT_TIMEOUT_S, settings.BACKEND_READ_TIMEOUT_S)
+
+
+# ======================================================================
+# Cached Resources (shared across reruns and sessions)
+# ======================================================================
+
+@st.cache_resource
+def get_http_session():
+    """
+    Return a process-wide pooled HTTP session for backend calls.
+
+    Cached with `st.cache_resource`, so every rerun and every user session
+    reuses the same keep-alive connections instead of opening new ones.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=settings.BACKEND_POOL_SIZE,
+        max_retries=0,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+@st.cache_data
+def get_ui_options():
+    """
+    Return the persona names, persona prompts, and model names for the UI.
+
+    Cached with `st.cache_data`, so reruns do not rebuild these lists.
+    """
+    return list(ROLE_PRESETS.keys()), dict(ROLE_PRESETS), list(settings.ALLOWED_MODEL_NAMES)
+
+
+# Persona and model options, computed once per process
+ROLE_NAMES, PROMPTS, MODEL_NAMES = get_ui_options()
+
+
+# ======================================================================
+# Per-session State
+# ======================================================================
+
+# Answers cached by request fingerprint (most recent last)
+if "answer_cache" not in st.session_state:
+    st.session_state.answer_cache = OrderedDict()
+
+# Last displayed result, so reruns keep showing it without resending
+if "last_result" not in st.session_state:
+    st.session_state.last_result = None
+
+
+# ======================================================================
+# Backend Call
+# ======================================================================
+
+def _send_to_backend(payload, cache_key, correlation_id):
+    """
+    POST `payload` to the backend and store the answer in the session cache.
+
+    Parameters
+    ----------
+    payload : dict
+        The `/chat` request body.
+    cache_key : str
+        The request fingerprint used as the session cache key.
+    correlation_id : str
+        Propagated in the `X-Correlation-ID` header for end-to-end tracing.
+    """
+    try:
+        logger.info("Sending request to backend")
+
+        # Show loading indicator while waiting on backend
+        started = time.perf_counter()
+        with st.spinner("Thinking..."):
+            response = get_http_session().post(
+                API_URL,
+                json=payload,
+                headers={CORRELATION_HEADER: correlation_id},
+                timeout=REQUEST_TIMEOUT,
+            )
+        duration_s = time.perf_counter() - started
+
+        # --------------------------------------------------------------
+        # Backend returned success
+        # --------------------------------------------------------------
+        if response.status_code == 200:
+            agent_response = decode_json(response.content).get("response", "")
+            logger.info(f"Successfully received response from backend in {duration_s:.2f}s")
+
+            result = {
+                "response": agent_response,
+                "duration_s": duration_s,
+                "correlation_id": correlation_id,
+            }
+            answer_cache = st.session_state.answer_cache
+            answer_cache[cache_key] = result
+            while len(answer_cache) > settings.UI_CACHE_SIZE:
+                answer_cache.popitem(last=False)
+            st.session_state.last_result = dict(result, cache_hit=False)
+
+        # --------------------------------------------------------------
+        # Backend returned an error status
+        # --------------------------------------------------------------
+        else:
+            logger.error(f"Backend error. Status code: {response.status_code}")
+            st.error("Error communicating with backend. Please check the logs.")
+
+    except requests.Timeout as e:
+        # Backend too slow: fail fast rather than holding the script thread
+        logger.error("Backend request timed out")
+        st.error(str(CustomException("Backend request timed out", error_detail=e)))
+
+    except Exception as e:
+        # Network-level or unexpected exceptions
+        logger.error("Error occurred while sending request to backend")
+        st.error(str(CustomException("Failed to communicate to backend", error_detail=e)))
 
 
 # ======================================================================
@@ -99,19 +209,22 @@ with st.sidebar:
     # Dropdown for role preset
     selected_role = st.selectbox(
         "Select agent role:",
-        list(ROLE_PRESETS.keys()),
+        ROLE_NAMES,
         index=0,
     )
 
     # Dropdown for Groq model selection
     selected_model = st.selectbox(
         "Select your AI model:",
-        settings.ALLOWED_MODEL_NAMES,
+        MODEL_NAMES,
     )
 
     # Toggle for enabling Tavily-based web search
     allow_web_search = st.checkbox("Allow web search", value=False)
 
+    # Force a fresh backend call even if this exact query was answered
+    bypass_cache = st.checkbox("Bypass answer cache", value=False)
+
     st.markdown("---")
     st.caption("You may edit the system prompt manually in the main panel.")
 
@@ -121,7 +234,7 @@ with st.sidebar:
 # ======================================================================
 
 # Retrieve default role-based prompt and allow user edits
-default_prompt = ROLE_PRESETS.get(selected_role, ROLE_PRESETS["General Assistant"])
+default_prompt = PROMPTS.get(selected_role, PROMPTS[DEFAULT_PERSONA])
 system_prompt = st.text_area(
     "System prompt (agent instructions):",
     value=default_prompt,
@@ -154,37 +267,48 @@ if ask_button and user_query.strip():
         "system_prompt": system_prompt,
         "messages": [user_query],
         "allow_search": allow_web_search,
+        "priority": "interactive",
+        "tenant": settings.UI_TENANT,
     }
 
-    try:
-        logger.info("Sending request to backend")
+    cache_key = request_fingerprint(payload)
+    answer_cache = st.session_state.answer_cache
 
-        # Show loading indicator while waiting on backend
-        with st.spinner("Thinking..."):
-            response = requests.post(API_URL, json=payload)
+    # --------------------------------------------------------------
+    # Session cache hit: reuse the earlier answer without a backend call
+    # --------------------------------------------------------------
+    if cache_key in answer_cache and not bypass_cache:
+        answer_cache.move_to_end(cache_key)
+        st.session_state.last_result = dict(answer_cache[cache_key], cache_hit=True)
+        logger.info("Served answer from session cache")
 
-        # --------------------------------------------------------------
-        # Backend returned success
-        # --------------------------------------------------------------
-        if response.status_code == 200:
-            agent_response = response.json().get("response", "")
-            logger.info("Successfully received response from backend")
-
-            st.subheader("Agent Response")
-            st.markdown(agent_response.replace("\n", "<br>"), unsafe_allow_html=True)
+    else:
+        # Clear the previous answer so a failed call does not show stale output
+        st.session_state.last_result = None
 
-        # --------------------------------------------------------------
-        # Backend returned an error status
-        # --------------------------------------------------------------
-        else:
-            logger.error(f"Backend error. Status code: {response.status_code}")
-            st.error("Error communicating with backend. Please check the logs.")
-
-    except Exception as e:
-        # Network-level or unexpected exceptions
-        logger.error("Error occurred while sending request to backend")
-        st.error(str(CustomException("Failed to communicate to backend", error_detail=e)))
+        # Tag this request (and its log lines) with a fresh correlation ID
+        with correlation_scope() as correlation_id:
+            _send_to_backend(payload, cache_key, correlation_id)
 
 # Handle case where button was pressed with no query entered
 elif ask_button and not user_query.strip():
     st.warning("Please enter a query before asking the agent.")
+
+
+# ======================================================================
+# Result Rendering (persists across reruns)
+# ======================================================================
+
+result = st.session_state.last_result
+if result is not None:
+    st.subheader("Agent Response")
+    st.markdown(result["response"].replace("\n", "<br>"), unsafe_allow_html=True)
+
+    # Request timing and cache status
+    if result["cache_hit"]:
+        st.caption(f"⚡ Served from session cache (original request took {result['duration_s']:.2f}s)")
+    else:
+        st.caption(
+            f"⏱️ Backend request took {result['duration_s']:.2f}s · cache miss · "
+            f"correlation ID `{result['correlation_id']}`"
+        )
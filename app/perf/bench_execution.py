@@ -0,0 +1,159 @@
+"""
+bench_execution.py
+==================
+
+Benchmark of the agent execution modes (`EXECUTION_MODE`).
+
+This script runs the same batch of agent requests, with the offline stub
+providers, in both modes:
+
+* **thread** — `run_agent` in a thread pool inside this process, as FastAPI
+  runs the `/chat` handler today.
+* **process** — `run_agent_in_process`, i.e. long-lived spawned worker
+  processes with warm agents, results returned over shared memory.
+
+`--cpu-ms` adds simulated CPU-bound work to every stub LLM call (standing in
+for local token counting, history compaction, or embeddings). For each mode
+it reports throughput, request latency percentiles, and the wake-up delay of
+a probe thread that sleeps 1ms in a loop — a proxy for how much the agent
+work starves request handling of the GIL.
+
+Usage
+-----
+Example:
+    python -m app.perf.bench_execution
+    python -m app.perf.bench_execution --requests 200 --concurrency 16 --cpu-ms 20 --workers 4
+"""
+
+# ======================================================================
+# Imports
+# ======================================================================
+
+# Command-line parsing, environment, and timing
+import argparse
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+# ======================================================================
+# Probe
+# ======================================================================
+
+class WakeupProbe(threading.Thread):
+    """Background thread measuring how late 1ms sleeps wake up."""
+
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.delays = []
+        self.stop_event = threading.Event()
+
+    def run(self):
+        while not self.stop_event.is_set():
+            start = time.perf_counter()
+            time.sleep(0.001)
+            self.delays.append(time.perf_counter() - start - 0.001)
+
+
+# ======================================================================
+# Benchmark
+# ======================================================================
+
+def run_mode(mode, requests_total, concurrency):
+    """
+    Run `requests_total` agent requests in one execution mode.
+
+    Returns
+    -------
+    dict
+        Throughput, latency percentiles, and probe wake-up delays.
+    """
+    # Imported here so the environment configured in `main` is picked up
+    from app.core.agent_pool import warm_up
+    from app.core.ai_agent import create_pooled_agent, run_agent
+    from app.core.process_pool import run_agent_in_process, start_process_pool
+    from app.perf.loadtest import percentile
+
+    if mode == "process":
+        start_process_pool()
+        run = run_agent_in_process
+    else:
+        warm_up(create_pooled_agent)
+        run = run_agent
+
+    def one(i):
+        started = time.perf_counter()
+        run(
+            "llama-3.1-8b-instant",
+            [f"Benchmark question {i}: summarise the history of LangGraph."],
+            i % 2 == 0,
+            "You are a concise assistant.",
+        )
+        return time.perf_counter() - started
+
+    probe = WakeupProbe()
+    probe.start()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = sorted(pool.map(one, range(requests_total)))
+    elapsed = time.perf_counter() - start
+    probe.stop_event.set()
+    probe.join()
+
+    delays = sorted(probe.delays)
+    return {
+        "rps": requests_total / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "probe_p50_ms": percentile(delays, 50) * 1000,
+        "probe_p99_ms": percentile(delays, 99) * 1000,
+    }
+
+
+# ======================================================================
+# Main Entry Point
+# ======================================================================
+
+def main(argv=None):
+    """Run both execution modes and print a comparison table."""
+    parser = argparse.ArgumentParser(description="Benchmark thread vs process agent execution.")
+    parser.add_argument("--requests", type=int, default=100, help="Requests per mode.")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent client threads.")
+    parser.add_argument(
+        "--workers", type=int, default=min(4, os.cpu_count() or 1),
+        help="Worker processes (default: CPU count, at most 4).",
+    )
+    parser.add_argument("--cpu-ms", type=float, default=10.0, help="CPU work per stub LLM call (ms).")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Stub LLM latency (ms).")
+    args = parser.parse_args(argv)
+
+    # Configure the stub providers before any project module reads settings
+    # (spawned workers inherit this environment)
+    os.environ.update(
+        USE_STUB_PROVIDERS="true",
+        STUB_LLM_CPU_MS=str(args.cpu_ms),
+        STUB_LLM_LATENCY_MS=str(args.latency_ms),
+        STUB_SEARCH_LATENCY_MS=str(args.latency_ms),
+        PROCESS_POOL_WORKERS=str(args.workers),
+        WARMUP_MODE="stub",
+        TRACING_ENABLED="false",
+    )
+
+    print(f"{args.requests} requests, concurrency {args.concurrency}, {args.workers} workers, "
+          f"{args.cpu_ms:g}ms CPU + {args.latency_ms:g}ms latency per LLM call, "
+          f"{os.cpu_count()} CPUs")
+    print(f"{'mode':<8} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'probe p50':>10} {'probe p99':>10}")
+
+    try:
+        for mode in ("thread", "process"):
+            r = run_mode(mode, args.requests, args.concurrency)
+            print(f"{mode:<8} {r['rps']:>8.1f} {r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} "
+                  f"{r['probe_p50_ms']:>8.2f}ms {r['probe_p99_ms']:>8.2f}ms")
+    finally:
+        from app.core.process_pool import shutdown_process_pool
+        shutdown_process_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""
+bench_serialization.py
+======================
+
+Micro-benchmark for the `/chat` JSON serialisation path.
+
+This script measures the per-request CPU cost of turning a `/chat` response
+payload into a ready-to-send `Response` (and the body back into a dict),
+comparing:
+
+* **default** — FastAPI's path for a returned dict: `jsonable_encoder`
+  followed by `JSONResponse` rendering with the stdlib `json` module.
+* **fast** — the project's `json_response` helper with `orjson`, which
+  skips `jsonable_encoder` and response-model re-validation (no
+  `Accept-Encoding`, so the body is not compressed).
+* **gzip / zstd** — `json_response` end to end for a client accepting that
+  encoding, and the size of the body it sends. Bodies under
+  `COMPRESSION_MIN_BYTES` are sent uncompressed.
+* **decode** — `requests`-style `json.loads` versus `orjson.loads` on the
+  client side.
+
+Every column builds a complete response, so the timings are comparable.
+Answers are generated markdown prose with headings, bullet lists, figures,
+and cited URLs (seeded, so runs are repeatable); repeated filler text would
+compress unrealistically well. Sizes cover short, typical, and long answers.
+
+Usage
+-----
+Example:
+    python -m app.perf.bench_serialization
+    python -m app.perf.bench_serialization --iterations 20000
+"""
+
+# ======================================================================
+# Imports
+# ======================================================================
+
+# Command-line parsing, synthetic text, and timing
+import argparse
+import json
+import random
+import time
+
+# FastAPI's default encoding path
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+# Project codec and response helpers
+from app.common.json_codec import HAS_ORJSON, decode_json
+from app.backend.responses import SUPPORTED_ENCODINGS, json_response
+
+
+# ======================================================================
+# Payloads
+# ======================================================================
+
+# Answer lengths in characters: short reply, typical reply, long report
+ANSWER_SIZES = (500, 4_000, 32_000)
+
+
+# Vocabulary for the synthetic answers
+_WORDS = (
+    "agent model latency throughput request response token budget search result "
+    "source evidence deployment cluster worker memory cache index queue tenant "
+    "priority schedule pipeline dataset training inference benchmark baseline "
+    "regression accuracy precision recall evaluation prompt context window "
+    "retrieval embedding vector database query filter ranking summary report "
+    "analysis trend growth revenue market quarter forecast risk policy "
+    "compliance security incident migration upgrade version release feature "
+    "the a of to and in for with on by from that this which is are was were "
+    "can may should will not also more most than however therefore because "
+    "while during after before between across within under over each every"
+).split()
+
+
+def make_answer(answer_chars, seed=0):
+    """
+    Generate markdown prose of about `answer_chars`, like a long agent answer.
+
+    Parameters
+    ----------
+    answer_chars : int
+        Target answer length in characters.
+    seed : int
+        Seed for the word choice (runs are repeatable).
+
+    Returns
+    -------
+    str
+        The generated answer.
+    """
+    rng = random.Random(seed)
+    parts, length, section = [], 0, 0
+
+    def sentence():
+        words = rng.choices(_WORDS, k=rng.randint(8, 22))
+        if rng.random() < 0.3:
+            words.insert(rng.randrange(len(words)), f"{rng.uniform(0, 100):.1f}%")
+        if rng.random() < 0.15:
+            words.append(f"[{rng.randint(1, 9)}](https://example.org/{rng.getrandbits(40):x})")
+        return " ".join(words).capitalize() + "."
+
+    while length < answer_chars:
+        if rng.random() < 0.12:
+            section += 1
+            block = f"\n\n## {section}. {sentence()[:-1].title()}\n\n"
+        elif rng.random() < 0.25:
+            block = "".join(f"\n- {sentence()}" for _ in range(rng.randint(2, 5))) + "\n"
+        else:
+            block = " ".join(sentence() for _ in range(rng.randint(2, 5))) + " "
+        parts.append(block)
+        length += len(block)
+
+    return "".join(parts)[:answer_chars]
+
+
+def make_payload(answer_chars):
+    """Build a `/chat` response payload with an answer of `answer_chars`."""
+    return {
+        "response": make_answer(answer_chars),
+        "memory": {
+            "request_bytes": 412,
+            "payload_chars": 380,
+            "rss_before_kb": 183_220,
+            "rss_after_kb": 183_412,
+            "rss_delta_kb": 192,
+        },
+        "budget": {
+            "exhausted": False,
+            "reason": None,
+            "iterations": 3,
+            "tool_calls": 1,
+            "tokens": 2_140,
+            "elapsed_s": 4.812,
+        },
+    }
+
+
+# ======================================================================
+# Timing Helpers
+# ======================================================================
+
+def time_per_call(func, iterations):
+    """Return the mean wall time of `func()` in microseconds."""
+    func()  # warm-up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+# ======================================================================
+# Main Entry Point
+# ======================================================================
+
+def main(argv=None):
+    """Run the serialisation benchmark and print a results table."""
+    parser = argparse.ArgumentParser(description="Benchmark /chat JSON serialisation.")
+    parser.add_argument("--iterations", type=int, default=5000, help="Calls per measurement.")
+    args = parser.parse_args(argv)
+
+    if not HAS_ORJSON:
+        print("orjson is not installed: the 'fast' column measures the stdlib fallback.")
+
+    print(f"{'answer':>8} {'body':>8} | {'default':>9} {'fast':>9} {'saved':>7} | "
+          f"{'gzip':>9} {'gz size':>8} | {'zstd':>9} {'zst size':>8} | "
+          f"{'loads':>9} {'fast loads':>10}")
+
+    for answer_chars in ANSWER_SIZES:
+        payload = make_payload(answer_chars)
+        body = json_response(payload).body
+
+        default_us = time_per_call(
+            lambda: JSONResponse(content=jsonable_encoder(payload)), args.iterations
+        )
+        fast_us = time_per_call(lambda: json_response(payload), args.iterations)
+
+        gzip_us = time_per_call(lambda: json_response(payload, "gzip"), args.iterations)
+        gzip_size = len(json_response(payload, "gzip").body)
+
+        if "zstd" in SUPPORTED_ENCODINGS:
+            zstd_us = time_per_call(lambda: json_response(payload, "zstd"), args.iterations)
+            zstd_size = len(json_response(payload, "zstd").body)
+        else:
+            zstd_us, zstd_size = float("nan"), 0
+
+        loads_us = time_per_call(lambda: json.loads(body), args.iterations)
+        fast_loads_us = time_per_call(lambda: decode_json(body), args.iterations)
+
+        print(f"{answer_chars:>8} {len(body):>8} | {default_us:>7.1f}us {fast_us:>7.1f}us "
+              f"{default_us - fast_us:>5.1f}us | {gzip_us:>7.1f}us {gzip_size:>8} | "
+              f"{zstd_us:>7.1f}us {zstd_size:>8} | {loads_us:>7.1f}us {fast_loads_us:>8.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,652 @@
+"""
+loadtest.py
+===========
+
+Load and soak-test harness for the **LLMOps Multi-AI Agent** stack.
+
+This module replays a weighted mix of `/chat` requests (personas, models,
+web search on/off, conversation lengths) against the FastAPI backend at a
+fixed target rate, for anything from a few seconds to many hours.
+
+Workflow:
+* Load a request mix from a JSONL file (or build the default mix).
+* Optionally launch the full stack through `app/main.py` with the offline
+  stub providers enabled, so no Groq or Tavily calls are made.
+* Issue requests open-loop at the target RPS from a thread pool, with at
+  most `--concurrency` requests in flight; a request due while every slot
+  is busy is counted as dropped instead of being queued client-side.
+* Every reporting interval, emit latency percentiles, error rates, and the
+  resident memory of every backend worker, both to the console and to an
+  optional JSONL report file.
+
+Latency is measured from each request's *scheduled* send time, so a
+saturated client or server shows up as growing latency instead of being
+hidden by a slower send rate.
+
+Usage
+-----
+Example:
+    # Launch the stubbed stack and soak it at 20 RPS for two hours
+    python -m app.perf.loadtest --launch --rps 20 --duration 2h \\
+        --output logs/soak.jsonl
+
+    # Replay a recorded mix against an already-running backend
+    python -m app.perf.loadtest --mix mixes/prod.jsonl --rps 5 --duration 10m
+"""
+
+# ======================================================================
+# Imports
+# ======================================================================
+
+# Command-line parsing and JSON handling
+import argparse
+import json
+
+# Process management for launching the stack
+import os
+import signal
+import subprocess
+import sys
+
+# Concurrency and timing
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Type hints
+from typing import Dict, List
+
+# HTTP client (connection pooling via Session)
+import requests
+
+# Shared persona prompts and model configuration
+from app.config.personas import ROLE_PRESETS, DEFAULT_PERSONA
+from app.config.settings import settings
+
+# Process memory helpers
+from app.common.memory import list_descendant_pids, read_process_name, read_rss_kb
+
+# Project-wide logging utility
+from app.common.logger import get_logger
+
+# Structured custom exception class
+from app.common.custom_exception import CustomException
+
+
+# ======================================================================
+# Initialisation
+# ======================================================================
+
+# Module-level logger
+logger = get_logger(__name__)
+
+# Default backend endpoint (matches the launcher in app/main.py)
+DEFAULT_URL = "http://127.0.0.1:9999/chat"
+
+# Conversation lengths used by the default mix
+DEFAULT_CONVERSATION_LENGTHS = (1, 3, 8)
+
+# Whole-run latency samples kept for the summary percentiles (reservoir size)
+LATENCY_RESERVOIR_SIZE = 100_000
+
+
+# ======================================================================
+# Request Mix
+# ======================================================================
+
+def _synthetic_conversation(length, topic):
+    """
+    Build a list of `length` user messages about `topic`.
+
+    Parameters
+    ----------
+    length : int
+        Number of messages in the conversation.
+    topic : str
+        A short label used to vary the message text.
+
+    Returns
+    -------
+    list of str
+        The synthetic conversation history.
+    """
+    return [
+        f"Turn {i + 1}: please tell me more about {topic}, point {i + 1}."
+        for i in range(max(1, length))
+    ]
+
+
+def _entry_from_record(record):
+    """
+    Normalise one mix record into a `(weight, payload)` tuple.
+
+    Parameters
+    ----------
+    record : dict
+        A JSON object with some of: `persona`, `system_prompt`, `model_name`,
+        `allow_search`, `messages`, `conversation_length`, `priority`,
+        `tenant`, `weight`.
+
+    Returns
+    -------
+    tuple
+        `(weight, payload)` where `payload` is a `/chat` request body.
+    """
+    persona = record.get("persona", DEFAULT_PERSONA)
+    system_prompt = record.get("system_prompt") or ROLE_PRESETS.get(
+        persona, ROLE_PRESETS[DEFAULT_PERSONA]
+    )
+    model_name = record.get("model_name", settings.ALLOWED_MODEL_NAMES[0])
+    allow_search = bool(record.get("allow_search", False))
+    messages = record.get("messages") or _synthetic_conversation(
+        int(record.get("conversation_length", 1)), persona
+    )
+
+    payload = {
+        "model_name": model_name,
+        "system_prompt": system_prompt,
+        "messages": messages,
+        "allow_search": allow_search,
+    }
+
+    # Scheduling fields are forwarded only when the mix sets them
+    for field in ("priority", "tenant"):
+        if field in record:
+            payload[field] = record[field]
+
+    return float(record.get("weight", 1.0)), payload
+
+
+def load_mix(path=None):
+    """
+    Load a request mix from a JSONL file, or build the default mix.
+
+    The default mix is the cross product of every persona, allowed model,
+    search setting, and `DEFAULT_CONVERSATION_LENGTHS`, all equally weighted.
+
+    Parameters
+    ----------
+    path : str or None
+        Path to a JSONL file with one mix record per line.
+
+    Returns
+    -------
+    list of tuple
+        `(weight, payload)` entries.
+
+    Raises
+    ------
+    CustomException
+        If the file cannot be read or contains no usable records.
+    """
+    if path is None:
+        records = [
+            {
+                "persona": persona,
+                "model_name": model_name,
+                "allow_search": allow_search,
+                "conversation_length": length,
+            }
+            for persona in ROLE_PRESETS
+            for model_name in settings.ALLOWED_MODEL_NAMES
+            for allow_search in (False, True)
+            for length in DEFAULT_CONVERSATION_LENGTHS
+        ]
+    else:
+        try:
+            with open(path, encoding="utf-8") as f:
+                records = [json.loads(line) for line in f if line.strip()]
+        except Exception as e:
+            raise CustomException(f"Failed to load request mix from {path}", error_detail=e)
+
+    mix = [_entry_from_record(record) for record in records]
+    mix = [entry for entry in mix if entry[0] > 0]
+
+    if not mix:
+        raise CustomException("Request mix is empty")
+
+    return mix
+
+
+# ======================================================================
+# Statistics
+# ======================================================================
+
+def percentile(sorted_values, pct):
+    """
+    Return the nearest-rank percentile of an already sorted list.
+
+    Parameters
+    ----------
+    sorted_values : list of float
+        Values sorted in ascending order.
+    pct : float
+        The percentile to compute, between 0 and 100.
+
+    Returns
+    -------
+    float or None
+        The percentile value, or None for an empty list.
+    """
+    if not sorted_values:
+        return None
+
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class LoadStats:
+    """
+    Thread-safe accumulator for per-window and whole-run request outcomes.
+
+    Whole-run latencies are kept as a uniform random sample of at most
+    `reservoir_size` values (reservoir sampling), so memory stays constant
+    however long a soak runs.
+
+    Parameters
+    ----------
+    reservoir_size : int
+        Maximum number of whole-run latency samples kept.
+    seed : int or None
+        Seed for the reservoir sampling.
+    """
+
+    def __init__(self, reservoir_size=LATENCY_RESERVOIR_SIZE, seed=None):
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._window: List[float] = []
+        self._window_errors: Dict[str, int] = {}
+        self._window_dropped = 0
+        self.reservoir_size = reservoir_size
+        self.total_sent = 0
+        self.total_ok = 0
+        self.total_dropped = 0
+        self.total_errors: Dict[str, int] = {}
+        self.all_latencies: List[float] = []
+
+    def record(self, latency_s, error=None):
+        """Record one completed request (`error` is None on success)."""
+        with self._lock:
+            self.total_sent += 1
+            self._window.append(latency_s)
+            if len(self.all_latencies) < self.reservoir_size:
+                self.all_latencies.append(latency_s)
+            else:
+                slot = self._random.randrange(self.total_sent)
+                if slot < self.reservoir_size:
+                    self.all_latencies[slot] = latency_s
+            if error is None:
+                self.total_ok += 1
+            else:
+                self._window_errors[error] = self._window_errors.get(error, 0) + 1
+                self.total_errors[error] = self.total_errors.get(error, 0) + 1
+
+    def record_dropped(self):
+        """Record one request that was not sent because every slot was busy."""
+        with self._lock:
+            self.total_dropped += 1
+            self._window_dropped += 1
+
+    def drain_window(self):
+        """Return and reset the latencies, errors, and drops of the current window."""
+        with self._lock:
+            window, errors, dropped = self._window, self._window_errors, self._window_dropped
+            self._window, self._window_errors, self._window_dropped = [], {}, 0
+        return sorted(window), errors, dropped
+
+
+# ======================================================================
+# Worker Memory Sampling
+# ======================================================================
+
+class WorkerMemoryTracker:
+    """
+    Track resident memory of backend worker processes over time.
+
+    Parameters
+    ----------
+    root_pid : int or None
+        PID of a launched process whose descendants are sampled.
+    pids : list of int
+        Additional explicit PIDs to sample (e.g. an externally run Uvicorn).
+    """
+
+    def __init__(self, root_pid=None, pids=None):
+        self.root_pid = root_pid
+        self.pids = list(pids or [])
+        self.baseline: Dict[int, int] = {}
+        self.names: Dict[int, str] = {}
+
+    def _current_pids(self):
+        pids = list(self.pids)
+        if self.root_pid is not None:
+            pids.extend(list_descendant_pids(self.root_pid))
+        return sorted(set(pids))
+
+    def sample(self):
+        """
+        Return `{pid: {"name", "rss_kb", "growth_kb"}}` for every tracked PID.
+        """
+        snapshot = {}
+        for pid in self._current_pids():
+            rss_kb = read_rss_kb(pid)
+            if rss_kb is None:
+                continue
+            if pid not in self.names:
+                self.names[pid] = (read_process_name(pid) or str(pid))[:80]
+            self.baseline.setdefault(pid, rss_kb)
+            snapshot[pid] = {
+                "name": self.names[pid],
+                "rss_kb": rss_kb,
+                "growth_kb": rss_kb - self.baseline[pid],
+            }
+        return snapshot
+
+
+# ======================================================================
+# Stack Launcher
+# ======================================================================
+
+def readiness_url(chat_url):
+    """Return the backend's `/readyz` URL for a `/chat` URL."""
+    return chat_url.rsplit("/", 1)[0] + "/readyz"
+
+
+def launch_stack(ready_url, timeout_s=120.0):
+    """
+    Launch the full stack via `app/main.py` with stub providers enabled.
+
+    Load starts only once the backend reports ready, i.e. its agent pool
+    (or worker processes) has finished warming up, so the first requests
+    do not measure warm-up.
+
+    Parameters
+    ----------
+    ready_url : str
+        The backend's `/readyz` URL, polled until it returns HTTP 200.
+    timeout_s : float
+        Maximum time to wait for the backend to become ready.
+
+    Returns
+    -------
+    subprocess.Popen
+        The launcher process (its descendants are the backend and UI).
+
+    Raises
+    ------
+    CustomException
+        If the launcher exits or the backend is not ready in time.
+    """
+    # Never read from or write stub answers into the persistent answer store
+    env = dict(os.environ, USE_STUB_PROVIDERS="true", ANSWER_STORE_ENABLED="false")
+
+    logger.info("Launching app/main.py with stub providers")
+    process = subprocess.Popen(
+        [sys.executable, "app/main.py"],
+        env=env,
+        start_new_session=True,
+    )
+
+    # /readyz answers 503 while warming up (or after a failed warm-up)
+    status = "unreachable"
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise CustomException(
+                f"Launcher exited with code {process.returncode} before the backend was ready"
+            )
+        try:
+            response = requests.get(ready_url, timeout=1.0)
+            if response.status_code == 200:
+                logger.info("Backend is ready; starting load")
+                return process
+            status = response.text
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+
+    stop_stack(process)
+    raise CustomException(f"Backend was not ready at {ready_url} within {timeout_s}s (last status: {status})")
+
+
+def stop_stack(process):
+    """Terminate a stack launched by `launch_stack` (whole process group)."""
+    try:
+        os.killpg(process.pid, signal.SIGTERM)
+        process.wait(timeout=10)
+    except Exception:
+        process.kill()
+
+
+# ======================================================================
+# Load Generator
+# ======================================================================
+
+class LoadGenerator:
+    """
+    Open-loop request generator driving `/chat` at a target rate.
+
+    Parameters
+    ----------
+    url : str
+        The `/chat` endpoint to target.
+    mix : list of tuple
+        `(weight, payload)` entries from `load_mix`.
+    rps : float
+        Target requests per second.
+    concurrency : int
+        Maximum number of in-flight requests; requests due while all are
+        busy are dropped (and counted) rather than queued.
+    timeout_s : float
+        Per-request HTTP timeout.
+    seed : int or None
+        Seed for the weighted request selection (for reproducible runs).
+    """
+
+    def __init__(self, url, mix, rps, concurrency=64, timeout_s=120.0, seed=None):
+        self.url = url
+        self.mix = mix
+        self.rps = rps
+        self.timeout_s = timeout_s
+        self.stats = LoadStats(seed=seed)
+        self._weights = [entry[0] for entry in mix]
+        self._random = random.Random(seed)
+        self._local = threading.local()
+        self._pool = ThreadPoolExecutor(max_workers=concurrency)
+        self._slots = threading.BoundedSemaphore(concurrency)
+
+    def _session(self):
+        # One pooled session per worker thread
+        if not hasattr(self._local, "session"):
+            self._local.session = requests.Session()
+        return self._local.session
+
+    def _send(self, payload, scheduled_at):
+        error = None
+        try:
+            response = self._session().post(self.url, json=payload, timeout=self.timeout_s)
+            if response.status_code != 200:
+                error = f"http_{response.status_code}"
+        except requests.Timeout:
+            error = "timeout"
+        except requests.RequestException as e:
+            error = type(e).__name__
+        finally:
+            self._slots.release()
+        self.stats.record(time.monotonic() - scheduled_at, error)
+
+    def run(self, duration_s, stop_event):
+        """
+        Issue requests at the target rate until `duration_s` elapses.
+
+        Parameters
+        ----------
+        duration_s : float
+            How long to generate load for.
+        stop_event : threading.Event
+            Set to stop early (e.g. on Ctrl+C).
+        """
+        interval = 1.0 / self.rps
+        start = time.monotonic()
+        sent = 0
+
+        while not stop_event.is_set():
+            scheduled_at = start + sent * interval
+            if scheduled_at - start >= duration_s:
+                break
+
+            delay = scheduled_at - time.monotonic()
+            if delay > 0:
+                stop_event.wait(delay)
+
+            _, payload = self._random.choices(self.mix, weights=self._weights)[0]
+            sent += 1
+
+            # Never queue client-side: a saturated run drops and counts the excess
+            if not self._slots.acquire(blocking=False):
+                self.stats.record_dropped()
+                continue
+            self._pool.submit(self._send, payload, scheduled_at)
+
+        self._pool.shutdown(wait=True)
+
+
+# ======================================================================
+# Reporting
+# ======================================================================
+
+def _window_report(elapsed_s, latencies, errors, dropped, memory):
+    """Build one report record for a reporting window."""
+    count = len(latencies)
+    error_count = sum(errors.values())
+    return {
+        "elapsed_s": round(elapsed_s, 1),
+        "completed": count,
+        "dropped": dropped,
+        "errors": errors,
+        "error_rate": round(error_count / count, 4) if count else 0.0,
+        "p50_ms": _ms(percentile(latencies, 50)),
+        "p95_ms": _ms(percentile(latencies, 95)),
+        "p99_ms": _ms(percentile(latencies, 99)),
+        "max_ms": _ms(latencies[-1] if latencies else None),
+        "workers": {str(pid): info for pid, info in memory.items()},
+    }
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000.0, 1)
+
+
+def _format_report(report):
+    """Render a window report as a single console line."""
+    workers = ", ".join(
+        f"{pid}:{info['rss_kb'] // 1024}MB({info['growth_kb']:+d}kB)"
+        for pid, info in report["workers"].items()
+    )
+    return (
+        f"t={report['elapsed_s']}s done={report['completed']} drop={report['dropped']} "
+        f"err={report['error_rate']:.2%} p50={report['p50_ms']}ms "
+        f"p95={report['p95_ms']}ms p99={report['p99_ms']}ms "
+        f"rss=[{workers}]"
+    )
+
+
+def _parse_duration(value):
+    """Parse durations such as `90`, `45s`, `10m`, or `6h` into seconds."""
+    units = {"s": 1, "m": 60, "h": 3600}
+    value = value.strip().lower()
+    if value and value[-1] in units:
+        return float(value[:-1]) * units[value[-1]]
+    return float(value)
+
+
+# ======================================================================
+# Main Entry Point
+# ======================================================================
+
+def main(argv=None):
+    """Command-line entry point for the load and soak-test harness."""
+    parser = argparse.ArgumentParser(description="Load/soak test the /chat API.")
+    parser.add_argument("--url", default=DEFAULT_URL, help="Target /chat URL.")
+    parser.add_argument("--mix", default=None, help="JSONL request mix (default: built-in mix).")
+    parser.add_argument("--rps", type=float, default=5.0, help="Target requests per second.")
+    parser.add_argument("--duration", default="60s", help="Run length, e.g. 90s, 30m, 6h.")
+    parser.add_argument("--concurrency", type=int, default=64, help="Max in-flight requests.")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Per-request timeout (s).")
+    parser.add_argument("--interval", type=float, default=10.0, help="Report interval (s).")
+    parser.add_argument("--output", default=None, help="Append window reports to this JSONL file.")
+    parser.add_argument("--launch", action="store_true", help="Launch app/main.py with stub providers.")
+    parser.add_argument("--pid", type=int, action="append", default=[], help="Extra worker PID to sample.")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for the request mix.")
+    args = parser.parse_args(argv)
+
+    mix = load_mix(args.mix)
+    duration_s = _parse_duration(args.duration)
+    process = launch_stack(readiness_url(args.url)) if args.launch else None
+    memory = WorkerMemoryTracker(root_pid=process.pid if process else None, pids=args.pid)
+    generator = LoadGenerator(
+        args.url, mix, args.rps,
+        concurrency=args.concurrency, timeout_s=args.timeout, seed=args.seed,
+    )
+
+    stop_event = threading.Event()
+    load_thread = threading.Thread(target=generator.run, args=(duration_s, stop_event))
+    output = open(args.output, "a", encoding="utf-8") if args.output else None
+
+    logger.info(
+        f"Starting load: {len(mix)} request kinds at {args.rps} RPS for {duration_s:.0f}s"
+    )
+    start = time.monotonic()
+    memory.sample()  # establish the RSS baseline
+    load_thread.start()
+
+    try:
+        while load_thread.is_alive():
+            load_thread.join(timeout=args.interval)
+            latencies, errors, dropped = generator.stats.drain_window()
+            report = _window_report(
+                time.monotonic() - start, latencies, errors, dropped, memory.sample()
+            )
+            logger.info(_format_report(report))
+            if output:
+                output.write(json.dumps(report) + "\n")
+                output.flush()
+    except KeyboardInterrupt:
+        logger.warning("Interrupted; waiting for in-flight requests")
+        stop_event.set()
+        load_thread.join()
+    finally:
+        # Sample memory one last time while the workers are still alive
+        final_memory = memory.sample()
+        if output:
+            output.close()
+        if process:
+            stop_stack(process)
+
+    # ------------------------------------------------------------------
+    # Whole-run summary
+    # ------------------------------------------------------------------
+    stats = generator.stats
+    all_latencies = sorted(stats.all_latencies)
+    elapsed_h = max(time.monotonic() - start, 1e-9) / 3600.0
+    summary = {
+        "sent": stats.total_sent,
+        "ok": stats.total_ok,
+        "dropped": stats.total_dropped,
+        "errors": stats.total_errors,
+        "error_rate": round(1 - stats.total_ok / stats.total_sent, 4) if stats.total_sent else 0.0,
+        "p50_ms": _ms(percentile(all_latencies, 50)),
+        "p95_ms": _ms(percentile(all_latencies, 95)),
+        "p99_ms": _ms(percentile(all_latencies, 99)),
+        "rss_growth_kb_per_hour": {
+            str(pid): round(info["growth_kb"] / elapsed_h, 1)
+            for pid, info in final_memory.items()
+        },
+    }
+    logger.info(f"Load test summary: {json.dumps(summary)}")
+    return summary
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+trace_report.py
+===============
+
+Offline report over the local JSONL trace file.
+
+Reads the OTLP/JSON-shaped spans written by `app.common.tracing` and prints:
+
+* The slowest `/chat` requests (root `chat_endpoint` spans), each with its
+  span tree, so a slow request can be broken down into agent acquisition,
+  LangGraph node executions (one per ReAct step), LLM calls with token
+  counts, and tool calls.
+* Aggregate latency per span name across the whole file.
+
+Usage
+-----
+Example:
+    python -m app.perf.trace_report
+    python -m app.perf.trace_report --file logs/traces_2026-10-19.jsonl --slowest 5
+    python -m app.perf.trace_report --trace b81e4c94147c46b58a7a2843a5b48a8a
+"""
+
+# ======================================================================
+# Imports
+# ======================================================================
+
+# Command-line parsing and JSON handling
+import argparse
+import json
+from collections import defaultdict
+
+# Default trace file location
+from app.common.tracing import trace_file_path
+
+# Percentile helper shared with the load-test harness
+from app.perf.loadtest import percentile
+
+
+# ======================================================================
+# Loading
+# ======================================================================
+
+def load_spans(path):
+    """Load every span from a JSONL trace file, adding `duration_ms`."""
+    spans = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            record["duration_ms"] = (
+                int(record["endTimeUnixNano"]) - int(record["startTimeUnixNano"])
+            ) / 1e6
+            record["attrs"] = {
+                item["key"]: next(iter(item["value"].values())) for item in record["attributes"]
+            }
+            spans.append(record)
+    return spans
+
+
+# ======================================================================
+# Rendering
+# ======================================================================
+
+def print_tree(trace_spans):
+    """Print one trace as an indented span tree in start-time order."""
+    children = defaultdict(list)
+    for record in sorted(trace_spans, key=lambda r: int(r["startTimeUnixNano"])):
+        children[record["parentSpanId"]].append(record)
+
+    def walk(parent_id, depth):
+        for record in children.get(parent_id, []):
+            attrs = " ".join(
+                f"{k}={v}" for k, v in record["attrs"].items()
+                if k.startswith(("llm.tokens", "tool.", "langgraph.step", "agent.", "tool_output."))
+            )
+            status = " ERROR" if record["status"]["code"] == "STATUS_CODE_ERROR" else ""
+            print(f"  {'  ' * depth}{record['name']:<28} {record['duration_ms']:>9.1f}ms {attrs}{status}")
+            walk(record["spanId"], depth + 1)
+
+    walk("", 0)
+
+
+def main(argv=None):
+    """Command-line entry point for the trace report."""
+    parser = argparse.ArgumentParser(description="Summarise local request traces.")
+    parser.add_argument("--file", default=trace_file_path(), help="JSONL trace file.")
+    parser.add_argument("--slowest", type=int, default=3, help="Number of slow requests to expand.")
+    parser.add_argument("--trace", default=None, help="Show a single trace / correlation ID.")
+    args = parser.parse_args(argv)
+
+    spans = load_spans(args.file)
+    by_trace = defaultdict(list)
+    for record in spans:
+        by_trace[record["traceId"]].append(record)
+
+    if args.trace:
+        print(f"Trace {args.trace}")
+        print_tree(by_trace.get(args.trace, []))
+        return
+
+    # ------------------------------------------------------------------
+    # Slowest requests
+    # ------------------------------------------------------------------
+    roots = sorted(
+        (r for r in spans if r["name"] == "chat_endpoint"),
+        key=lambda r: r["duration_ms"],
+        reverse=True,
+    )
+    for root in roots[: args.slowest]:
+        print(f"Trace {root['traceId']}  {root['duration_ms']:.1f}ms")
+        print_tree(by_trace[root["traceId"]])
+        print()
+
+    # ------------------------------------------------------------------
+    # Aggregate latency per span name
+    # ------------------------------------------------------------------
+    durations = defaultdict(list)
+    for record in spans:
+        durations[record["name"]].append(record["duration_ms"])
+
+    print(f"{'span':<28} {'count':>7} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}")
+    for name, values in sorted(durations.items()):
+        values.sort()
+        print(f"{name:<28} {len(values):>7} {percentile(values, 50):>9.1f} "
+              f"{percentile(values, 95):>9.1f} {values[-1]:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
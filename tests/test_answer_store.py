@@ -0,0 +1,164 @@
+"""
+test_answer_store.py
+====================
+
+On-disk format, recovery, and locking tests for `app.backend.answer_store`.
+
+Run with:
+    python -m unittest discover -s tests
+"""
+
+# ======================================================================
+# Imports
+# ======================================================================
+
+# Test framework, environment, and temporary directories
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+# Offline, side-effect-free configuration (before project imports)
+os.environ.update(
+    USE_STUB_PROVIDERS="true",
+    WARMUP_MODE="off",
+    TRACING_ENABLED="false",
+)
+
+# Code under test
+from app.backend import answer_store
+from app.backend.answer_store import INDEX_FILE, AnswerStore, StoreLockedError
+
+
+# ======================================================================
+# Helpers
+# ======================================================================
+
+def _fingerprint(n):
+    """A deterministic 64-character hex fingerprint for record `n`."""
+    return f"{n:064x}"
+
+
+def _segment_path(directory, segment_id=1):
+    return os.path.join(directory, f"segment-{segment_id:06d}.log")
+
+
+# ======================================================================
+# Tests
+# ======================================================================
+
+class AnswerStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.directory = self._tmp.name
+        self.addCleanup(self._tmp.cleanup)
+
+    def _open(self, **kwargs):
+        store = AnswerStore(self.directory, **kwargs)
+        self.addCleanup(lambda: store._index.closed or store.close())
+        return store
+
+    def test_put_get_returns_latest_record(self):
+        store = self._open()
+        store.put(_fingerprint(1), {"answer": "first"})
+        store.put(_fingerprint(1), {"answer": "second"})
+        store.put(_fingerprint(2), {"answer": "other"})
+
+        record = store.get(_fingerprint(1))
+        self.assertEqual(record["answer"], "second")
+        self.assertIn("created_ns", record)
+        self.assertIsNone(store.get(_fingerprint(3)))
+        self.assertEqual(store.stats()["keys"], 2)
+
+    def test_index_grows_past_load_factor(self):
+        with mock.patch.object(answer_store, "DEFAULT_INDEX_CAPACITY", 8):
+            store = self._open()
+        for n in range(50):
+            store.put(_fingerprint(n), {"n": n})
+
+        stats = store.stats()
+        self.assertGreater(stats["index_capacity"], 8)
+        self.assertLessEqual(stats["index_load"], answer_store.MAX_LOAD_FACTOR)
+        self.assertTrue(all(store.get(_fingerprint(n))["n"] == n for n in range(50)))
+
+    def test_torn_tail_is_truncated_on_reopen(self):
+        store = self._open()
+        store.put(_fingerprint(1), {"answer": "kept"})
+        store.close()
+        good_size = os.path.getsize(_segment_path(self.directory))
+
+        # A crash mid-append leaves a partial record behind
+        with open(_segment_path(self.directory), "ab") as f:
+            f.write(b"ANS1" + b"\x00" * 10)
+
+        store = self._open()
+        self.assertEqual(os.path.getsize(_segment_path(self.directory)), good_size)
+        self.assertEqual(store.get(_fingerprint(1))["answer"], "kept")
+        store.put(_fingerprint(2), {"answer": "after"})
+        self.assertEqual(store.get(_fingerprint(2))["answer"], "after")
+
+    def test_missing_or_corrupt_index_is_rebuilt(self):
+        store = self._open()
+        for n in range(5):
+            store.put(_fingerprint(n), {"n": n})
+        store.close()
+
+        index_path = os.path.join(self.directory, INDEX_FILE)
+
+        def overwrite_magic():
+            with open(index_path, "r+b") as f:
+                f.write(b"JUNK")
+
+        for damage in (lambda: os.remove(index_path), overwrite_magic):
+            damage()
+            store = self._open()
+            self.assertEqual(store.stats()["keys"], 5)
+            self.assertEqual(store.get(_fingerprint(3))["n"], 3)
+            store.close()
+
+    def test_compact_keeps_only_latest_records(self):
+        store = self._open(segment_bytes=512)
+        for round_ in range(10):
+            for n in range(5):
+                store.put(_fingerprint(n), {"n": n, "round": round_})
+
+        result = store.compact()
+        self.assertLess(result["bytes_after"], result["bytes_before"])
+        self.assertEqual(result["records"], 5)
+        self.assertEqual(store.get(_fingerprint(2))["round"], 9)
+        self.assertEqual(len(list(store.records())), 5)
+
+        store.put(_fingerprint(9), {"n": 9})
+        store.close()
+        store = self._open()
+        self.assertEqual(store.stats()["keys"], 6)
+        self.assertEqual(store.get(_fingerprint(4))["round"], 9)
+
+    def test_second_writer_is_refused_while_locked(self):
+        store = self._open()
+        with self.assertRaises(StoreLockedError):
+            AnswerStore(self.directory)
+
+        store.close()
+        self._open().close()
+
+    def test_read_only_store_reads_while_writer_holds_lock(self):
+        store = self._open()
+        store.put(_fingerprint(1), {"answer": "live"})
+
+        reader = self._open(read_only=True)
+        self.assertEqual(reader.get(_fingerprint(1))["answer"], "live")
+        self.assertTrue(reader.stats()["read_only"])
+        with self.assertRaises(OSError):
+            reader.put(_fingerprint(2), {"answer": "nope"})
+        with self.assertRaises(OSError):
+            reader.compact()
+
+        # The reader shares the writer's index mapping and sees later writes
+        store.put(_fingerprint(2), {"answer": "newer"})
+        self.assertEqual(reader.get(_fingerprint(2))["answer"], "newer")
+
+
+if __name__ == "__main__":
+    unittest.main()
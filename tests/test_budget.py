@@ -0,0 +1,113 @@
+"""
+test_budget.py
+==============
+
+Time-budget enforcement tests for `app.core.budget` and `run_agent`.
+
+Run with:
+    python -m unittest discover -s tests
+"""
+
+# ======================================================================
+# Imports
+# ======================================================================
+
+# Test framework, environment, and timing
+import os
+import threading
+import time
+import unittest
+from unittest import mock
+
+# Offline, side-effect-free configuration (before project imports)
+os.environ.update(
+    USE_STUB_PROVIDERS="true",
+    WARMUP_MODE="off",
+    TRACING_ENABLED="false",
+)
+
+# Message types produced by the fake agent
+from langchain_core.messages import AIMessage, ToolMessage
+
+# Code under test
+from app.core import ai_agent
+from app.core.budget import BudgetTracker, stream_within_budget
+
+
+# ======================================================================
+# Helpers
+# ======================================================================
+
+class _SlowAgent:
+    """A graph stand-in whose second step hangs until released."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.closed = threading.Event()
+
+    def stream(self, state, config=None, stream_mode=None):
+        messages = list(state["messages"])
+        try:
+            messages.append(AIMessage("Let me search.", tool_calls=[
+                {"name": "tavily_search", "args": {"query": "q"}, "id": "call-1"},
+            ]))
+            yield {"messages": list(messages)}
+
+            # The tool call is in flight: the deadline passes here
+            self.release.wait(timeout=5)
+            messages.append(ToolMessage("found it", tool_call_id="call-1"))
+            yield {"messages": list(messages)}
+            messages.append(AIMessage("Too late."))
+            yield {"messages": list(messages)}
+        finally:
+            self.closed.set()
+
+
+# ======================================================================
+# Tests
+# ======================================================================
+
+class TimeBudgetTest(unittest.TestCase):
+
+    def test_stream_ends_at_the_deadline(self):
+        agent = _SlowAgent()
+        tracker = BudgetTracker({"max_seconds": 0.2})
+
+        started = time.perf_counter()
+        chunks = list(stream_within_budget(lambda: agent.stream({"messages": []}), tracker))
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(len(chunks), 1)
+        self.assertEqual(tracker.exhausted_reason, "max_seconds")
+        self.assertLess(elapsed, 1.0)
+
+        # The abandoned step finishes in the background and the graph is closed
+        agent.release.set()
+        self.assertTrue(agent.closed.wait(timeout=5))
+
+    def test_stream_errors_reach_the_caller(self):
+        def failing():
+            raise RuntimeError("provider down")
+            yield
+
+        with self.assertRaises(RuntimeError):
+            list(stream_within_budget(failing, BudgetTracker({"max_seconds": 5})))
+
+    def test_run_agent_returns_partial_answer_at_the_deadline(self):
+        agent = _SlowAgent()
+        self.addCleanup(agent.release.set)
+
+        with mock.patch.object(ai_agent, "get_agent", return_value=agent):
+            started = time.perf_counter()
+            result = ai_agent.run_agent(
+                ai_agent.settings.ALLOWED_MODEL_NAMES[0], ["Hi"], True, "Be brief.",
+                budget={"max_seconds": 0.2},
+            )
+
+        self.assertLess(time.perf_counter() - started, 1.0)
+        self.assertEqual(result["response"], "Let me search.")
+        self.assertEqual(result["budget"]["exhausted_reason"], "max_seconds")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,211 @@
+"""
+test_scheduler.py
+=================
+
+Admission-control tests for `app.backend.scheduler` and the `/chat` endpoint.
+
+Run with:
+    python -m unittest discover -s tests
+"""
+
+# ======================================================================
+# Imports
+# ======================================================================
+
+# Test framework, environment, and concurrency
+import os
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+# Offline, side-effect-free backend configuration (before project imports)
+os.environ.update(
+    USE_STUB_PROVIDERS="true",
+    WARMUP_MODE="off",
+    ANSWER_STORE_ENABLED="false",
+    TRACING_ENABLED="false",
+)
+
+# HTTP test client for the FastAPI app
+from fastapi.testclient import TestClient
+
+# Code under test
+from app.backend import api
+from app.backend.scheduler import FairScheduler, SchedulerOverloaded, parse_tenant_classes
+
+
+# ======================================================================
+# Helpers
+# ======================================================================
+
+def _hold_slots(scheduler, count, priority="batch", tenant="t"):
+    """Occupy `count` slots from background threads; return their release event."""
+    release = threading.Event()
+    held = threading.Barrier(count + 1)
+
+    def hold():
+        with scheduler.slot(priority, tenant):
+            held.wait()
+            release.wait()
+
+    threads = [threading.Thread(target=hold, daemon=True) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    held.wait()
+    return release, threads
+
+
+def _queue(scheduler, priority, tenant, outcomes):
+    """Queue one request in a background thread, recording its outcome."""
+    def wait():
+        try:
+            with scheduler.slot(priority, tenant):
+                outcomes.append((priority, tenant, "granted"))
+        except SchedulerOverloaded as e:
+            outcomes.append((priority, tenant, e.reason))
+
+    thread = threading.Thread(target=wait, daemon=True)
+    thread.start()
+    return thread
+
+
+def _wait_queued(scheduler, count):
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        if sum(c["queued"] for c in scheduler.stats()["classes"].values()) == count:
+            return
+        time.sleep(0.005)
+    raise AssertionError(f"expected {count} queued requests")
+
+
+# ======================================================================
+# Scheduler
+# ======================================================================
+
+class FairSchedulerTest(unittest.TestCase):
+
+    def test_requests_over_the_limit_are_shed(self):
+        scheduler = FairScheduler(concurrency=2, max_queue=2, max_wait_s=5)
+        release, holders = _hold_slots(scheduler, 2)
+
+        outcomes = []
+        waiters = [_queue(scheduler, "batch", "t", outcomes) for _ in range(2)]
+        _wait_queued(scheduler, 2)
+
+        with self.assertRaises(SchedulerOverloaded) as ctx:
+            scheduler.acquire("batch", "t")
+        self.assertEqual(ctx.exception.reason, "queue_full")
+
+        release.set()
+        for thread in holders + waiters:
+            thread.join(timeout=5)
+        self.assertEqual([o[2] for o in outcomes], ["granted", "granted"])
+        self.assertEqual(scheduler.stats()["classes"]["batch"]["shed"], 1)
+
+    def test_interactive_request_evicts_queued_batch_request(self):
+        scheduler = FairScheduler(concurrency=1, max_queue=1, max_wait_s=5)
+        release, holders = _hold_slots(scheduler, 1)
+
+        outcomes = []
+        batch = _queue(scheduler, "batch", "t", outcomes)
+        _wait_queued(scheduler, 1)
+        interactive = _queue(scheduler, "interactive", "ui", outcomes)
+        batch.join(timeout=5)
+
+        release.set()
+        for thread in holders + [interactive]:
+            thread.join(timeout=5)
+        self.assertEqual(outcomes, [
+            ("batch", "t", "evicted_by_interactive"),
+            ("interactive", "ui", "granted"),
+        ])
+
+    def test_shed_requests_leave_no_tenant_state(self):
+        scheduler = FairScheduler(concurrency=1, max_queue=1, max_wait_s=0.05)
+        release, holders = _hold_slots(scheduler, 1)
+
+        # Many tenants time out or are rejected while the slot is held
+        for i in range(20):
+            with self.assertRaises(SchedulerOverloaded):
+                scheduler.acquire("batch", f"tenant-{i}")
+
+        release.set()
+        for thread in holders:
+            thread.join(timeout=5)
+        self.assertFalse(any(scheduler._queues.values()))
+        self.assertFalse(hasattr(scheduler, "_last_tag"))
+
+    def test_claimed_class_is_capped_per_tenant(self):
+        scheduler = FairScheduler(
+            concurrency=1, max_queue=1, max_wait_s=5,
+            max_classes=parse_tenant_classes("ui=interactive,etl=background,bad=urgent"),
+        )
+        self.assertEqual(scheduler.max_classes, {"ui": "interactive", "etl": "background"})
+        self.assertEqual(scheduler.allowed_priority("interactive", "ui"), "interactive")
+        self.assertEqual(scheduler.allowed_priority("interactive", "anyone"), "batch")
+        self.assertEqual(scheduler.allowed_priority("background", "anyone"), "background")
+        self.assertEqual(scheduler.allowed_priority("batch", "etl"), "background")
+
+
+# ======================================================================
+# /chat Endpoint
+# ======================================================================
+
+class ChatSheddingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.scheduler = FairScheduler(concurrency=2, max_queue=2, max_wait_s=10)
+        self.original = (api.scheduler, api.run_agent)
+
+        def slow_agent(*args, **kwargs):
+            time.sleep(0.5)
+            return {"response": "ok", "budget": None, "conversation": None, "tool_output": None}
+
+        api.scheduler, api.run_agent = self.scheduler, slow_agent
+
+    def tearDown(self):
+        api.scheduler, api.run_agent = self.original
+
+    def test_requests_over_the_limit_get_503(self):
+        payload = {
+            "model_name": api.settings.ALLOWED_MODEL_NAMES[0],
+            "system_prompt": "Be brief.",
+            "messages": ["Hi"],
+            "allow_search": False,
+        }
+
+        with TestClient(api.app) as client, ThreadPoolExecutor(max_workers=8) as pool:
+            futures = [pool.submit(client.post, "/chat", json=payload) for _ in range(8)]
+
+            # Probes stay responsive while every slot and queue place is taken
+            _wait_queued(self.scheduler, 2)
+            started = time.monotonic()
+            self.assertEqual(client.get("/healthz").status_code, 200)
+            self.assertLess(time.monotonic() - started, 0.5)
+
+            codes = sorted(f.result().status_code for f in futures)
+
+        self.assertEqual(codes, [200] * 4 + [503] * 4)
+        self.assertEqual(self.scheduler.stats()["classes"]["batch"]["shed"], 4)
+
+    def test_unlisted_tenant_cannot_claim_interactive(self):
+        payload = {
+            "model_name": api.settings.ALLOWED_MODEL_NAMES[0],
+            "system_prompt": "Be brief.",
+            "messages": ["Hi"],
+            "allow_search": False,
+            "priority": "interactive",
+            "tenant": "someone",
+        }
+
+        with TestClient(api.app) as client:
+            response = client.post("/chat", json=payload)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["scheduler"]["priority"], "batch")
+        self.assertEqual(self.scheduler.stats()["classes"]["batch"]["admitted"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+"""
+test_tool_trimming.py
+=====================
+
+Tests for `app.core.tool_trimming` and how the wrapped search tool is traced.
+
+Run with:
+    python -m unittest discover -s tests
+"""
+
+# ======================================================================
+# Imports
+# ======================================================================
+
+# Test framework, environment, and run IDs
+import os
+import unittest
+import uuid
+
+# Offline, side-effect-free configuration (before project imports)
+os.environ.update(
+    USE_STUB_PROVIDERS="true",
+    WARMUP_MODE="off",
+    TRACING_ENABLED="false",
+)
+
+# Callback manager that parents a tool run under a graph node run
+from langchain_core.callbacks import CallbackManager
+
+# Code under test
+from app.core import tool_trimming
+from app.core.agent_tracing import TracingCallbackHandler
+from app.core.stubs import StubSearchTool
+from app.core.tokens import estimate_tokens
+from app.core.tool_trimming import TrimmedSearchTool, trim_search_results
+
+
+# ======================================================================
+# Helpers
+# ======================================================================
+
+def _result(url, content, **extra):
+    return {"url": url, "title": f"Title of {url}", "content": content, "score": 0.9, **extra}
+
+
+def _page(n, words=400):
+    return " ".join(f"page{n}word{i}." for i in range(words))
+
+
+# ======================================================================
+# Tests
+# ======================================================================
+
+class TrimSearchResultsTest(unittest.TestCase):
+
+    def setUp(self):
+        tool_trimming._CACHE.clear()
+
+    def test_duplicates_by_url_and_content_are_dropped(self):
+        raw = {"query": "q", "results": [
+            _result("https://Example.com/a/", "first"),
+            _result("https://example.com/a#section", "other text, same page"),
+            _result("https://example.com/b", "first"),
+            _result("https://example.com/c", "third"),
+        ]}
+        trimmed, stats = trim_search_results(raw, max_tokens=600)
+
+        self.assertEqual([r["url"] for r in trimmed["results"]],
+                         ["https://example.com/a", "https://example.com/c"])
+        self.assertEqual(stats["duplicates"], 2)
+        self.assertEqual((stats["results_in"], stats["results_kept"]), (4, 2))
+
+    def test_contents_are_truncated_to_an_equal_share(self):
+        results = [_result(f"https://example.com/{n}", _page(n)) for n in range(3)]
+        raw = {"query": "q", "images": ["x"] * 20, "results": results}
+        trimmed, stats = trim_search_results(raw, max_tokens=300)
+
+        self.assertNotIn("images", trimmed)
+        for result in trimmed["results"]:
+            self.assertEqual(set(result), {"title", "url", "content"})
+            self.assertLessEqual(estimate_tokens(result["content"]), 100 + 5)
+        self.assertGreater(stats["tokens_saved"], 0)
+        self.assertEqual(stats["tokens_saved"], stats["tokens_before"] - stats["tokens_after"])
+
+    def test_non_dict_output_is_passed_through(self):
+        for raw in ("Search failed: timeout", {"error": "no results"}, None):
+            trimmed, stats = trim_search_results(raw, max_tokens=300)
+            self.assertIs(trimmed, raw)
+            self.assertEqual(stats["results_in"], 0)
+
+    def test_repeated_pages_hit_the_cache(self):
+        raw = {"query": "q", "results": [_result(f"https://example.com/{n}", _page(n)) for n in range(2)]}
+        first, first_stats = trim_search_results(raw, max_tokens=300)
+        second, second_stats = trim_search_results(raw, max_tokens=300)
+
+        self.assertEqual(first_stats["cache_hits"], 0)
+        self.assertEqual(second_stats["cache_hits"], 2)
+        self.assertEqual(first, second)
+
+        # Changed page content is re-trimmed rather than served from the cache
+        raw["results"][0]["content"] = _page(7)
+        _, third_stats = trim_search_results(raw, max_tokens=300)
+        self.assertEqual(third_stats["cache_hits"], 1)
+
+
+class TrimmedSearchToolTracingTest(unittest.TestCase):
+
+    def test_wrapped_search_is_traced_as_one_tool_call(self):
+        tracer = TracingCallbackHandler()
+        tool = TrimmedSearchTool.wrap(StubSearchTool(), max_tokens=300)
+
+        # Stand in for the LangGraph tools node that runs the tool call
+        node_run_id = uuid.uuid4()
+        tracer.on_chain_start({}, {}, run_id=node_run_id, name="tools", metadata={"langgraph_node": "tools"})
+        callbacks = CallbackManager([tracer], inheritable_handlers=[tracer], parent_run_id=node_run_id)
+        tool.invoke({"query": "weather"}, config={"callbacks": callbacks})
+        tracer.on_chain_end({}, run_id=node_run_id)
+
+        self.assertEqual(tracer.totals["tool_calls"], 1)
+        self.assertEqual(tracer._spans, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
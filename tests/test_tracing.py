@@ -0,0 +1,60 @@
+"""
+test_tracing.py
+===============
+
+Span parenting tests for `app.common.tracing`, including across processes.
+
+Run with:
+    python -m unittest discover -s tests
+"""
+
+# ======================================================================
+# Imports
+# ======================================================================
+
+# Test framework, environment, and pickling (the process-pool transport)
+import os
+import pickle
+import unittest
+
+# Offline, side-effect-free configuration (before project imports)
+os.environ.update(TRACING_ENABLED="false")
+
+# Code under test
+from app.common.tracing import (
+    correlation_scope,
+    current_span_context,
+    remote_parent_scope,
+    span,
+)
+
+
+# ======================================================================
+# Tests
+# ======================================================================
+
+class RemoteParentTest(unittest.TestCase):
+
+    def test_worker_span_is_a_child_of_the_submitting_span(self):
+        with correlation_scope() as correlation_id, span("agent.process_pool") as submitter:
+            context = pickle.loads(pickle.dumps(current_span_context()))
+
+        # As in the worker process: a fresh context with only the propagated IDs
+        with correlation_scope(correlation_id), remote_parent_scope(context):
+            with span("agent.worker") as worker:
+                with span("agent.invoke") as invoke:
+                    pass
+
+        self.assertEqual(worker.trace_id, submitter.trace_id)
+        self.assertEqual(worker.parent_span_id, submitter.span_id)
+        self.assertEqual(invoke.parent_span_id, worker.span_id)
+
+    def test_without_a_parent_the_worker_span_is_a_root(self):
+        self.assertIsNone(current_span_context())
+        with remote_parent_scope(None), span("agent.worker") as worker:
+            pass
+        self.assertEqual(worker.parent_span_id, "")
+
+
+if __name__ == "__main__":
+    unittest.main()